@@ -0,0 +1,71 @@
+"""add participant match keys
+
+Adds the indexed blocking-key columns used by fuzzy participant search
+and fills them in for existing rows. Databases created by ``init_db``
+after the columns were added to the model already have them, so every
+step is skipped when its column or index exists.
+
+Revision ID: 3f1c2a9b7d40
+Revises:
+Create Date: 2026-10-18 10:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.blocking import email_key, soundex
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9b7d40'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY_COLUMNS = {
+    "first_name_key": ("first_name", soundex),
+    "last_name_key": ("last_name", soundex),
+    "email_key": ("email", email_key),
+}
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    existing = {column["name"] for column in sa.inspect(bind).get_columns("Participant")}
+    for name in KEY_COLUMNS:
+        if name not in existing:
+            op.add_column("Participant", sa.Column(name, sa.String(length=4), nullable=True))
+
+    participant = sa.table("Participant", sa.column("id"), *(sa.column(name) for name in KEY_COLUMNS),
+                           *(sa.column(source) for source, _ in KEY_COLUMNS.values()))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(participant.c.id, participant.c.first_name, participant.c.last_name, participant.c.email)
+            .where(participant.c.id > last_id, participant.c.last_name_key.is_(None))
+            .order_by(participant.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            participant.update().where(participant.c.id == sa.bindparam("row_id")),
+            [{"row_id": row.id, **{name: encode(getattr(row, source)) for name, (source, encode) in KEY_COLUMNS.items()}}
+             for row in rows],
+        )
+        last_id = rows[-1].id
+
+    for name in KEY_COLUMNS:
+        op.create_index(op.f(f"ix_Participant_{name}"), "Participant", [name], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in KEY_COLUMNS:
+        op.drop_index(op.f(f"ix_Participant_{name}"), table_name="Participant", if_exists=True)
+    with op.batch_alter_table("Participant") as batch_op:
+        for name in KEY_COLUMNS:
+            batch_op.drop_column(name)
@@ -0,0 +1,40 @@
+"""add hot query indexes
+
+Indexes the event date range filter, the participant-to-event foreign
+key, and ``(event_id, email)`` lookups within an event. Databases
+created by ``init_db`` after the indexes were added to the models
+already have them, so each one is skipped when it exists.
+
+Revision ID: 8b2d6e4f1a93
+Revises: 3f1c2a9b7d40
+Create Date: 2026-10-18 15:47:09.218364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d6e4f1a93'
+down_revision: Union[str, None] = '3f1c2a9b7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_Event_event_date": ("Event", ["event_date"]),
+    "ix_Participant_event_id": ("Participant", ["event_id"]),
+    "ix_Participant_event_id_email": ("Participant", ["event_id", "email"]),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, (table, _) in INDEXES.items():
+        op.drop_index(name, table_name=table, if_exists=True)
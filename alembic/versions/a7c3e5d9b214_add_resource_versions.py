@@ -0,0 +1,41 @@
+"""add resource versions
+
+Creates the ``Resource_Version`` table holding the per-table change
+counters behind the ETag headers; every write upserts into it. It
+starts empty, as on a fresh database: a table without a row is at
+version 0 until its first write. Databases
+created by ``init_db`` after the table was added to the models already
+have it, so it is skipped when it exists.
+
+Revision ID: a7c3e5d9b214
+Revises: f09391bfbad9
+Create Date: 2026-10-18 22:51:12.604178
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5d9b214'
+down_revision: Union[str, None] = 'f09391bfbad9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "Resource_Version",
+        sa.Column("resource", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("resource"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("Resource_Version", if_exists=True)
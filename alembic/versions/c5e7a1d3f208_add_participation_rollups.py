@@ -0,0 +1,70 @@
+"""add participation rollups
+
+Creates the ``Event_Rollup`` and ``Participant_Rollup`` counter tables
+behind the ``/stats`` endpoints and fills them from the existing events
+and participants. Databases created by ``init_db`` after the tables were
+added to the models already have them; those are left as they are, and
+``python -m jobs.rollups`` recomputes them if they were created empty
+over existing data.
+
+Revision ID: c5e7a1d3f208
+Revises: 8b2d6e4f1a93
+Create Date: 2026-10-18 17:02:36.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.rollups import UNKNOWN_STATE, month_of
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7a1d3f208'
+down_revision: Union[str, None] = '8b2d6e4f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+    event = sa.table("Event", sa.column("id"), sa.column("event_type_id"), sa.column("event_date"))
+    participant = sa.table("Participant", sa.column("event_id"), sa.column("state"))
+    month = month_of(event.c.event_date, bind.dialect.name)
+
+    if "Event_Rollup" not in existing:
+        rollup = op.create_table(
+            "Event_Rollup",
+            sa.Column("event_type_id", sa.Integer(), nullable=False),
+            sa.Column("month", sa.String(length=7), nullable=False),
+            sa.Column("events", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("event_type_id", "month"),
+        )
+        op.execute(rollup.insert().from_select(
+            ["event_type_id", "month", "events"],
+            sa.select(event.c.event_type_id, month, sa.func.count()).group_by(event.c.event_type_id, month)))
+
+    if "Participant_Rollup" not in existing:
+        rollup = op.create_table(
+            "Participant_Rollup",
+            sa.Column("event_type_id", sa.Integer(), nullable=False),
+            sa.Column("month", sa.String(length=7), nullable=False),
+            sa.Column("state", sa.String(length=2), nullable=False),
+            sa.Column("participants", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("event_type_id", "month", "state"),
+        )
+        state = sa.func.coalesce(participant.c.state, UNKNOWN_STATE)
+        op.execute(rollup.insert().from_select(
+            ["event_type_id", "month", "state", "participants"],
+            sa.select(event.c.event_type_id, month, state, sa.func.count())
+            .select_from(event.join(participant, participant.c.event_id == event.c.id))
+            .group_by(event.c.event_type_id, month, state)))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("Participant_Rollup", if_exists=True)
+    op.drop_table("Event_Rollup", if_exists=True)
@@ -0,0 +1,60 @@
+"""cascade participant event fk
+
+Recreates the ``Participant.event_id`` foreign key with ``ON DELETE
+CASCADE`` so deleting an event removes its participants in the database
+instead of in the application. Databases created by ``init_db`` after
+the models gained the cascade already have it and are left alone.
+SQLite cannot alter constraints, so the table is rebuilt in batch mode;
+its foreign key is unnamed there and is addressed through the naming
+convention.
+
+Revision ID: e2a9c4b6f817
+Revises: c5e7a1d3f208
+Create Date: 2026-10-18 18:21:44.509312
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4b6f817'
+down_revision: Union[str, None] = 'c5e7a1d3f208'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+CONVENTION_NAME = "fk_Participant_event_id_Event"
+
+
+def _event_fk() -> Optional[dict]:
+    """Return the reflected ``Participant.event_id`` foreign key, if any."""
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys("Participant"):
+        if fk["constrained_columns"] == ["event_id"] and fk["referred_table"] == "Event":
+            return fk
+    return None
+
+
+def _recreate_event_fk(ondelete: Optional[str]) -> None:
+    """Replace the ``Participant.event_id`` foreign key."""
+    existing = _event_fk()
+    current = ((existing or {}).get("options") or {}).get("ondelete")
+    if existing is not None and (current or "").upper() == (ondelete or ""):
+        return
+    with op.batch_alter_table("Participant", recreate="always", naming_convention=NAMING_CONVENTION) as batch_op:
+        if existing is not None:
+            batch_op.drop_constraint(existing["name"] or CONVENTION_NAME, type_="foreignkey")
+        batch_op.create_foreign_key(existing and existing["name"] or CONVENTION_NAME, "Event",
+                                    ["event_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_event_fk("CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_event_fk(None)
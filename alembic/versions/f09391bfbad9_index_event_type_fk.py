@@ -0,0 +1,33 @@
+"""index event type fk
+
+Indexes ``Event.event_type_id``. With foreign keys enforced, deleting an
+event type checks that no event still refers to it, and without the
+index that check scans the whole Event table. Databases created by
+``init_db`` after the index was added to the model already have it, so
+it is skipped when it exists.
+
+Revision ID: f09391bfbad9
+Revises: e2a9c4b6f817
+Create Date: 2026-10-18 22:14:36.702915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f09391bfbad9'
+down_revision: Union[str, None] = 'e2a9c4b6f817'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_Event_event_type_id", "Event", ["event_type_id"], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_Event_event_type_id", table_name="Event", if_exists=True)
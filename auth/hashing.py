@@ -0,0 +1,37 @@
+"""Password hashing primitives.
+
+This module holds the bcrypt context and the synchronous hash/verify
+functions. It deliberately imports nothing from the application so that
+worker processes in the password hash pool can load it cheaply.
+"""
+
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto"
+)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a plaintext password using bcrypt.
+
+    Args:
+        password: The plaintext password to hash.
+
+    Returns:
+        The bcrypt-hashed password string.
+    """
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_pwd: str, hash_pwd: str) -> bool:
+    """Verify a plaintext password against a hashed password.
+
+    Args:
+        plain_pwd: The plaintext password to verify.
+        hash_pwd: The hashed password to compare against.
+
+    Returns:
+        True if the password matches, False otherwise.
+    """
+    return pwd_context.verify(plain_pwd, hash_pwd)
@@ -0,0 +1,132 @@
+"""In-process cache of authenticated principals.
+
+Every authenticated request used to look its user up in the database
+after decoding the JWT. This module keeps recently seen principals in
+memory, keyed by username and the token's ``jti`` (or ``exp`` for tokens
+issued before ``jti`` was added), so the hot path skips that query.
+
+Entries expire after a fixed TTL or when the token itself expires,
+whichever comes first, and the least recently used entry is evicted
+once the cache is full. Code that deletes a user or changes their role
+must call ``invalidate`` so a stale principal is never served.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable
+
+from config.app_config import settings
+from models import User
+from schemas.principal_cache import PrincipalCacheStats
+
+
+class PrincipalCache:
+    """A TTL and LRU bounded mapping of token keys to users.
+
+    Cached users are detached copies, so a request that modifies the
+    object it was handed cannot change what later requests see.
+
+    Args:
+        max_entries: Capacity before least recently used entries are evicted.
+        ttl_seconds: Maximum lifetime of an entry.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, User]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, username: str, token_id: Hashable) -> User | None:
+        """Return the cached user for a token, if still valid.
+
+        Args:
+            username: The token subject.
+            token_id: The token's ``jti``, or its ``exp`` if it has none.
+
+        Returns:
+            A copy of the cached user, or None on a miss.
+        """
+        key = (username, token_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            user = entry[1]
+        return User.model_validate(user)
+
+    def put(self, username: str, token_id: Hashable, user: User, token_exp: float | None = None) -> None:
+        """Cache a user for a token.
+
+        Args:
+            username: The token subject.
+            token_id: The token's ``jti``, or its ``exp`` if it has none.
+            user: The user loaded from the database.
+            token_exp: The token's expiry as a UNIX timestamp, if known.
+        """
+        if self.max_entries <= 0:
+            return
+        lifetime = self.ttl_seconds
+        if token_exp is not None:
+            lifetime = min(lifetime, token_exp - time.time())
+        if lifetime <= 0:
+            return
+        key = (username, token_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, User.model_validate(user))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, username: str) -> None:
+        """Drop every cached entry for a user.
+
+        Args:
+            username: The user whose entries should be removed.
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == username]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> PrincipalCacheStats:
+        """Return the current size and counters.
+
+        Returns:
+            A snapshot of the cache statistics.
+        """
+        with self._lock:
+            return PrincipalCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+            )
+
+
+# Singleton instance
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
@@ -4,33 +4,98 @@ This module provides password hashing, JWT token creation/verification,
 and user authentication functions for the application.
 """
 
+import asyncio
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from config.db import get_db_conn
 from config.app_config import settings
 from models import User
+from schemas.role import Role
 from email_validator import validate_email, EmailNotValidError
 from jose import jwt, JWTError
-from routes import user_routes
-from typing import Annotated
+from typing import Annotated, Any, Callable, TypeVar
 from fastapi.security import OAuth2PasswordBearer
+from auth.hashing import pwd_context, get_password_hash, verify_password
+from auth.principal_cache import principal_cache
 
-
-pwd_context = CryptContext(
-    schemes=["bcrypt"], deprecated="auto"
-)
+T = TypeVar("T")
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
+logger = logging.getLogger('main.security')
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pending = 0
+
+
+async def _run_in_hash_pool(func: Callable[..., T], *args: Any) -> T:
+    """Run a password hashing function in the hash worker pool.
+
+    bcrypt is deliberately slow, so running it on the event loop would
+    stall every other request. Calls are handed to a small process pool;
+    when too many are already waiting the request is rejected at once
+    instead of queueing behind them.
+
+    If a worker dies (an OOM kill, a crash) the pool is broken for good,
+    so it is discarded and the call retried once on a fresh pool.
+
+    Args:
+        func: A picklable function from auth.hashing.
+        *args: Arguments for the function.
+
+    Returns:
+        The function's return value.
+
+    Raises:
+        HTTPException: 503 error if the pool's queue is full, or if the
+            pool broke again after being restarted.
+    """
+    global _hash_pool, _hash_pending
+    if _hash_pending >= settings.password_hash_max_pending:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests",
+            headers={"Retry-After": "1"},
+        )
+    _hash_pending += 1
+    try:
+        for _ in range(2):
+            if _hash_pool is None:
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.password_hash_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            pool = _hash_pool
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                logger.warning("Password hash pool broken, restarting it")
+                # Concurrent calls fail together; only the first replaces the pool.
+                if _hash_pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    _hash_pool = None
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is temporarily unavailable",
+            headers={"Retry-After": "1"},
+        )
+    finally:
+        _hash_pending -= 1
+
 
-def get_password_hash(password: str) -> str:
-    """Hash a plaintext password using bcrypt.
+async def hash_password_async(password: str) -> str:
+    """Hash a plaintext password without blocking the event loop.
 
     Args:
         password: The plaintext password to hash.
@@ -38,11 +103,11 @@ def get_password_hash(password: str) -> str:
     Returns:
         The bcrypt-hashed password string.
     """
-    return pwd_context.hash(password)
+    return await _run_in_hash_pool(get_password_hash, password)
 
 
-def verify_password(plain_pwd: str, hash_pwd: str) -> bool:
-    """Verify a plaintext password against a hashed password.
+async def verify_password_async(plain_pwd: str, hash_pwd: str) -> bool:
+    """Verify a password against a hash without blocking the event loop.
 
     Args:
         plain_pwd: The plaintext password to verify.
@@ -51,10 +116,18 @@ def verify_password(plain_pwd: str, hash_pwd: str) -> bool:
     Returns:
         True if the password matches, False otherwise.
     """
-    return pwd_context.verify(plain_pwd, hash_pwd)
+    return await _run_in_hash_pool(verify_password, plain_pwd, hash_pwd)
+
 
+def shutdown_hash_pool() -> None:
+    """Stop the password hash worker processes, if they were started."""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(cancel_futures=True)
+        _hash_pool = None
 
-async def authenticate_user(uname: str, password: str, db: Session) -> User | None:
+
+async def authenticate_user(uname: str, password: str, db: AsyncSession) -> User | None:
     """Authenticate a user by username and password.
 
     Args:
@@ -65,11 +138,14 @@ async def authenticate_user(uname: str, password: str, db: Session) -> User | No
     Returns:
         The User object if authentication succeeds, None otherwise.
     """
-    user = db.exec(
+    user = (await db.exec(
         select(User).where(User.username == uname)
-    ).first()
+    )).first()
+    # End the read transaction so the connection goes back to the pool
+    # before the slow bcrypt check; a burst of logins cannot exhaust it.
+    await db.commit()
 
-    if not user or not verify_password(
+    if not user or not await verify_password_async(
             password, user.password
     ):
         return None
@@ -81,29 +157,27 @@ async def create_access_token(data: dict) -> str:
 
     Args:
         data: Dictionary containing claims to encode in the token.
-            Typically includes 'sub' (subject) with the username.
+            Typically includes 'sub' (subject) with the username. A
+            unique 'jti' is added so each token has its own cache entry.
 
     Returns:
         The encoded JWT token string.
     """
     to_encode = data.copy()
-    print(f"Token data to encode: {to_encode}")
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    print(f"Token expiration time: {expire}")
-
-    to_encode.update({"exp": expire})
-    print(f"Token data to encode: {to_encode}")
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
 
     encoded_jwt = jwt.encode(
         to_encode, SECRET_KEY, algorithm=ALGORITHM
     )
-    print(f"Encoded JWT: {encoded_jwt}")
+    logger.debug("Issued access token",
+                 extra={"username": to_encode.get("sub"), "jti": to_encode["jti"], "expires_at": expire.isoformat()})
     return encoded_jwt
 
 
-async def decode_access_token(token: str, db: Session) -> User | None:
+async def decode_access_token(token: str, db: AsyncSession) -> User | None:
     """Decode a JWT token and retrieve the associated user.
 
     Args:
@@ -118,24 +192,24 @@ async def decode_access_token(token: str, db: Session) -> User | None:
             token, SECRET_KEY, algorithms=ALGORITHM
         )
         username: str = payload.get("sub")
-        print(f"Decoded username: {username}")
     except JWTError:
-        print("JWT Error: Invalid token")
+        logger.debug("Rejected invalid access token")
         return None
     if not username:
         return None
 
-    print(f"Finding user with username: {username}")
-    user = await user_routes.find_user(username, db)
-    print(f"Found user: {user}")
+    user = (await db.exec(select(User).where(User.username == username))).first()
+    logger.debug("Decoded access token", extra={"username": username, "found": user is not None})
     return user
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db_conn)) -> User:
+async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: AsyncSession = Depends(get_db_conn)) -> User:
     """Get the current authenticated user from a JWT token.
 
     This is a FastAPI dependency that extracts and validates
-    the JWT token from the request Authorization header.
+    the JWT token from the request Authorization header. The user is
+    served from the principal cache when possible, so repeated requests
+    with the same token do not query the database.
 
     Args:
         token: JWT token extracted from the Authorization header.
@@ -159,11 +233,18 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Se
         if username is None:
             raise credentials_exception
     except JWTError:
+        logger.debug("Rejected invalid access token", extra={"sampled": True})
         raise credentials_exception
 
-    user = await user_routes.find_user(username, db)
+    token_id = payload.get("jti") or payload.get("exp")
+    user = principal_cache.get(username, token_id)
+    if user is not None:
+        return user
+
+    user = (await db.exec(select(User).where(User.username == username))).first()
     if user is None:
         raise credentials_exception
+    principal_cache.put(username, token_id, user, payload.get("exp"))
     return user
 
 
@@ -179,5 +260,22 @@ async def get_user_principal(current_user: Annotated[User, Depends(get_current_u
     Returns:
         The authenticated User object.
     """
-    print(f"Current user: {current_user}")
+    logger.debug("Authenticated request", extra={"username": current_user.username, "sampled": True})
+    return current_user
+
+
+async def get_admin_principal(current_user: Annotated[User, Depends(get_user_principal)]) -> User:
+    """Get the current user principal, requiring the ADMIN role.
+
+    Args:
+        current_user: The authenticated user from get_user_principal.
+
+    Returns:
+        The authenticated User object.
+
+    Raises:
+        HTTPException: 403 error if the user is not an administrator.
+    """
+    if current_user.user_role != Role.ADMIN.value:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Administrator access required")
     return current_user
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the outreach API.
+
+Benchmarks are standalone scripts run with ``python -m benchmarks.<name>``.
+They are not collected by pytest.
+"""
@@ -0,0 +1,102 @@
+"""Shared helpers for the benchmark scripts.
+
+This module provides database seeding and latency statistics used
+by the individual benchmarks.
+"""
+
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlmodel import SQLModel
+
+from models import EventType, Event, Participant
+
+STATES = ["IL", "CA", "NY", "TX", "WA", "FL", "OH", "GA"]
+
+
+def temp_sqlite_url(name: str = "bench") -> str:
+    """Return a URL for a fresh SQLite database file in a temp directory.
+
+    Args:
+        name: Base name for the database file.
+
+    Returns:
+        A synchronous SQLite URL.
+    """
+    directory = tempfile.mkdtemp(prefix="outreach-bench-")
+    return f"sqlite:///{os.path.join(directory, name)}.db"
+
+
+def seed_database(url: str, events: int, participants_per_event: int, seed: int = 42) -> None:
+    """Create the schema and bulk-load synthetic rows.
+
+    Args:
+        url: Synchronous database URL to seed.
+        events: Number of events to create.
+        participants_per_event: Number of participants per event.
+        seed: Random seed so runs are reproducible.
+    """
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    start = date(2024, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(EventType), [
+            {"id": i, "name": f"Type {i}", "description": "benchmark", "created_at": now}
+            for i in range(1, 6)
+        ])
+        conn.execute(insert(Event), [
+            {
+                "id": i,
+                "name": f"Event {i}",
+                "event_date": start + timedelta(days=rng.randrange(730)),
+                "description": "benchmark event",
+                "location": "Main Hall",
+                "event_type_id": rng.randrange(1, 6),
+                "created_at": now,
+            }
+            for i in range(1, events + 1)
+        ])
+        batch = []
+        for event_id in range(1, events + 1):
+            for n in range(participants_per_event):
+                batch.append({
+                    "first_name": f"First{n}",
+                    "last_name": f"Last{event_id}",
+                    "email": f"p{event_id}.{n}@example.com",
+                    "phone": "555-0100",
+                    "address": "1 Bench St",
+                    "city": "Springfield",
+                    "state": rng.choice(STATES),
+                    "zip_code": f"{rng.randrange(10000, 99999)}",
+                    "created_at": now,
+                    "event_id": event_id,
+                })
+            if len(batch) >= 10_000:
+                conn.execute(insert(Participant), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Participant), batch)
+    engine.dispose()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of values.
+
+    Args:
+        values: Sample values.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        The percentile value, or 0.0 for an empty sample.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
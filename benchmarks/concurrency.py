@@ -0,0 +1,87 @@
+"""Throughput of the API at increasing client concurrency.
+
+Seeds a temporary SQLite database, then drives the application
+in-process through ``httpx.ASGITransport`` with 1, 10 and 100
+concurrent clients issuing a mix of read requests.
+
+Usage:
+    python -m benchmarks.concurrency --requests 2000 --levels 1,10,100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from benchmarks.common import percentile, seed_database, temp_sqlite_url
+
+
+async def run_level(app, concurrency: int, total: int, events: int) -> dict:
+    """Issue ``total`` requests using ``concurrency`` parallel clients.
+
+    Args:
+        app: The ASGI application under test.
+        concurrency: Number of concurrent client tasks.
+        total: Total number of requests to issue.
+        events: Number of seeded events, used to pick request ids.
+
+    Returns:
+        Throughput and latency figures for this concurrency level.
+    """
+    from httpx import ASGITransport, AsyncClient
+
+    rng = random.Random(concurrency)
+    latencies: list[float] = []
+    remaining = total
+
+    async def worker(client: AsyncClient) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            event_id = rng.randrange(1, events + 1)
+            path = rng.choice([f"/event/read/{event_id}", f"/participant/list/{event_id}", "/type/list"])
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", default="1,10,100", help="comma separated client counts")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per level")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--participants", type=int, default=50, help="participants per event")
+    args = parser.parse_args()
+
+    url = temp_sqlite_url("concurrency")
+    seed_database(url, args.events, args.participants)
+    os.environ["database_url"] = url
+
+    from main import app
+
+    async def run_all() -> list[dict]:
+        return [await run_level(app, int(level), args.requests, args.events)
+                for level in args.levels.split(",")]
+
+    print(json.dumps(asyncio.run(run_all()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Runtime and accuracy of the duplicate detection job.
+
+Seeds a temporary SQLite database with synthetic people, each registered
+one to three times with realistic variations:
+- a typo in the first or last name;
+- dots, a ``+tag`` or a different domain in the email;
+- a reformatted phone number;
+- a ZIP+4 code.
+
+A share of the records also use a shared front-desk phone number. The
+benchmark then runs ``jobs.duplicates.find_duplicates`` and reports its
+step timings together with pairwise precision and recall against the
+known identities.
+
+Usage:
+    python -m benchmarks.duplicates --participants 2000000
+"""
+
+import argparse
+import itertools
+import json
+import random
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlmodel import SQLModel
+
+from benchmarks.common import temp_sqlite_url
+from jobs.duplicates import find_duplicates
+from models import Event, EventType, Participant
+
+FIRST_NAMES = ("James Mary Robert Patricia John Jennifer Michael Linda David Elizabeth William Barbara Richard "
+               "Susan Joseph Jessica Thomas Sarah Charles Karen Christopher Lisa Daniel Nancy Matthew Betty "
+               "Anthony Sandra Mark Margaret Donald Ashley Steven Kimberly Andrew Emily Paul Donna Joshua "
+               "Michelle Kenneth Carol Kevin Amanda Brian Melissa George Deborah Timothy Stephanie").split()
+SYLLABLES = ["an", "ber", "cor", "dal", "en", "fitz", "gar", "hol", "is", "jen", "kow", "lin", "mor", "nak",
+             "o", "per", "quin", "ros", "sten", "tor", "ul", "vas", "wil", "yam", "zel", "son", "ski", "ton"]
+DOMAINS = ["example.com", "mail.org", "inbox.net", "post.io"]
+FRONT_DESK_PHONE = "217-555-0100"
+PARTICIPANTS_PER_EVENT = 40
+
+
+def _typo(rng: random.Random, word: str) -> str:
+    position = rng.randrange(1, len(word))
+    return word[:position] + rng.choice("aeiourlnst") + word[position + 1:]
+
+
+def _variant(rng: random.Random, person: dict) -> dict:
+    first, last = person["first_name"], person["last_name"]
+    if rng.random() < 0.5:
+        first, last = (_typo(rng, first), last) if rng.random() < 0.5 else (first, _typo(rng, last))
+    local, domain = person["email"].split("@")
+    roll = rng.random()
+    if roll < 0.3:
+        local = f"{local[:1]}.{local[1:]}"
+    elif roll < 0.5:
+        local = f"{local}+events"
+    elif roll < 0.7:
+        domain = rng.choice(DOMAINS)
+    digits = person["phone"]
+    phone = rng.choice([f"({digits[:3]}) {digits[3:6]}-{digits[6:]}", f"1 {digits[:3]} {digits[3:6]} {digits[6:]}",
+                        f"{digits[:3]}.{digits[3:6]}.{digits[6:]}"])
+    zip_code = person["zip_code"] + (f"-{rng.randrange(1000, 9999)}" if rng.random() < 0.2 else "")
+    return {"first_name": first, "last_name": last, "email": f"{local}@{domain}", "phone": phone,
+            "zip_code": zip_code}
+
+
+def seed_people(url: str, participants: int, seed: int = 42) -> list[int]:
+    """Create the schema and load participant records for synthetic people.
+
+    Args:
+        url: Synchronous database URL to seed.
+        participants: Number of participant records to create.
+        seed: Random seed so runs are reproducible.
+
+    Returns:
+        The person number behind each record, in id order.
+    """
+    rng = random.Random(seed)
+    surnames = sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).title() for _ in range(60_000)})
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(surnames) + 1)))
+    events = -(-participants // PARTICIPANTS_PER_EVENT)
+    now = datetime.now(timezone.utc)
+    identities: list[int] = []
+
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(EventType), [{"id": 1, "name": "Type", "description": "benchmark", "created_at": now}])
+        conn.execute(insert(Event), [
+            {"id": i, "name": f"Event {i}", "event_date": date(2025, 1, 1), "location": "Main Hall",
+             "event_type_id": 1, "created_at": now}
+            for i in range(1, events + 1)
+        ])
+        batch = []
+        person_number = 0
+        while len(identities) < participants:
+            first, last = rng.choice(FIRST_NAMES), rng.choices(surnames, cum_weights=cum_weights)[0]
+            person = {
+                "first_name": first, "last_name": last,
+                "email": f"{first.lower()}{last.lower()}{person_number}@{rng.choice(DOMAINS)}",
+                "phone": f"{rng.randrange(200, 999)}{rng.randrange(200, 999)}{rng.randrange(1000, 9999)}",
+                "zip_code": f"{rng.randrange(10000, 99999)}",
+            }
+            copies = rng.choices([1, 2, 3], weights=[70, 20, 10])[0]
+            for copy in range(min(copies, participants - len(identities))):
+                record = dict(person) if copy == 0 else _variant(rng, person)
+                if rng.random() < 0.05:
+                    record["phone"] = FRONT_DESK_PHONE
+                batch.append({**record, "address": "1 Bench St", "city": "Springfield", "state": "IL",
+                              "created_at": now, "event_id": len(identities) // PARTICIPANTS_PER_EVENT + 1})
+                identities.append(person_number)
+            person_number += 1
+            if len(batch) >= 10_000:
+                conn.execute(insert(Participant), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Participant), batch)
+    engine.dispose()
+    return identities
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=2_000_000)
+    parser.add_argument("--threshold", type=float, default=85.0)
+    args = parser.parse_args()
+
+    url = temp_sqlite_url("duplicates")
+    identities = seed_people(url, args.participants)
+    engine = create_engine(url)
+    clusters, stats = find_duplicates(engine, args.threshold)
+    engine.dispose()
+
+    # Participant ids are assigned in insert order starting at 1.
+    found = {pair for cluster in clusters
+             for pair in itertools.combinations(sorted(member.id for member in cluster.members), 2)}
+    true_pairs = sum(count * (count - 1) // 2 for _, group in itertools.groupby(identities)
+                     for count in [len(list(group))])
+    correct = sum(identities[left - 1] == identities[right - 1] for left, right in found)
+    stats["precision"] = round(correct / len(found), 4) if found else 1.0
+    stats["recall"] = round(correct / true_pairs, 4) if true_pairs else 1.0
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Mixed read/write throughput of the database engine profiles.
+
+Seeds a temporary SQLite database per profile, then runs concurrent
+workers directly against an engine built by ``config.db.build_engine``.
+Most operations read an event and a page of its participants; the rest
+insert a participant and commit.
+
+Profiles:
+    baseline  SQLite defaults: rollback journal, synchronous=FULL, no mmap.
+    wal       WAL journal with synchronous=NORMAL.
+    tuned     The AppConfig defaults: WAL, NORMAL, mmap and a larger cache.
+
+Usage:
+    python -m benchmarks.engine_profiles --operations 4000 --workers 16 --write-ratio 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.common import percentile, seed_database, temp_sqlite_url
+from config.app_config import settings
+from config.db import build_engine
+from models import Event, Participant
+
+PROFILES = {
+    "baseline": {"sqlite_journal_mode": "DELETE", "sqlite_synchronous": "FULL", "sqlite_mmap_size": 0,
+                 "sqlite_cache_size": -2000},
+    "wal": {"sqlite_journal_mode": "WAL", "sqlite_synchronous": "NORMAL", "sqlite_mmap_size": 0,
+            "sqlite_cache_size": -2000},
+    "tuned": {},
+}
+
+
+async def run_profile(name: str, operations: int, workers: int, write_ratio: float, events: int) -> dict:
+    """Run the mixed workload against a freshly seeded database.
+
+    Args:
+        name: Key into PROFILES.
+        operations: Total operations to perform.
+        workers: Number of concurrent worker tasks.
+        write_ratio: Fraction of operations that insert a row.
+        events: Number of seeded events.
+
+    Returns:
+        Throughput, latency percentiles and error counts for the profile.
+    """
+    url = temp_sqlite_url(f"profile_{name}")
+    seed_database(url, events=events, participants_per_event=20)
+    engine = build_engine(url, settings.model_copy(update=PROFILES[name]))
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    rng = random.Random(7)
+    reads: list[float] = []
+    writes: list[float] = []
+    errors = 0
+    remaining = operations
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            event_id = rng.randrange(1, events + 1)
+            is_write = rng.random() < write_ratio
+            started = time.perf_counter()
+            try:
+                async with sessions() as db:
+                    if is_write:
+                        db.add(Participant(first_name="Bench", last_name="Writer", email="w@example.com",
+                                           event_id=event_id, created_at=datetime.now(timezone.utc)))
+                        await db.commit()
+                    else:
+                        await db.get(Event, event_id)
+                        (await db.exec(select(Participant).where(Participant.event_id == event_id).limit(20))).all()
+            except Exception:
+                errors += 1
+                continue
+            (writes if is_write else reads).append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    return {
+        "profile": name,
+        "throughput_ops": round((len(reads) + len(writes)) / elapsed, 1),
+        "read_p50_ms": round(percentile(reads, 50) * 1000, 2),
+        "read_p99_ms": round(percentile(reads, 99) * 1000, 2),
+        "write_p50_ms": round(percentile(writes, 50) * 1000, 2),
+        "write_p99_ms": round(percentile(writes, 99) * 1000, 2),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=4000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    args = parser.parse_args()
+
+    results = [
+        asyncio.run(run_profile(name, args.operations, args.workers, args.write_ratio, args.events))
+        for name in args.profiles.split(",")
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
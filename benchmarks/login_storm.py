@@ -0,0 +1,110 @@
+"""Latency of unrelated requests during a burst of logins.
+
+Fires a burst of concurrent ``/security/token`` logins while a probe
+client repeatedly fetches ``/event/list``, then reports the probe's
+latency percentiles. ``--mode inline`` runs bcrypt on the event loop, as
+the application did before hashing moved to a worker pool, for
+comparison.
+
+Usage:
+    python -m benchmarks.login_storm --logins 200 --mode pool
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+
+from sqlalchemy import create_engine, insert
+
+from benchmarks.common import percentile, seed_database, temp_sqlite_url
+
+
+async def run(app, logins: int) -> dict:
+    """Run the login burst and the probe concurrently.
+
+    Args:
+        app: The ASGI application under test.
+        logins: Number of concurrent login requests.
+
+    Returns:
+        Probe latency percentiles and login status counts.
+    """
+    from httpx import ASGITransport, AsyncClient
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        probe_latencies: list[float] = []
+        probe_errors: Counter[str] = Counter()
+        done = asyncio.Event()
+
+        async def probe() -> None:
+            while not done.is_set():
+                started = time.perf_counter()
+                try:
+                    await client.get("/event/list", params={"limit": 20})
+                except Exception as exc:
+                    probe_errors[type(exc).__name__] += 1
+                probe_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        async def login() -> int | str:
+            try:
+                response = await client.post("/security/token", params={"login": "storm", "pwd": "storm-password"})
+            except Exception as exc:
+                return type(exc).__name__
+            return response.status_code
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "logins": logins,
+        "login_statuses": dict(Counter(statuses)),
+        "burst_seconds": round(elapsed, 2),
+        "probe_requests": len(probe_latencies),
+        "probe_errors": dict(probe_errors),
+        "probe_p50_ms": round(percentile(probe_latencies, 50) * 1000, 2),
+        "probe_p99_ms": round(percentile(probe_latencies, 99) * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--mode", choices=["pool", "inline"], default="pool")
+    args = parser.parse_args()
+
+    url = temp_sqlite_url("login_storm")
+    seed_database(url, events=100, participants_per_event=0)
+    os.environ["database_url"] = url
+
+    from auth import security
+    from auth.hashing import get_password_hash
+    from main import app
+    from models import User
+
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": "storm", "password": get_password_hash("storm-password"),
+                                     "email": "storm@example.com", "user_role": "MEMBER"}])
+    engine.dispose()
+
+    if args.mode == "inline":
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+        security._run_in_hash_pool = run_inline
+
+    result = asyncio.run(run(app, args.logins))
+    security.shutdown_hash_pool()
+    print(json.dumps({"mode": args.mode, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Latency of fuzzy participant search at a million participants.
+
+Seeds a temporary SQLite database with participants whose surnames
+follow a skewed, Zipf-like frequency, as real surnames do. It then
+searches for randomly chosen participants by first and last name, with
+one letter of the surname misspelled. It times
+``utils.participant_search.search_participants`` across all events and
+within a single event. The same queries also run against the
+no-blocking baseline, which loads and scores every participant. That
+baseline is timed on only a few queries.
+
+Targets at 1M participants:
+    one event     p50 <= 50 ms, p99 <= 150 ms, hit rate 100%
+    all events    p50 <= 50 ms, p99 <= 200 ms, hit rate >= 75%
+
+Usage:
+    python -m benchmarks.participant_search --participants 1000000 --queries 200
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from datetime import date, datetime, timezone
+
+from rapidfuzz import fuzz, process, utils
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.common import percentile, temp_sqlite_url
+from config.db import build_engine
+from models import Event, EventType, Participant
+from utils.participant_search import search_participants
+
+FIRST_NAMES = ("James Mary Robert Patricia John Jennifer Michael Linda David Elizabeth William Barbara Richard "
+               "Susan Joseph Jessica Thomas Sarah Charles Karen Christopher Lisa Daniel Nancy Matthew Betty "
+               "Anthony Sandra Mark Margaret Donald Ashley Steven Kimberly Andrew Emily Paul Donna Joshua "
+               "Michelle Kenneth Carol Kevin Amanda Brian Melissa George Deborah Timothy Stephanie").split()
+SYLLABLES = ["an", "ber", "cor", "dal", "en", "fitz", "gar", "hol", "is", "jen", "kow", "lin", "mor", "nak",
+             "o", "per", "quin", "ros", "sten", "tor", "ul", "vas", "wil", "yam", "zel", "son", "ski", "ton"]
+PARTICIPANTS_PER_EVENT = 20
+
+
+def _surnames(rng: random.Random, count: int) -> list[str]:
+    names = {"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).title() for _ in range(count * 2)}
+    return sorted(names)[:count]
+
+
+def _misspell(rng: random.Random, word: str) -> str:
+    position = rng.randrange(1, len(word))
+    return word[:position] + rng.choice("aeiouy") + word[position + 1:]
+
+
+def seed_participants(url: str, participants: int, seed: int = 42) -> list[tuple[int, str, str]]:
+    """Create the schema and bulk-load events and participants.
+
+    Args:
+        url: Synchronous database URL to seed.
+        participants: Number of participants to create.
+        seed: Random seed so runs are reproducible.
+
+    Returns:
+        Event id, first name and last name of every seeded participant.
+    """
+    rng = random.Random(seed)
+    surnames = _surnames(rng, 20_000)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(surnames) + 1)))
+    events = -(-participants // PARTICIPANTS_PER_EVENT)
+    now = datetime.now(timezone.utc)
+    people = []
+
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(EventType), [{"id": 1, "name": "Type", "description": "benchmark", "created_at": now}])
+        conn.execute(insert(Event), [
+            {"id": i, "name": f"Event {i}", "event_date": date(2025, 1, 1), "location": "Main Hall",
+             "event_type_id": 1, "created_at": now}
+            for i in range(1, events + 1)
+        ])
+        for start in range(0, participants, 10_000):
+            batch = []
+            for n in range(start, min(start + 10_000, participants)):
+                first, last = rng.choice(FIRST_NAMES), rng.choices(surnames, cum_weights=cum_weights)[0]
+                event_id = n // PARTICIPANTS_PER_EVENT + 1
+                people.append((event_id, first, last))
+                batch.append({
+                    "first_name": first, "last_name": last, "email": f"{first[0]}.{last}{n}@example.com".lower(),
+                    "phone": "555-0100", "address": "1 Bench St", "city": "Springfield", "state": "IL",
+                    "zip_code": "62704",
+                    "created_at": now, "event_id": event_id,
+                })
+            conn.execute(insert(Participant), batch)
+    engine.dispose()
+    return people
+
+
+async def full_scan(db: AsyncSession, q: str, limit: int) -> list:
+    """Score every participant against the query, without blocking.
+
+    Args:
+        db: Database session.
+        q: The search text.
+        limit: Maximum number of matches to return.
+
+    Returns:
+        The best ``(choice, score, key)`` tuples.
+    """
+    rows = (await db.exec(select(Participant.id, Participant.first_name, Participant.last_name,
+                                 Participant.email))).all()
+    choices = {row.id: f"{row.first_name} {row.last_name} {row.email}" for row in rows}
+    return process.extract(q, choices, scorer=fuzz.WRatio, processor=utils.default_process, limit=limit)
+
+
+async def run(participants: int, queries: int, scans: int, limit: int) -> list[dict]:
+    """Time blocked search, per event and overall, and the full scan.
+
+    Args:
+        participants: Number of seeded participants.
+        queries: Number of timed queries per blocked mode.
+        scans: Number of timed full-scan queries.
+        limit: Matches requested per query.
+
+    Returns:
+        Latency percentiles and hit rate for each mode.
+    """
+    url = temp_sqlite_url("participant_search")
+    people = seed_participants(url, participants)
+    engine = build_engine(url)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(7)
+    sample = [rng.choice(people) for _ in range(queries)]
+    lookups = [(event_id, first, last, f"{first} {_misspell(rng, last)}") for event_id, first, last in sample]
+
+    results = []
+    async with sessions() as db:
+        for mode in ("all_events", "one_event"):
+            timings, hits = [], 0
+            for event_id, first, last, q in lookups:
+                started = time.perf_counter()
+                matches = await search_participants(db, q, event_id if mode == "one_event" else None, limit)
+                timings.append(time.perf_counter() - started)
+                hits += any(m.first_name == first and m.last_name == last for m in matches)
+            results.append({
+                "mode": mode, "participants": participants,
+                "p50_ms": round(percentile(timings, 50) * 1000, 2),
+                "p99_ms": round(percentile(timings, 99) * 1000, 2),
+                "hit_rate": round(hits / len(lookups), 3),
+            })
+
+        timings = []
+        for _, _, _, q in lookups[:scans]:
+            started = time.perf_counter()
+            await full_scan(db, q, limit)
+            timings.append(time.perf_counter() - started)
+        results.append({
+            "mode": "full_scan", "participants": participants,
+            "p50_ms": round(percentile(timings, 50) * 1000, 2),
+            "p99_ms": round(percentile(timings, 99) * 1000, 2),
+        })
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scans", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.participants, args.queries, args.scans, args.limit)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Latency of event search: the full-text index versus a LIKE scan.
+
+Seeds a temporary SQLite database with events whose names, descriptions
+are drawn from a vocabulary of made-up words, then times one page of
+``/event/search`` results built by ``utils.search.search_events``
+against a case-insensitive LIKE filter over the same three columns.
+Half the queries use two words and half use one. The LIKE filter is
+unranked, so it can stop at the first page of matches in id order.
+
+Usage:
+    python -m benchmarks.search --events 200000 --queries 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.common import percentile, temp_sqlite_url
+from config.db import build_engine
+from models import Event, EventType
+from utils.pagination import PageParams, fetch_column_page
+from utils.search import search_events
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "to", "sa", "vi", "dun", "pel", "ar", "os", "qui", "bra", "zen", "fo", "ly"]
+# Pronounceable made-up words: a vocabulary large enough that a
+# two-word query matches only a small share of events.
+WORDS = sorted({a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES})[:3000]
+CITIES = ["Springfield", "Riverside", "Fairview", "Madison", "Georgetown", "Salem", "Franklin", "Clinton"]
+
+
+def seed_events(url: str, events: int, seed: int = 42) -> None:
+    """Create the schema, including the search index, and load events.
+
+    Args:
+        url: Synchronous database URL to seed.
+        events: Number of events to create.
+        seed: Random seed so runs are reproducible.
+    """
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(EventType), [{"id": 1, "name": "Type", "description": "benchmark", "created_at": now}])
+        for start in range(0, events, 10_000):
+            conn.execute(insert(Event), [
+                {
+                    "name": " ".join(rng.sample(WORDS, 3)).title(),
+                    "event_date": date(2024, 1, 1) + timedelta(days=rng.randrange(730)),
+                    "description": " ".join(rng.choices(WORDS, k=20)),
+                    "location": f"{rng.choice(CITIES)} {rng.choice(['Hall', 'Park', 'Center'])}",
+                    "event_type_id": 1,
+                    "created_at": now,
+                }
+                for _ in range(start, min(start + 10_000, events))
+            ])
+    engine.dispose()
+
+
+async def run(events: int, queries: int, limit: int) -> list[dict]:
+    """Time both search strategies over the same random queries.
+
+    Args:
+        events: Number of seeded events.
+        queries: Number of timed queries per strategy.
+        limit: Page size requested per query.
+
+    Returns:
+        Latency percentiles for each strategy.
+    """
+    url = temp_sqlite_url("search")
+    seed_events(url, events)
+    engine = build_engine(url)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rng = random.Random(7)
+    terms = [" ".join(rng.sample(WORDS, 2)) for _ in range(queries // 2)]
+    terms += [rng.choice(WORDS) for _ in range(queries - len(terms))]
+    params = PageParams(limit=limit, after=None)
+    fields = select(*Event.__table__.c)
+
+    def like_scan(q: str):
+        columns = [Event.name, Event.description, Event.location]
+        statement = fields
+        for word in q.split():
+            statement = statement.where(or_(*(column.ilike(f"%{word}%") for column in columns)))
+        return statement, [Event.id]
+
+    results = []
+    async with sessions() as db:
+        for name, build in (("fts", lambda q: search_events(fields, q, "sqlite")), ("like", like_scan)):
+            timings = []
+            for q in terms:
+                statement, keys = build(q)
+                started = time.perf_counter()
+                await fetch_column_page(db, statement, keys, params)
+                timings.append(time.perf_counter() - started)
+            results.append({
+                "strategy": name,
+                "events": events,
+                "p50_ms": round(percentile(timings, 50) * 1000, 2),
+                "p99_ms": round(percentile(timings, 99) * 1000, 2),
+            })
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.events, args.queries, args.limit)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
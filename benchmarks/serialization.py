@@ -0,0 +1,119 @@
+"""Cost of serializing a large list response, by serialization path.
+
+Seeds a temporary SQLite database and serves the same participant rows
+from a small FastAPI app in three ways, then times full requests through
+an in-process ASGI client.
+
+Paths:
+    orm_stdlib   ORM objects validated into the response model and
+                 encoded with the stdlib JSONResponse (the old default).
+    orm_orjson   The same response-model path, encoded with ORJSONResponse.
+    columns      Selected columns handed straight to orjson, as
+                 ``utils.pagination.paginate_json`` does.
+
+Usage:
+    python -m benchmarks.serialization --rows 10000 --requests 20
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.common import percentile, seed_database, temp_sqlite_url
+from config.db import build_engine
+from models import Participant
+from schemas.participant import ParticipantSchema
+from utils.pagination import schema_columns
+
+PARTICIPANTS_PER_EVENT = 20
+
+
+def build_app(url: str, rows: int) -> FastAPI:
+    """Create an app exposing one endpoint per serialization path.
+
+    Args:
+        url: Async database URL to read from.
+        rows: Number of participants each endpoint returns.
+
+    Returns:
+        The benchmark application.
+    """
+    engine = build_engine(url)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def get_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/orm_stdlib", response_model=list[ParticipantSchema], response_class=JSONResponse)
+    async def orm_stdlib(db: AsyncSession = Depends(get_db)):
+        return (await db.exec(select(Participant).order_by(Participant.id).limit(rows))).all()
+
+    @app.get("/orm_orjson", response_model=list[ParticipantSchema], response_class=ORJSONResponse)
+    async def orm_orjson(db: AsyncSession = Depends(get_db)):
+        return (await db.exec(select(Participant).order_by(Participant.id).limit(rows))).all()
+
+    @app.get("/columns", response_model=list[ParticipantSchema])
+    async def columns(db: AsyncSession = Depends(get_db)):
+        statement = select(*schema_columns(Participant, ParticipantSchema)).order_by(Participant.id).limit(rows)
+        return ORJSONResponse([row._asdict() for row in (await db.exec(statement)).all()])
+
+    app.state.engine = engine
+    return app
+
+
+async def run(rows: int, requests: int) -> list[dict]:
+    """Time each serialization path over a freshly seeded database.
+
+    Args:
+        rows: Number of participants returned per request.
+        requests: Number of timed requests per path.
+
+    Returns:
+        Latency percentiles and response size for each path.
+    """
+    url = temp_sqlite_url("serialization")
+    seed_database(url, events=-(-rows // PARTICIPANTS_PER_EVENT), participants_per_event=PARTICIPANTS_PER_EVENT)
+    app = build_app(url, rows)
+
+    results = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for path in ("orm_stdlib", "orm_orjson", "columns"):
+            body = (await client.get(f"/{path}")).content  # warm up
+            timings = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get(f"/{path}")
+                timings.append(time.perf_counter() - started)
+                response.raise_for_status()
+            results.append({
+                "path": path,
+                "rows": len(json.loads(body)),
+                "bytes": len(body),
+                "p50_ms": round(percentile(timings, 50) * 1000, 1),
+                "p99_ms": round(percentile(timings, 99) * 1000, 1),
+            })
+    await app.state.engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.rows, args.requests)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,583 @@
+"""Load and latency suite covering every API endpoint.
+
+Seeds one SQLite database per size (10k, 100k and 1M participants by
+default) and drives every route of the application against it, either
+in-process through ``httpx.ASGITransport`` or over HTTP against a real
+uvicorn process. Each endpoint gets a warmup, then a fixed number of
+requests from concurrent clients. Requests that need their own
+resource, such as a delete, create it beforehand, outside the timing.
+
+``run`` reports p50/p95/p99 latency and throughput per endpoint and the
+peak RSS of the application per size as JSON. ``compare`` matches two
+reports and flags endpoints whose p95 latency grew, or whose throughput
+fell, by more than a threshold, exiting with status 1 if any did.
+
+Seeded databases are kept in ``--data-dir`` and reused by later runs,
+since the data is the same for a given size and seed.
+
+Usage:
+    python -m benchmarks.suite run --sizes 10000,100000,1000000 --output base.json
+    python -m benchmarks.suite run --server uvicorn --sizes 10000 --output head.json
+    python -m benchmarks.suite compare base.json head.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from benchmarks.common import percentile, seed_database
+
+PARTICIPANTS_PER_EVENT = 50
+EVENT_TYPES = 5
+BENCH_USER = "bench"
+BENCH_PASSWORD = "bench-password"
+
+# Routes the suite does not drive, with the reason.
+SKIPPED = {
+    "/diagnostics/": "needs MEMORY_DIAGNOSTICS, whose tracing would distort every other measurement",
+    "/{full_path:path}": "serves the built frontend, not the API",
+}
+
+
+class Context(NamedTuple):
+    """What the endpoint scenarios know about the seeded database.
+
+    Attributes:
+        events: Number of seeded events, with ids from 1.
+        participants: Number of seeded participants, with ids from 1.
+        token: Bearer token of the benchmark user.
+    """
+
+    events: int
+    participants: int
+    token: str
+
+
+# A request: method, path, and keyword arguments for ``httpx.AsyncClient.request``.
+Request = tuple[str, str, dict]
+
+
+class Endpoint(NamedTuple):
+    """One route and how to build requests for it.
+
+    Attributes:
+        route: ``METHOD /path`` as registered on the application.
+        build: Returns the next request, given a client for any setup
+            the request needs, a random generator and the context.
+        heavy: Whether each request reads a whole table, like the
+            exports, and runs ``--heavy-requests`` times instead.
+    """
+
+    route: str
+    build: Callable[[Any, random.Random, Context], Awaitable[Request]]
+    heavy: bool = False
+
+
+def _participant(rng: random.Random, event_id: int) -> dict:
+    n = rng.randrange(10 ** 9)
+    return {"first_name": f"Bench{n}", "last_name": "Runner", "email": f"bench{n}@example.com",
+            "phone": "555-0100", "address": "1 Bench St", "city": "Springfield", "state": "IL",
+            "zip_code": "62704", "event_id": event_id}
+
+
+def _event(rng: random.Random) -> dict:
+    return {"name": f"Bench {rng.randrange(10 ** 9)}", "event_date": f"2025-{rng.randrange(1, 13):02d}-15",
+            "location": "Annex", "event_type_id": rng.randrange(1, EVENT_TYPES + 1)}
+
+
+async def _created_id(client, path: str, body: dict) -> int:
+    response = await client.post(path, json=body)
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def _get(path: str, **params) -> Callable[..., Awaitable[Request]]:
+    async def build(client, rng: random.Random, ctx: Context) -> Request:
+        values = {"event": rng.randrange(1, ctx.events + 1), "participant": rng.randrange(1, ctx.participants + 1),
+                  "type": rng.randrange(1, EVENT_TYPES + 1)}
+        return "GET", path.format(**values), {"params": {k: v.format(**values) for k, v in params.items()}}
+    return build
+
+
+def _authorized(path: str) -> Callable[..., Awaitable[Request]]:
+    async def build(client, rng: random.Random, ctx: Context) -> Request:
+        return "GET", path, {"headers": {"Authorization": f"Bearer {ctx.token}"}}
+    return build
+
+
+async def _put_back(client, read_path: str, update_path: str, fields: tuple[str, ...]) -> Request:
+    current = (await client.get(read_path)).json()
+    return "PUT", update_path, {"json": {name: current[name] for name in fields}}
+
+
+async def _update_type(client, rng: random.Random, ctx: Context) -> Request:
+    id = rng.randrange(1, EVENT_TYPES + 1)
+    return await _put_back(client, f"/type/read/{id}", f"/type/update/{id}", ("name", "description"))
+
+
+async def _update_event(client, rng: random.Random, ctx: Context) -> Request:
+    id = rng.randrange(1, ctx.events + 1)
+    return await _put_back(client, f"/event/read/{id}", f"/event/update/{id}",
+                           ("name", "event_date", "description", "location", "event_type_id"))
+
+
+async def _delete_type(client, rng: random.Random, ctx: Context) -> Request:
+    id = await _created_id(client, "/type/create", {"name": f"Doomed {rng.randrange(10 ** 9)}"})
+    return "DELETE", f"/type/delete/{id}", {}
+
+
+async def _delete_event(client, rng: random.Random, ctx: Context) -> Request:
+    id = await _created_id(client, "/event/create", _event(rng))
+    for _ in range(PARTICIPANTS_PER_EVENT):
+        await client.post(f"/event/participant/add/{id}", json=_participant(rng, id))
+    return "DELETE", f"/event/delete/{id}", {}
+
+
+async def _delete_participant(client, rng: random.Random, ctx: Context) -> Request:
+    id = await _created_id(client, "/participant/create", _participant(rng, rng.randrange(1, ctx.events + 1)))
+    return "DELETE", f"/participant/delete/{id}", {}
+
+
+async def _delete_user(client, rng: random.Random, ctx: Context) -> Request:
+    n = rng.randrange(10 ** 9)
+    id = await _created_id(client, "/user/create", {"username": f"doomed{n}", "password": "doomed-password",
+                                                    "first_name": "Doomed", "last_name": "User",
+                                                    "email": f"doomed{n}@example.com"})
+    return "DELETE", f"/user/delete/{id}", {}
+
+
+async def _batch(client, rng: random.Random, ctx: Context) -> Request:
+    doomed = [await _created_id(client, "/event/create", _event(rng)) for _ in range(5)]
+    updates = []
+    for _ in range(5):
+        _, path, kwargs = await _update_event(client, rng, ctx)
+        updates.append({"id": int(path.rsplit("/", 1)[1]), **kwargs["json"]})
+    return "POST", "/event/batch", {"json": {"create": [_event(rng) for _ in range(5)], "update": updates,
+                                             "delete": doomed}}
+
+
+async def _import(client, rng: random.Random, ctx: Context) -> Request:
+    rows = [_participant(rng, rng.randrange(1, ctx.events + 1)) for _ in range(100)]
+    lines = [",".join(rows[0])] + [",".join(str(value) for value in row.values()) for row in rows]
+    return "POST", "/participant/import", {"files": {"file": ("bench.csv", "\n".join(lines).encode(), "text/csv")}}
+
+
+def _post(path: str, body: Callable[[random.Random, Context], dict]) -> Callable[..., Awaitable[Request]]:
+    async def build(client, rng: random.Random, ctx: Context) -> Request:
+        return "POST", path.format(event=rng.randrange(1, ctx.events + 1)), {"json": body(rng, ctx)}
+    return build
+
+
+def _new_user(rng: random.Random, ctx: Context) -> dict:
+    n = rng.randrange(10 ** 9)
+    return {"username": f"user{n}", "password": "user-password", "first_name": "New", "last_name": "User",
+            "email": f"user{n}@example.com"}
+
+
+async def _login(client, rng: random.Random, ctx: Context) -> Request:
+    return "POST", "/security/token", {"params": {"login": BENCH_USER, "pwd": BENCH_PASSWORD}}
+
+
+ENDPOINTS = [
+    Endpoint("POST /type/create", _post("/type/create", lambda rng, ctx: {"name": f"Type {rng.randrange(10 ** 9)}"})),
+    Endpoint("GET /type/read/{id}", _get("/type/read/{type}")),
+    Endpoint("PUT /type/update/{id}", _update_type),
+    Endpoint("DELETE /type/delete/{id}", _delete_type),
+    Endpoint("GET /type/list", _get("/type/list")),
+    Endpoint("POST /event/create", _post("/event/create", lambda rng, ctx: _event(rng))),
+    Endpoint("GET /event/list", _get("/event/list")),
+    Endpoint("GET /event/export", _get("/event/export"), heavy=True),
+    Endpoint("GET /event/search", _get("/event/search", q="Event {event}")),
+    Endpoint("GET /event/read/{id}", _get("/event/read/{event}", expand="event_type,participant_count")),
+    Endpoint("GET /event/list/{start_date}/{end_date}", _get("/event/list/2024-03-01/2024-04-30")),
+    Endpoint("PUT /event/update/{id}", _update_event),
+    Endpoint("DELETE /event/delete/{id}", _delete_event),
+    Endpoint("POST /event/participant/add/{event_id}",
+             _post("/event/participant/add/{event}", lambda rng, ctx: _participant(rng, 0))),
+    Endpoint("POST /event/batch", _batch),
+    Endpoint("POST /participant/create",
+             _post("/participant/create", lambda rng, ctx: _participant(rng, rng.randrange(1, ctx.events + 1)))),
+    Endpoint("GET /participant/list/{event_id}", _get("/participant/list/{event}")),
+    # Misspelled on purpose: the search is fuzzy.
+    Endpoint("GET /participant/search", _get("/participant/search", q="Frist3 Last{event}")),
+    Endpoint("GET /participant/read/{id}", _get("/participant/read/{participant}")),
+    Endpoint("DELETE /participant/delete/{id}", _delete_participant),
+    Endpoint("GET /participant/list", _get("/participant/list")),
+    Endpoint("GET /participant/export", _get("/participant/export"), heavy=True),
+    Endpoint("POST /participant/import", _import),
+    Endpoint("POST /user/create", _post("/user/create", _new_user)),
+    Endpoint("GET /user/read/{id}", _get("/user/read/1")),
+    Endpoint("GET /user/find/{username}", _get(f"/user/find/{BENCH_USER}")),
+    Endpoint("DELETE /user/delete/{id}", _delete_user),
+    Endpoint("GET /user/list", _get("/user/list")),
+    Endpoint("POST /security/token", _login),
+    Endpoint("GET /security/users/me", _authorized("/security/users/me")),
+    Endpoint("GET /security/cache/stats", _authorized("/security/cache/stats")),
+    Endpoint("GET /stats/events", _get("/stats/events", group_by="event_type,month")),
+    Endpoint("GET /stats/participants", _get("/stats/participants", group_by="month,state")),
+    Endpoint("GET /dashboard/summary", _get("/dashboard/summary")),
+]
+
+
+def prepare_database(path: str, participants: int, seed: int) -> None:
+    """Seed a benchmark database unless it already exists.
+
+    Besides the events and participants this adds the benchmark user,
+    and builds the search index and the rollup tables, which the bulk
+    seeding bypasses.
+
+    Args:
+        path: File the SQLite database is written to.
+        participants: Number of participants to seed.
+        seed: Random seed of the data.
+    """
+    if os.path.exists(path):
+        return
+    from sqlalchemy import create_engine, insert
+
+    from auth.hashing import get_password_hash
+    from jobs.rollups import rebuild_rollups
+    from models import User
+    from utils.search import create_search_index
+
+    partial = f"{path}.partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    url = f"sqlite:///{partial}"
+    seed_database(url, max(1, participants // PARTICIPANTS_PER_EVENT), PARTICIPANTS_PER_EVENT, seed)
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": BENCH_USER, "password": get_password_hash(BENCH_PASSWORD),
+                                     "first_name": "Bench", "last_name": "User", "email": "bench@example.com",
+                                     "user_role": "MEMBER"}])
+        create_search_index(conn)
+    rebuild_rollups(engine)
+    engine.dispose()
+    os.replace(partial, path)
+
+
+async def measure(client, endpoint: Endpoint, ctx: Context, requests: int, warmup: int, concurrency: int,
+                  seed: int) -> dict:
+    """Time requests to one endpoint.
+
+    Args:
+        client: HTTP client bound to the application.
+        endpoint: The route and its request builder.
+        ctx: What is known about the seeded database.
+        requests: Number of timed requests.
+        warmup: Number of untimed requests sent first.
+        concurrency: Number of clients sending the timed requests.
+        seed: Random seed, combined with the route for its requests.
+
+    Returns:
+        Latency percentiles, throughput and error count of the endpoint.
+    """
+    rng = random.Random(f"{seed}:{endpoint.route}")
+    pending = [await endpoint.build(client, rng, ctx) for _ in range(warmup + requests)]
+    for method, path, kwargs in pending[:warmup]:
+        await client.request(method, path, **kwargs)
+    pending = pending[warmup:]
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while pending:
+            method, path, kwargs = pending.pop()
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            errors += not response.is_success
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "endpoint": endpoint.route,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+async def drive(client, participants: int, args: argparse.Namespace) -> list[dict]:
+    """Measure every endpoint against one seeded database.
+
+    Args:
+        client: HTTP client bound to the application.
+        participants: Number of seeded participants.
+        args: Parsed command line arguments.
+
+    Returns:
+        One result per endpoint, in suite order.
+    """
+    response = await client.post("/security/token", params={"login": BENCH_USER, "pwd": BENCH_PASSWORD})
+    response.raise_for_status()
+    ctx = Context(max(1, participants // PARTICIPANTS_PER_EVENT), participants, response.json()["access_token"])
+    selected = [endpoint for endpoint in ENDPOINTS
+                if not args.endpoints or any(part in endpoint.route for part in args.endpoints.split(","))]
+    results = []
+    for endpoint in selected:
+        requests = args.heavy_requests if endpoint.heavy else args.requests
+        results.append(await measure(client, endpoint, ctx, requests, min(args.warmup, requests),
+                                     args.concurrency, args.seed))
+        print(f"  {endpoint.route}: p95 {results[-1]['p95_ms']} ms", file=sys.stderr)
+    return results
+
+
+def _peak_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """Peak resident set size of a process, from /proc where available."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return None
+
+
+def _run_in_process(url: str, participants: int, args: argparse.Namespace) -> dict:
+    # Runs in a fresh process, so the application is imported against
+    # this size's database and the peak RSS is its own.
+    os.environ["database_url"] = url
+    from httpx import ASGITransport, AsyncClient
+
+    from auth import security
+    from main import app
+
+    async def run() -> list[dict]:
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await drive(client, participants, args)
+
+    endpoints = asyncio.run(run())
+    security.shutdown_hash_pool()
+    return {"endpoints": endpoints, "peak_rss_mb": _peak_rss_mb()}
+
+
+def _in_new_process(func: Callable, *args):
+    """Call a function in a fresh interpreter and return its result."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(func, *args).result()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run_with_server(url: str, participants: int, args: argparse.Namespace) -> dict:
+    from httpx import AsyncClient, HTTPError
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env={**os.environ, "database_url": url}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    async def run() -> list[dict]:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    (await client.get("/type/list")).raise_for_status()
+                    break
+                except HTTPError:
+                    if time.monotonic() > deadline or server.poll() is not None:
+                        raise RuntimeError("uvicorn did not start")
+                    await asyncio.sleep(0.2)
+            return await drive(client, participants, args)
+
+    try:
+        endpoints = asyncio.run(run())
+        return {"endpoints": endpoints, "peak_rss_mb": _peak_rss_mb(server.pid)}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def uncovered_routes() -> list[str]:
+    """Return the application's routes that the suite has no scenario for.
+
+    Returns:
+        ``METHOD /path`` of each route neither driven nor skipped on purpose.
+    """
+    from fastapi.routing import APIRoute
+
+    from main import app
+
+    covered = {endpoint.route for endpoint in ENDPOINTS}
+    routes = [f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute)
+              for method in sorted(route.methods)
+              if method != "HEAD" and not any(route.path.startswith(prefix) for prefix in SKIPPED)]
+    return [route for route in routes if route not in covered]
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Seed each size and measure every endpoint against it.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        The report.
+    """
+    os.makedirs(args.data_dir, exist_ok=True)
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    sizes = []
+    for participants in (int(size) for size in args.sizes.split(",")):
+        path = os.path.join(args.data_dir, f"suite-{participants}-{args.seed}.db")
+        started = time.perf_counter()
+        # Seeding runs in its own process so its memory is not reported.
+        _in_new_process(prepare_database, path, participants, args.seed)
+        prepared = time.perf_counter() - started
+        # Work on a copy so the writes of one run do not leak into the next.
+        working = os.path.join(args.data_dir, f"run-{participants}.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(working + suffix):
+                os.remove(working + suffix)
+        shutil.copyfile(path, working)
+        url = f"sqlite+aiosqlite:///{working}"
+
+        print(f"{participants} participants ({prepared:.1f}s to prepare)", file=sys.stderr)
+        if args.server == "uvicorn":
+            result = _run_with_server(url, participants, args)
+        else:
+            result = _in_new_process(_run_in_process, url, participants, args)
+        sizes.append({"participants": participants, "events": max(1, participants // PARTICIPANTS_PER_EVENT),
+                      "prepare_seconds": round(prepared, 1), **result})
+
+    return {
+        "meta": {
+            "started_at": started_at,
+            "server": args.server,
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "heavy_requests": args.heavy_requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "sizes": sizes,
+        "skipped": {**SKIPPED, **{route: "no scenario" for route in uncovered_routes()}},
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(base: dict, head: dict, threshold: float, min_ms: float) -> dict:
+    """Find endpoints that got slower between two reports.
+
+    An endpoint regresses when its p95 latency grew by more than
+    ``threshold`` (and by at least ``min_ms``, to ignore noise on fast
+    endpoints) or its throughput fell by more than ``threshold``. Peak
+    RSS per size is checked against the same threshold.
+
+    Args:
+        base: The reference report.
+        head: The report to check.
+        threshold: Relative change that counts, e.g. 0.15 for 15%.
+        min_ms: Smallest p95 increase, in milliseconds, that counts.
+
+    Returns:
+        The regressions and the number of endpoints compared.
+    """
+    regressions = []
+    compared = 0
+    base_sizes = {size["participants"]: size for size in base["sizes"]}
+    for size in head["sizes"]:
+        reference = base_sizes.get(size["participants"])
+        if reference is None:
+            continue
+        if (size["peak_rss_mb"] and reference["peak_rss_mb"]
+                and size["peak_rss_mb"] > reference["peak_rss_mb"] * (1 + threshold)):
+            regressions.append({"participants": size["participants"], "metric": "peak_rss_mb",
+                                "base": reference["peak_rss_mb"], "head": size["peak_rss_mb"]})
+        endpoints = {result["endpoint"]: result for result in reference["endpoints"]}
+        for result in size["endpoints"]:
+            old = endpoints.get(result["endpoint"])
+            if old is None:
+                continue
+            compared += 1
+            checks = [
+                ("p95_ms", result["p95_ms"] > old["p95_ms"] * (1 + threshold)
+                 and result["p95_ms"] - old["p95_ms"] >= min_ms),
+                ("throughput_rps", result["throughput_rps"] < old["throughput_rps"] * (1 - threshold)),
+                ("errors", result["errors"] > old["errors"]),
+            ]
+            regressions.extend({"participants": size["participants"], "endpoint": result["endpoint"],
+                                "metric": metric, "base": old[metric], "head": result[metric]}
+                               for metric, regressed in checks if regressed)
+    return {"threshold": threshold, "compared": compared, "regressions": regressions}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="measure every endpoint")
+    run_parser.add_argument("--sizes", default="10000,100000,1000000", help="comma separated participant counts")
+    run_parser.add_argument("--server", choices=["asgi", "uvicorn"], default="asgi",
+                            help="drive the app in-process or through a uvicorn process")
+    run_parser.add_argument("--requests", type=int, default=200, help="timed requests per endpoint")
+    run_parser.add_argument("--heavy-requests", type=int, default=3, help="timed requests per export endpoint")
+    run_parser.add_argument("--warmup", type=int, default=5, help="untimed requests per endpoint")
+    run_parser.add_argument("--concurrency", type=int, default=10, help="concurrent clients per endpoint")
+    run_parser.add_argument("--endpoints", help="only routes containing one of these comma separated strings")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "outreach-bench-suite"),
+                            help="where seeded databases are kept between runs")
+    run_parser.add_argument("--output", help="write the report here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two reports")
+    compare_parser.add_argument("base", help="report of the reference run")
+    compare_parser.add_argument("head", help="report of the run to check")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="relative change that counts")
+    compare_parser.add_argument("--min-ms", type=float, default=1.0, help="smallest p95 increase that counts")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.base) as base, open(args.head) as head:
+            report = compare(json.load(base), json.load(head), args.threshold, args.min_ms)
+        print(json.dumps(report, indent=2))
+        raise SystemExit(1 if report["regressions"] else 0)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ This module defines the application configuration using Pydantic settings,
 loading values from environment variables and .env file.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -22,7 +24,44 @@ class AppConfig(BaseSettings):
         db_password: Database password for connection.
         host: Host address for the API server.
         port: Port number for the API server.
-        log_level: Logging level (e.g., info, debug, warning).
+        log_level: Logging level (e.g., info, debug, warning), optionally
+            followed by per-module overrides such as
+            ``info,main.security=debug``.
+        log_debug_sample_rate: Fraction of high-volume debug lines kept.
+        password_hash_workers: Number of processes used for bcrypt hashing.
+        password_hash_max_pending: Hash requests allowed in flight before
+            new ones are rejected with 503.
+        principal_cache_ttl_seconds: Seconds an authenticated user is served
+            from memory before being reloaded from the database.
+        principal_cache_max_entries: Principals kept before the least
+            recently used are evicted; 0 disables the cache.
+        memory_diagnostics: Trace allocations with tracemalloc and enable the
+            admin-only /diagnostics/memory endpoints. Off by default because
+            tracing slows down every allocation.
+        memory_diagnostics_frames: Stack frames recorded per traced allocation.
+        sqlite_journal_mode: SQLite journal mode set on every connection.
+            WAL lets readers run alongside a writer.
+        sqlite_synchronous: SQLite fsync policy. NORMAL is safe with WAL.
+        sqlite_mmap_size: Bytes of the SQLite file to memory-map; 0 disables.
+        sqlite_cache_size: SQLite page cache size; negative values are KiB.
+        sqlite_busy_timeout_ms: How long SQLite waits on a locked database
+            before failing.
+        db_pool_size: Connections kept open in the pool.
+        db_max_overflow: Extra connections allowed beyond db_pool_size.
+        db_pool_timeout: Seconds to wait for a free connection.
+        db_pool_recycle: Seconds after which a server connection is replaced;
+            -1 disables. Not used for SQLite.
+        db_pool_pre_ping: Test server connections before handing them out.
+            Not used for SQLite.
+        db_statement_timeout_ms: PostgreSQL statement_timeout for every
+            connection; 0 disables.
+        database_replica_urls: Read replica URLs for GET handlers, as a JSON
+            list. Empty means all reads go to the primary.
+        replica_health_check_seconds: Seconds between health checks of a replica.
+        read_your_writes_seconds: How long a client's reads go to the
+            primary after it writes; 0 disables.
+        dashboard_cache_ttl_seconds: Seconds the dashboard summary is
+            served from memory before it is recomputed; 0 disables.
     """
 
     database_url: str
@@ -34,6 +73,28 @@ class AppConfig(BaseSettings):
     host: str
     port: int
     log_level: str
+    log_debug_sample_rate: float = 0.1
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+    principal_cache_ttl_seconds: float = 60.0
+    principal_cache_max_entries: int = 1024
+    memory_diagnostics: bool = False
+    memory_diagnostics_frames: int = 1
+    sqlite_journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30000
+    database_replica_urls: list[str] = []
+    replica_health_check_seconds: float = 10.0
+    read_your_writes_seconds: float = 5.0
+    dashboard_cache_ttl_seconds: float = 5.0
 
     model_config = SettingsConfigDict(env_file=".env")
 
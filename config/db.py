@@ -1,35 +1,309 @@
 """Database configuration and connection management.
 
 This module provides database initialization and session management
-for the SQLModel ORM.
+for the SQLModel ORM. Sessions are asynchronous so that route handlers
+never block the event loop while waiting on the database.
+
+Writes use ``get_db_conn``, which always talks to the primary. Read-only
+handlers use ``get_read_db_conn``, which spreads sessions across the
+configured read replicas and falls back to the primary when none is
+healthy. After a client writes, ``ReadYourWritesMiddleware`` pins its
+reads to the primary for a short window so it never sees replica lag.
 """
 
-from sqlmodel import Session, create_engine, SQLModel
-from models import EventType, Event, Participant, User
-from config.app_config import settings
-from typing import Generator
+import asyncio
+import itertools
+import logging
+import math
+import time
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import EventType, Event, Participant, ResourceVersion, User
+from config.app_config import AppConfig, settings
+from utils.search import create_search_index
+from utils import rollups  # noqa: F401 - registers the rollup flush listeners
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, AsyncGenerator
+
+logger = logging.getLogger('main.db')
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+REPLICA_CHECK_TIMEOUT = 2.0
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Translate a database URL to its asyncio driver equivalent.
+
+    URLs that already name an async driver are returned unchanged, so
+    ``.env`` files can keep using the plain ``sqlite://`` form.
+
+    Args:
+        url: Database connection URL.
+
+    Returns:
+        The URL rewritten to use an asyncio-capable driver.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options(url: str, config: AppConfig = settings) -> dict[str, Any]:
+    """Build create_engine keyword arguments for a database URL.
+
+    SQLite gets connection pool sizing only; its tuning is applied as
+    pragmas on connect (see ``build_engine``). Server databases also get
+    connection recycling, pre-ping and, for PostgreSQL, a statement
+    timeout sent as a session setting when each connection opens.
+
+    Args:
+        url: Database connection URL, in its async driver form.
+        config: Settings supplying the engine profile.
+
+    Returns:
+        Keyword arguments for create_async_engine.
+    """
+    parsed = make_url(url)
+    pool = {
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+    }
+    if parsed.get_backend_name() == "sqlite":
+        options: dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        # In-memory databases use a single static connection, not a pool.
+        if parsed.database not in (None, "", ":memory:"):
+            options.update(pool)
+        return options
+
+    options = {**pool, "pool_recycle": config.db_pool_recycle, "pool_pre_ping": config.db_pool_pre_ping}
+    if parsed.get_backend_name() == "postgresql" and config.db_statement_timeout_ms > 0:
+        timeout = str(config.db_statement_timeout_ms)
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def sqlite_pragmas(config: AppConfig = settings) -> dict[str, str | int]:
+    """Return the pragmas applied to every new SQLite connection.
+
+    Args:
+        config: Settings supplying the engine profile.
+
+    Returns:
+        Pragma names mapped to the values to set, in the order to set them.
+    """
+    return {
+        # Off by default in SQLite; needed for ON DELETE CASCADE.
+        "foreign_keys": "ON",
+        "journal_mode": config.sqlite_journal_mode,
+        "synchronous": config.sqlite_synchronous,
+        "mmap_size": config.sqlite_mmap_size,
+        "cache_size": config.sqlite_cache_size,
+        "busy_timeout": config.sqlite_busy_timeout_ms,
+    }
+
+
+def build_engine(url: str, config: AppConfig = settings) -> AsyncEngine:
+    """Create an async engine for the given database URL.
+
+    Args:
+        url: Database connection URL, sync or async form.
+        config: Settings supplying the engine profile.
+
+    Returns:
+        A configured AsyncEngine.
+    """
+    async_url = to_async_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, config))
+
+    if make_url(async_url).get_backend_name() == "sqlite":
+        pragmas = sqlite_pragmas(config)
+
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return async_engine
+
+
+class ReplicaRouter:
+    """Round-robin selection of healthy read replicas.
+
+    Each replica is probed with ``SELECT 1`` at most once per check
+    interval, lazily, when a request would be routed to it. Replicas that
+    fail the probe are skipped until their next check; if every replica
+    is down, reads go to the primary.
+
+    Args:
+        primary: Engine for the primary database.
+        replicas: Engines for the read replicas, possibly empty.
+        check_interval: Seconds between health checks of a replica.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: list[AsyncEngine], check_interval: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self._next = itertools.count()
+        self._health: dict[int, tuple[bool, float]] = {}
+
+    async def _is_healthy(self, index: int) -> bool:
+        healthy, checked_at = self._health.get(index, (True, -math.inf))
+        if time.monotonic() - checked_at < self.check_interval:
+            return healthy
+        try:
+            async with asyncio.timeout(REPLICA_CHECK_TIMEOUT):
+                async with self.replicas[index].connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            healthy = True
+        except Exception as exc:
+            if healthy:
+                logger.warning("Read replica failed health check",
+                               extra={"replica": index, "error": exc.__class__.__name__})
+            healthy = False
+        self._health[index] = (healthy, time.monotonic())
+        return healthy
+
+    async def pick(self) -> AsyncEngine:
+        """Choose the engine for the next read session.
+
+        Returns:
+            The next healthy replica in turn, or the primary if there is none.
+        """
+        for _ in range(len(self.replicas)):
+            index = next(self._next) % len(self.replicas)
+            if await self._is_healthy(index):
+                return self.replicas[index]
+        return self.primary
+
+    async def dispose(self) -> None:
+        """Close the connection pools of all replicas."""
+        for replica in self.replicas:
+            await replica.dispose()
+
 
 DATABASE_URL = settings.database_url
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = build_engine(DATABASE_URL)
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+replica_router = ReplicaRouter(
+    engine,
+    [build_engine(url) for url in settings.database_replica_urls],
+    settings.replica_health_check_seconds,
+)
 
 
-def init_db() -> None:
+async def init_db() -> None:
     """Initialize the database by creating all tables.
 
-    Creates all tables defined in SQLModel metadata if they don't exist.
-    Should be called once at application startup.
+    Creates all tables defined in SQLModel metadata if they don't exist,
+    and the event search index if the database predates it. Should be
+    called once at application startup.
     """
-    SQLModel.metadata.create_all(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(create_search_index)
 
 
-def get_db_conn() -> Generator[Session, None, None]:
+async def get_db_conn() -> AsyncGenerator[AsyncSession, None]:
     """Provide a database session for dependency injection.
 
-    This is a FastAPI dependency that yields a database session
+    This is a FastAPI dependency that yields an async database session
     and ensures it is properly closed after the request.
 
     Yields:
-        A SQLModel Session instance.
+        A SQLModel AsyncSession instance.
+    """
+    async with async_session() as session:
+        yield session
+
+
+def reads_pinned_to_primary(request: Request) -> bool:
+    """Tell whether a client wrote recently and must read from the primary.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        True if the request carries an unexpired read-your-writes cookie.
+    """
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db_conn(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Provide a database session for read-only handlers.
+
+    This is a FastAPI dependency like ``get_db_conn``, but the session
+    is bound to a read replica chosen by ``replica_router``. Clients that
+    wrote within the read-your-writes window are served by the primary.
+
+    Args:
+        request: The incoming request.
+
+    Yields:
+        A SQLModel AsyncSession instance.
     """
-    with Session(engine) as session:
+    if reads_pinned_to_primary(request):
+        bind = replica_router.primary
+    else:
+        bind = await replica_router.pick()
+    async with AsyncSession(bind, expire_on_commit=False) as session:
         yield session
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware that pins a client's reads to the primary after a write.
+
+    Successful requests with an unsafe method get a short-lived cookie;
+    ``get_read_db_conn`` routes requests carrying it to the primary.
+    Nothing is added when no replicas are configured.
+
+    Args:
+        app: The ASGI application to wrap.
+        window_seconds: How long reads stay on the primary after a write.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] in SAFE_METHODS
+                or self.window_seconds <= 0 or not replica_router.replicas):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
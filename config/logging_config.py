@@ -0,0 +1,146 @@
+"""Structured, non-blocking application logging.
+
+Application modules log through children of the ``main`` logger, for
+example ``logging.getLogger('main.security')``. Records are put on an
+in-memory queue by a QueueHandler and written to stderr as JSON lines by
+a QueueListener thread, so a request never waits on log I/O.
+
+Levels come from ``AppConfig.log_level``. Besides a plain level such as
+``info`` it accepts per-module overrides after the base level::
+
+    log_level="info,main.security=debug,main.routes=warning"
+
+High-volume debug lines can opt in to sampling by passing
+``extra={"sampled": True}``; only ``log_debug_sample_rate`` of them are
+kept. Never pass tokens, passwords or other secrets in messages or extras.
+"""
+
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+ROOT_LOGGER = "main"
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RECORD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime", "taskName"}
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+_module_loggers: list[str] = []
+
+
+def parse_log_level(spec: str) -> tuple[str, dict[str, str]]:
+    """Split a log level setting into a base level and per-module overrides.
+
+    Args:
+        spec: A level such as ``info``, optionally followed by
+            comma-separated ``logger=level`` pairs.
+
+    Returns:
+        The base level and a mapping of logger names to levels, all in
+        upper case.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown level.
+    """
+    base, *overrides = [part.strip() for part in spec.split(",") if part.strip()] or ["info"]
+    levels = {}
+    for entry in overrides:
+        name, sep, level = entry.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid log level override {entry!r}, expected logger=level")
+        levels[name.strip()] = level.strip().upper()
+    for level in [base.upper(), *levels.values()]:
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Unknown log level {level!r}")
+    return base.upper(), levels
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects.
+
+    The message, level, logger name and timestamp are always present;
+    values passed through ``extra`` are added as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in record.__dict__.items()
+                     if key not in _RECORD_ATTRS and key != "sampled")
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of debug records marked as sampled.
+
+    Args:
+        rate: Fraction of sampled records to keep, between 0 and 1.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not getattr(record, "sampled", False):
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+def configure_logging(level: str, sample_rate: float = 1.0) -> None:
+    """Route the ``main`` logger tree through a background queue listener.
+
+    Safe to call again; the previous configuration is shut down first.
+
+    Args:
+        level: The ``log_level`` setting, see ``parse_log_level``.
+        sample_rate: Fraction of sampled debug records to keep.
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+    base, overrides = parse_log_level(level)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.addFilter(SamplingFilter(sample_rate))
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(base)
+    root.addHandler(_queue_handler)
+    root.propagate = False
+    for name, module_level in overrides.items():
+        logging.getLogger(name).setLevel(module_level)
+        _module_loggers.append(name)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and detach the queue handler, if configured."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        root = logging.getLogger(ROOT_LOGGER)
+        root.removeHandler(_queue_handler)
+        root.propagate = True
+        root.setLevel(logging.NOTSET)
+        _queue_handler = None
+    for name in _module_loggers:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    _module_loggers.clear()
@@ -0,0 +1,9 @@
+import apiClient from './client';
+import { DashboardSummary } from '../types';
+
+export const dashboardApi = {
+  summary: async (): Promise<DashboardSummary> => {
+    const response = await apiClient.get<DashboardSummary>('/dashboard/summary');
+    return response.data;
+  },
+};
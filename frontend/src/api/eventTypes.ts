@@ -1,11 +1,9 @@
 import apiClient from './client';
 import { EventType, EventTypeInput } from '../types';
+import { fetchAllPages } from './pagination';
 
 export const eventTypesApi = {
-  list: async (): Promise<EventType[]> => {
-    const response = await apiClient.get<EventType[]>('/type/list');
-    return response.data;
-  },
+  list: async (): Promise<EventType[]> => fetchAllPages<EventType>('/type/list'),
 
   get: async (id: number): Promise<EventType> => {
     const response = await apiClient.get<EventType>(`/type/read/${id}`);
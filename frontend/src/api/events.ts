@@ -1,14 +1,17 @@
 import apiClient from './client';
-import { Event, EventInput } from '../types';
+import { Event, EventExpansion, EventInput, ExpandedEvent, Page } from '../types';
+import { fetchAllPages, fetchPage } from './pagination';
 
 export const eventsApi = {
-  list: async (): Promise<Event[]> => {
-    const response = await apiClient.get<Event[]>('/event/list');
-    return response.data;
-  },
+  list: async (): Promise<Event[]> => fetchAllPages<Event>('/event/list'),
+
+  listPage: async (after?: string | null, limit?: number): Promise<Page<Event>> =>
+    fetchPage<Event>('/event/list', after, limit),
 
-  get: async (id: number): Promise<Event> => {
-    const response = await apiClient.get<Event>(`/event/read/${id}`);
+  get: async (id: number, expand: EventExpansion[] = []): Promise<ExpandedEvent> => {
+    const response = await apiClient.get<ExpandedEvent>(`/event/read/${id}`, {
+      params: { expand: expand.length ? expand.join(',') : undefined },
+    });
     return response.data;
   },
 
@@ -26,8 +29,6 @@ export const eventsApi = {
     await apiClient.delete(`/event/delete/${id}`);
   },
 
-  listByDateRange: async (startDate: string, endDate: string): Promise<Event[]> => {
-    const response = await apiClient.get<Event[]>(`/event/list/${startDate}/${endDate}`);
-    return response.data;
-  },
+  listByDateRange: async (startDate: string, endDate: string): Promise<Event[]> =>
+    fetchAllPages<Event>(`/event/list/${startDate}/${endDate}`),
 };
@@ -1,4 +1,5 @@
 export { authApi } from './auth';
+export { dashboardApi } from './dashboard';
 export { eventsApi } from './events';
 export { eventTypesApi } from './eventTypes';
 export { participantsApi } from './participants';
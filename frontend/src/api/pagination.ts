@@ -0,0 +1,20 @@
+import apiClient from './client';
+import { Page } from '../types';
+
+export const fetchPage = async <T>(path: string, after?: string | null, limit?: number): Promise<Page<T>> => {
+  const response = await apiClient.get<Page<T>>(path, {
+    params: { after: after ?? undefined, limit },
+  });
+  return response.data;
+};
+
+export const fetchAllPages = async <T>(path: string): Promise<T[]> => {
+  const items: T[] = [];
+  let after: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage<T>(path, after);
+    items.push(...page.items);
+    after = page.next_cursor;
+  } while (after);
+  return items;
+};
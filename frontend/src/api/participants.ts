@@ -1,11 +1,12 @@
 import apiClient from './client';
-import { Participant, ParticipantInput } from '../types';
+import { Page, Participant, ParticipantInput, ParticipantRegistration } from '../types';
+import { fetchAllPages, fetchPage } from './pagination';
 
 export const participantsApi = {
-  list: async (): Promise<Participant[]> => {
-    const response = await apiClient.get<Participant[]>('/participant/list');
-    return response.data;
-  },
+  list: async (): Promise<Participant[]> => fetchAllPages<Participant>('/participant/list'),
+
+  listPage: async (after?: string | null, limit?: number): Promise<Page<Participant>> =>
+    fetchPage<Participant>('/participant/list', after, limit),
 
   get: async (id: number): Promise<Participant> => {
     const response = await apiClient.get<Participant>(`/participant/read/${id}`);
@@ -26,8 +27,14 @@ export const participantsApi = {
     await apiClient.delete(`/participant/delete/${id}`);
   },
 
-  addToEvent: async (eventId: number, participant: ParticipantInput): Promise<Event> => {
-    const response = await apiClient.post<Event>(`/event/participant/add/${eventId}`, participant);
+  addToEvent: async (
+    eventId: number,
+    participant: ParticipantInput,
+    includeCount = false,
+  ): Promise<ParticipantRegistration> => {
+    const response = await apiClient.post<ParticipantRegistration>(`/event/participant/add/${eventId}`, participant, {
+      params: { include_count: includeCount || undefined },
+    });
     return response.data;
   },
 };
@@ -1,11 +1,9 @@
 import apiClient from './client';
 import { User, UserInput } from '../types';
+import { fetchAllPages } from './pagination';
 
 export const usersApi = {
-  list: async (): Promise<User[]> => {
-    const response = await apiClient.get<User[]>('/user/list');
-    return response.data;
-  },
+  list: async (): Promise<User[]> => fetchAllPages<User>('/user/list'),
 
   get: async (id: number): Promise<User> => {
     const response = await apiClient.get<User>(`/user/read/${id}`);
@@ -1,41 +1,29 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { Calendar, Users, Tags, ArrowRight } from 'lucide-react';
-import { Card, CardContent, CardHeader } from '../components';
-import { eventsApi, eventTypesApi, participantsApi } from '../api';
-import { Event } from '../types';
-import { format } from 'date-fns';
+import {
+  Card,
+  CardContent,
+  CardHeader,
+  Table,
+  TableHeader,
+  TableBody,
+  TableRow,
+  TableHead,
+  TableCell,
+} from '../components';
+import { dashboardApi } from '../api';
+import { DashboardSummary } from '../types';
+import { format, parseISO } from 'date-fns';
 
 export function Dashboard() {
-  const [stats, setStats] = useState({
-    events: 0,
-    eventTypes: 0,
-    participants: 0,
-  });
-  const [upcomingEvents, setUpcomingEvents] = useState<Event[]>([]);
+  const [summary, setSummary] = useState<DashboardSummary | null>(null);
   const [isLoading, setIsLoading] = useState(true);
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [events, eventTypes, participants] = await Promise.all([
-          eventsApi.list(),
-          eventTypesApi.list(),
-          participantsApi.list(),
-        ]);
-
-        setStats({
-          events: events.length,
-          eventTypes: eventTypes.length,
-          participants: participants.length,
-        });
-
-        const sortedEvents = events
-          .filter((e) => new Date(e.event_date) >= new Date())
-          .sort((a, b) => new Date(a.event_date).getTime() - new Date(b.event_date).getTime())
-          .slice(0, 5);
-
-        setUpcomingEvents(sortedEvents);
+        setSummary(await dashboardApi.summary());
       } catch (error) {
         console.error('Failed to fetch dashboard data:', error);
       } finally {
@@ -54,6 +42,11 @@ export function Dashboard() {
     );
   }
 
+  const totals = summary?.totals ?? { events: 0, event_types: 0, participants: 0 };
+  const upcomingEvents = summary?.upcoming_events ?? [];
+  const recentRegistrations = summary?.recent_registrations ?? [];
+  const eventTypes = summary?.event_types ?? [];
+
   return (
     <div className="space-y-6">
       <h1 className="text-2xl font-bold text-gray-900">Dashboard</h1>
@@ -65,7 +58,7 @@ export function Dashboard() {
               <Calendar className="h-6 w-6 text-blue-600" />
             </div>
             <div>
-              <p className="text-2xl font-bold text-gray-900">{stats.events}</p>
+              <p className="text-2xl font-bold text-gray-900">{totals.events}</p>
               <p className="text-sm text-gray-600">Total Events</p>
             </div>
           </CardContent>
@@ -77,7 +70,7 @@ export function Dashboard() {
               <Tags className="h-6 w-6 text-green-600" />
             </div>
             <div>
-              <p className="text-2xl font-bold text-gray-900">{stats.eventTypes}</p>
+              <p className="text-2xl font-bold text-gray-900">{totals.event_types}</p>
               <p className="text-sm text-gray-600">Event Types</p>
             </div>
           </CardContent>
@@ -89,7 +82,7 @@ export function Dashboard() {
               <Users className="h-6 w-6 text-purple-600" />
             </div>
             <div>
-              <p className="text-2xl font-bold text-gray-900">{stats.participants}</p>
+              <p className="text-2xl font-bold text-gray-900">{totals.participants}</p>
               <p className="text-sm text-gray-600">Participants</p>
             </div>
           </CardContent>
@@ -121,10 +114,12 @@ export function Dashboard() {
                 >
                   <div>
                     <p className="font-medium text-gray-900">{event.name}</p>
-                    <p className="text-sm text-gray-500">{event.location}</p>
+                    <p className="text-sm text-gray-500">
+                      {event.location} &middot; {event.participants} registered
+                    </p>
                   </div>
                   <p className="text-sm text-gray-600">
-                    {format(new Date(event.event_date), 'MMM d, yyyy')}
+                    {format(parseISO(event.event_date), 'MMM d, yyyy')}
                   </p>
                 </Link>
               ))}
@@ -132,6 +127,77 @@ export function Dashboard() {
           )}
         </CardContent>
       </Card>
+
+      <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
+        <Card>
+          <CardHeader>
+            <div className="flex items-center justify-between">
+              <h2 className="text-lg font-semibold text-gray-900">Recent Registrations</h2>
+              <Link
+                to="/participants"
+                className="text-sm text-blue-600 hover:underline flex items-center gap-1"
+              >
+                View all <ArrowRight className="h-4 w-4" />
+              </Link>
+            </div>
+          </CardHeader>
+          <CardContent>
+            {recentRegistrations.length === 0 ? (
+              <p className="text-gray-500 text-center py-4">No registrations yet</p>
+            ) : (
+              <div className="space-y-3">
+                {recentRegistrations.map((registration) => (
+                  <Link
+                    key={registration.id}
+                    to={`/events/${registration.event_id}`}
+                    className="flex items-center justify-between p-3 rounded-lg hover:bg-gray-50 transition-colors"
+                  >
+                    <div>
+                      <p className="font-medium text-gray-900">
+                        {registration.first_name} {registration.last_name}
+                      </p>
+                      <p className="text-sm text-gray-500">{registration.event_name}</p>
+                    </div>
+                    <p className="text-sm text-gray-600">
+                      {format(parseISO(registration.created_at), 'MMM d, yyyy')}
+                    </p>
+                  </Link>
+                ))}
+              </div>
+            )}
+          </CardContent>
+        </Card>
+
+        <Card>
+          <CardHeader>
+            <h2 className="text-lg font-semibold text-gray-900">By Event Type</h2>
+          </CardHeader>
+          <CardContent>
+            {eventTypes.length === 0 ? (
+              <p className="text-gray-500 text-center py-4">No event types</p>
+            ) : (
+              <Table>
+                <TableHeader>
+                  <TableRow>
+                    <TableHead>Type</TableHead>
+                    <TableHead>Events</TableHead>
+                    <TableHead>Participants</TableHead>
+                  </TableRow>
+                </TableHeader>
+                <TableBody>
+                  {eventTypes.map((eventType) => (
+                    <TableRow key={eventType.id}>
+                      <TableCell className="font-medium">{eventType.name}</TableCell>
+                      <TableCell>{eventType.events}</TableCell>
+                      <TableCell>{eventType.participants}</TableCell>
+                    </TableRow>
+                  ))}
+                </TableBody>
+              </Table>
+            )}
+          </CardContent>
+        </Card>
+      </div>
     </div>
   );
 }
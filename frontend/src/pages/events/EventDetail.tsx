@@ -2,7 +2,7 @@ import { useEffect, useState } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import { ArrowLeft, Pencil, Trash2, MapPin, Calendar, Tag } from 'lucide-react';
 import { format } from 'date-fns';
-import { eventsApi, eventTypesApi } from '../../api';
+import { eventsApi } from '../../api';
 import { Event, EventType } from '../../types';
 import { Button, Card, CardHeader, CardContent, Modal } from '../../components';
 
@@ -18,13 +18,9 @@ export function EventDetail() {
     const fetchEvent = async () => {
       if (!id) return;
       try {
-        const eventData = await eventsApi.get(Number(id));
+        const eventData = await eventsApi.get(Number(id), ['event_type']);
         setEvent(eventData);
-
-        if (eventData.event_type_id) {
-          const typeData = await eventTypesApi.get(eventData.event_type_id);
-          setEventType(typeData);
-        }
+        setEventType(eventData.event_type ?? null);
       } catch (error) {
         console.error('Failed to fetch event:', error);
       } finally {
@@ -35,6 +35,14 @@ export interface Event {
   event_type_id: number | null;
 }
 
+export type EventExpansion = 'event_type' | 'participants' | 'participant_count';
+
+export interface ExpandedEvent extends Event {
+  event_type?: EventType | null;
+  participants?: Participant[];
+  participant_count?: number;
+}
+
 export interface EventInput {
   name: string;
   event_date: string;
@@ -56,6 +64,10 @@ export interface Participant {
   event_id: number | null;
 }
 
+export interface ParticipantRegistration extends Participant {
+  event_participants: number | null;
+}
+
 export interface ParticipantInput {
   first_name: string;
   last_name: string;
@@ -68,6 +80,50 @@ export interface ParticipantInput {
   event_id?: number | null;
 }
 
+export interface DashboardTotals {
+  events: number;
+  event_types: number;
+  participants: number;
+}
+
+export interface UpcomingEvent {
+  id: number;
+  name: string;
+  event_date: string;
+  location: string | null;
+  event_type_id: number | null;
+  participants: number;
+}
+
+export interface RecentRegistration {
+  id: number;
+  first_name: string;
+  last_name: string;
+  event_id: number;
+  event_name: string;
+  created_at: string;
+}
+
+export interface EventTypeSummary {
+  id: number;
+  name: string;
+  events: number;
+  participants: number;
+}
+
+export interface DashboardSummary {
+  generated_at: string;
+  totals: DashboardTotals;
+  upcoming_events: UpcomingEvent[];
+  recent_registrations: RecentRegistration[];
+  event_types: EventTypeSummary[];
+}
+
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
 export interface Token {
   access_token: string;
   token_type: string;
@@ -0,0 +1,347 @@
+"""Offline detection of duplicate participant records.
+
+The same person often registers for many events with slight variations
+in name, email and phone. This job finds those records in three steps:
+
+1. Blocking. Only records sharing a normalized email, a normalized
+   phone number, or a zip code plus last-name Soundex are compared, so
+   the work grows with the number of likely pairs rather than with the
+   square of the table. Blocks larger than ``MAX_BLOCK_SIZE`` are shared
+   placeholder values, such as a front-desk phone number, and are skipped.
+2. Scoring. All candidate pairs are scored at once with
+   ``rapidfuzz.process.cpdist`` on the names and emails, in native code
+   across all cores, and combined with phone equality in NumPy.
+3. Clustering. Pairs scoring at least the threshold are merged with
+   union-find, so A~B and B~C put A, B and C in one cluster.
+
+The result is a report of clusters for a person to review; nothing is
+merged or deleted.
+
+Usage:
+    python -m jobs.duplicates --output duplicates.ndjson
+    python -m jobs.duplicates --database-url sqlite:///./database.db --format csv --output duplicates.csv
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import re
+import time
+from collections import defaultdict
+from typing import Iterable
+
+import numpy as np
+import orjson
+from rapidfuzz import fuzz, utils
+from rapidfuzz.process import cpdist
+from sqlalchemy import Engine, create_engine, select
+
+from config.app_config import settings
+from config.logging_config import configure_logging, shutdown_logging
+from models import Participant
+from schemas.duplicates import DuplicateCluster, DuplicateMember, DuplicatePair
+
+logger = logging.getLogger('main.jobs.duplicates')
+
+DEFAULT_THRESHOLD = 85.0
+MAX_BLOCK_SIZE = 50
+# Share of the pair score given to the name; the rest is the contact
+# score, which is 100 for the same phone number or else email similarity.
+NAME_WEIGHT = 0.6
+FETCH_SIZE = 50_000
+# Stay below SQLite's limit on bound parameters per statement.
+ID_CHUNK_SIZE = 900
+
+_NON_DIGIT = re.compile(r"\D")
+
+
+def normalize_email(value: str | None) -> str:
+    """Normalize an email address for comparison.
+
+    Args:
+        value: The address as stored.
+
+    Returns:
+        The lowercased address without dots or a ``+tag`` in the local
+        part, or an empty string if it is not an address.
+    """
+    local, _, domain = (value or "").strip().lower().partition("@")
+    local = local.split("+", 1)[0].replace(".", "")
+    return f"{local}@{domain}" if local and domain else ""
+
+
+def normalize_phone(value: str | None) -> str:
+    """Normalize a phone number for comparison.
+
+    Args:
+        value: The number as stored, in any format.
+
+    Returns:
+        The digits without a leading US country code, or an empty
+        string if fewer than seven digits remain.
+    """
+    digits = _NON_DIGIT.sub("", value or "")
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) >= 7 else ""
+
+
+def normalize_zip(value: str | None) -> str:
+    """Normalize a postal code to its five-digit ZIP.
+
+    Args:
+        value: The code as stored, e.g. ``62704`` or ``62704-1234``.
+
+    Returns:
+        The first five digits, or an empty string if there are fewer.
+    """
+    digits = _NON_DIGIT.sub("", value or "")[:5]
+    return digits if len(digits) == 5 else ""
+
+
+class ParticipantColumns:
+    """Participant fields needed for matching, stored column-wise.
+
+    Attributes:
+        ids: Participant ids, in load order.
+        names: ``first last`` name strings.
+        emails: Normalized emails.
+        phones: Normalized phone numbers.
+        zip_names: Normalized zip joined with the last-name Soundex.
+    """
+
+    def __init__(self):
+        self.ids: list[int] = []
+        self.names: list[str] = []
+        self.emails: list[str] = []
+        self.phones: list[str] = []
+        self.zip_names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def load_participants(engine: Engine) -> ParticipantColumns:
+    """Stream every participant and normalize its matching fields.
+
+    Args:
+        engine: Synchronous engine for the database to scan.
+
+    Returns:
+        The normalized columns.
+    """
+    columns = ParticipantColumns()
+    statement = select(Participant.id, Participant.first_name, Participant.last_name, Participant.email,
+                       Participant.phone, Participant.zip_code, Participant.last_name_key).order_by(Participant.id)
+    with engine.connect() as conn:
+        for row in conn.execution_options(yield_per=FETCH_SIZE).execute(statement):
+            columns.ids.append(row.id)
+            columns.names.append(f"{row.first_name} {row.last_name}")
+            columns.emails.append(normalize_email(row.email))
+            columns.phones.append(normalize_phone(row.phone))
+            zip_code = normalize_zip(row.zip_code)
+            columns.zip_names.append(f"{zip_code}:{row.last_name_key}" if zip_code and row.last_name_key else "")
+    return columns
+
+
+def candidate_pairs(blocking_keys: Iterable[list[str]], max_block_size: int = MAX_BLOCK_SIZE) -> np.ndarray:
+    """Pair up records that share any blocking key.
+
+    Args:
+        blocking_keys: One key list per blocking rule, aligned with the
+            records; empty keys never match.
+        max_block_size: Blocks with more records than this are skipped.
+
+    Returns:
+        An ``(n, 2)`` array of distinct record index pairs, lower index first.
+    """
+    codes: list[int] = []
+    size = 0
+    skipped = 0
+    for keys in blocking_keys:
+        size = len(keys)
+        blocks: dict[str, list[int]] = defaultdict(list)
+        for index, key in enumerate(keys):
+            if key:
+                blocks[key].append(index)
+        for members in blocks.values():
+            if len(members) > max_block_size:
+                skipped += 1
+            elif len(members) > 1:
+                codes.extend(left * size + right for left, right in itertools.combinations(members, 2))
+    if skipped:
+        logger.info("Skipped oversized blocks", extra={"blocks": skipped, "max_block_size": max_block_size})
+    unique = np.unique(np.array(codes, dtype=np.int64))
+    return np.column_stack((unique // max(size, 1), unique % max(size, 1)))
+
+
+def score_pairs(columns: ParticipantColumns, pairs: np.ndarray) -> np.ndarray:
+    """Score candidate pairs from 0 to 100.
+
+    Args:
+        columns: The normalized records.
+        pairs: Record index pairs from ``candidate_pairs``.
+
+    Returns:
+        One score per pair.
+    """
+    if not len(pairs):
+        return np.empty(0, dtype=np.float64)
+    left, right = pairs[:, 0], pairs[:, 1]
+    names = cpdist([columns.names[i] for i in left], [columns.names[i] for i in right],
+                   scorer=fuzz.token_sort_ratio, processor=utils.default_process, workers=-1)
+    left_emails = [columns.emails[i] for i in left]
+    right_emails = [columns.emails[i] for i in right]
+    emails = cpdist(left_emails, right_emails, scorer=fuzz.ratio, workers=-1)
+    has_email = np.array([bool(a and b) for a, b in zip(left_emails, right_emails)])
+    phones = np.array(columns.phones, dtype=object)
+    same_phone = (phones[left] == phones[right]) & (phones[left] != "")
+    contact = np.where(same_phone, 100.0, np.where(has_email, emails, 0.0))
+    return NAME_WEIGHT * names + (1 - NAME_WEIGHT) * contact
+
+
+class UnionFind:
+    """Disjoint sets over record indexes, with path halving and union by size.
+
+    Args:
+        size: Number of records.
+    """
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left, right = self.find(left), self.find(right)
+        if left == right:
+            return
+        if self.size[left] < self.size[right]:
+            left, right = right, left
+        self.parent[right] = left
+        self.size[left] += self.size[right]
+
+
+def _fetch_members(engine: Engine, ids: list[int]) -> dict[int, DuplicateMember]:
+    members = {}
+    statement = select(Participant.id, Participant.event_id, Participant.first_name, Participant.last_name,
+                       Participant.email, Participant.phone, Participant.zip_code)
+    with engine.connect() as conn:
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            for row in conn.execute(statement.where(Participant.id.in_(chunk))):
+                members[row.id] = DuplicateMember(**row._mapping)
+    return members
+
+
+def find_duplicates(engine: Engine, threshold: float = DEFAULT_THRESHOLD,
+                    max_block_size: int = MAX_BLOCK_SIZE) -> tuple[list[DuplicateCluster], dict]:
+    """Run blocking, scoring and clustering over all participants.
+
+    Args:
+        engine: Synchronous engine for the database to scan.
+        threshold: Minimum pair score for two records to be linked.
+        max_block_size: Blocks with more records than this are skipped.
+
+    Returns:
+        The clusters, largest first, and counters and timings for the run.
+    """
+    stats: dict = {}
+    started = time.perf_counter()
+    columns = load_participants(engine)
+    stats["participants"] = len(columns)
+    stats["load_seconds"] = round(time.perf_counter() - started, 2)
+
+    step = time.perf_counter()
+    pairs = candidate_pairs([columns.emails, columns.phones, columns.zip_names], max_block_size)
+    stats["candidate_pairs"] = len(pairs)
+    stats["blocking_seconds"] = round(time.perf_counter() - step, 2)
+
+    step = time.perf_counter()
+    scores = score_pairs(columns, pairs)
+    matched = scores >= threshold
+    stats["matched_pairs"] = int(matched.sum())
+    stats["scoring_seconds"] = round(time.perf_counter() - step, 2)
+
+    step = time.perf_counter()
+    links = defaultdict(list)
+    union_find = UnionFind(len(columns))
+    for (left, right), score in zip(pairs[matched].tolist(), scores[matched].tolist()):
+        union_find.union(left, right)
+        links[left].append(DuplicatePair(left=columns.ids[left], right=columns.ids[right], score=round(score, 1)))
+    groups = defaultdict(set)
+    for left, right in pairs[matched].tolist():
+        root = union_find.find(left)
+        groups[root].update((left, right))
+
+    groups = sorted((sorted(group) for group in groups.values()), key=lambda group: (-len(group), group[0]))
+    members = _fetch_members(engine, [columns.ids[index] for group in groups for index in group])
+    clusters = []
+    for number, group in enumerate(groups, start=1):
+        cluster_pairs = [pair for index in group for pair in links[index]]
+        clusters.append(DuplicateCluster(
+            cluster=number,
+            size=len(group),
+            min_score=min(pair.score for pair in cluster_pairs),
+            members=[members[columns.ids[index]] for index in group],
+            pairs=cluster_pairs,
+        ))
+    stats["clusters"] = len(clusters)
+    stats["clustering_seconds"] = round(time.perf_counter() - step, 2)
+    stats["total_seconds"] = round(time.perf_counter() - started, 2)
+    return clusters, stats
+
+
+def write_report(clusters: list[DuplicateCluster], path: str, report_format: str) -> None:
+    """Write the clusters for review.
+
+    Args:
+        clusters: Clusters from ``find_duplicates``.
+        path: Output file path.
+        report_format: ``ndjson`` for one cluster per line with its
+            scored links, or ``csv`` for one member per row.
+    """
+    if report_format == "ndjson":
+        with open(path, "wb") as output:
+            for cluster in clusters:
+                output.write(orjson.dumps(cluster.model_dump()) + b"\n")
+        return
+
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        writer = csv.writer(output)
+        writer.writerow(["cluster", "size", "min_score", *DuplicateMember.model_fields])
+        for cluster in clusters:
+            for member in cluster.members:
+                writer.writerow([cluster.cluster, cluster.size, cluster.min_score, *member.model_dump().values()])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.database_url, help="Synchronous database URL")
+    parser.add_argument("--output", default="duplicates.ndjson")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--max-block-size", type=int, default=MAX_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    configure_logging(settings.log_level, settings.log_debug_sample_rate)
+    engine = create_engine(args.database_url)
+    try:
+        clusters, stats = find_duplicates(engine, args.threshold, args.max_block_size)
+        write_report(clusters, args.output, args.format)
+        logger.info("Duplicate report written", extra={"path": args.output, **stats})
+    finally:
+        engine.dispose()
+        shutdown_logging()
+    print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Rebuild and verify the participation rollup tables.
+
+The rollups in ``Event_Rollup`` and ``Participant_Rollup`` are kept
+current by ``utils.rollups`` as events and participants are written.
+This job recomputes them from the events and participants with one
+grouped query per table and compares the result with the stored
+counters. Without ``--check`` it then replaces the stored counters
+with the recomputed ones, in a single transaction.
+
+Run it after loading data with statements that bypass the application,
+such as a restore or a bulk seed, and from time to time with ``--check``
+to confirm the counters have not drifted.
+
+Usage:
+    python -m jobs.rollups
+    python -m jobs.rollups --database-url sqlite:///./database.db --check
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import orjson
+from sqlalchemy import Connection, Engine, create_engine, delete, func, insert, select
+
+from config.app_config import settings
+from config.logging_config import configure_logging, shutdown_logging
+from models import Event, EventRollup, Participant, ParticipantRollup
+from utils.rollups import UNKNOWN_STATE, month_of
+
+logger = logging.getLogger('main.jobs.rollups')
+
+# Mismatched groups listed in the stats; the count covers all of them.
+MAX_REPORTED_MISMATCHES = 20
+
+
+def compute_rollups(conn: Connection) -> tuple[dict[tuple, int], dict[tuple, int]]:
+    """Count events and participants per group from the source tables.
+
+    Args:
+        conn: Connection to read from.
+
+    Returns:
+        Event counts keyed by ``(event_type_id, month)`` and participant
+        counts keyed by ``(event_type_id, month, state)``.
+    """
+    month = month_of(Event.event_date, conn.dialect.name)
+    state = func.coalesce(Participant.state, UNKNOWN_STATE)
+    events = conn.execute(select(Event.event_type_id, month, func.count()).group_by(Event.event_type_id, month))
+    participants = conn.execute(
+        select(Event.event_type_id, month, state, func.count())
+        .join(Participant, Participant.event_id == Event.id)
+        .group_by(Event.event_type_id, month, state))
+    return ({tuple(row[:-1]): row[-1] for row in events},
+            {tuple(row[:-1]): row[-1] for row in participants})
+
+
+def stored_rollups(conn: Connection) -> tuple[dict[tuple, int], dict[tuple, int]]:
+    """Read the stored counters, ignoring groups that dropped to zero.
+
+    Args:
+        conn: Connection to read from.
+
+    Returns:
+        The counters in the same shape as ``compute_rollups``.
+    """
+    events = conn.execute(select(EventRollup.event_type_id, EventRollup.month, EventRollup.events)
+                          .where(EventRollup.events != 0))
+    participants = conn.execute(
+        select(ParticipantRollup.event_type_id, ParticipantRollup.month, ParticipantRollup.state,
+               ParticipantRollup.participants)
+        .where(ParticipantRollup.participants != 0))
+    return ({tuple(row[:-1]): row[-1] for row in events},
+            {tuple(row[:-1]): row[-1] for row in participants})
+
+
+def _mismatches(table: str, expected: dict[tuple, int], stored: dict[tuple, int]) -> list[dict]:
+    return [{"table": table, "group": list(key), "stored": stored.get(key, 0), "expected": expected.get(key, 0)}
+            for key in sorted(expected.keys() | stored.keys(), key=repr)
+            if stored.get(key, 0) != expected.get(key, 0)]
+
+
+def rebuild_rollups(engine: Engine, check: bool = False) -> dict:
+    """Recompute the rollups and replace the stored counters.
+
+    Reading and writing happen in one transaction, so writes committed
+    meanwhile are either fully counted or not at all.
+
+    Args:
+        engine: Synchronous engine for the application database.
+        check: Only compare; leave the stored counters untouched.
+
+    Returns:
+        Group and mismatch counts, the first mismatches, and timings.
+    """
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        expected_events, expected_participants = compute_rollups(conn)
+        stored_events, stored_participants = stored_rollups(conn)
+        mismatches = (_mismatches(EventRollup.__tablename__, expected_events, stored_events)
+                      + _mismatches(ParticipantRollup.__tablename__, expected_participants, stored_participants))
+        if not check:
+            conn.execute(delete(EventRollup))
+            conn.execute(delete(ParticipantRollup))
+            if expected_events:
+                conn.execute(insert(EventRollup), [
+                    {"event_type_id": event_type_id, "month": month, "events": count}
+                    for (event_type_id, month), count in expected_events.items()])
+            if expected_participants:
+                conn.execute(insert(ParticipantRollup), [
+                    {"event_type_id": event_type_id, "month": month, "state": state, "participants": count}
+                    for (event_type_id, month, state), count in expected_participants.items()])
+    return {
+        "event_groups": len(expected_events),
+        "participant_groups": len(expected_participants),
+        "mismatched_groups": len(mismatches),
+        "mismatches": mismatches[:MAX_REPORTED_MISMATCHES],
+        "rebuilt": not check,
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.database_url, help="Synchronous database URL")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report mismatches; exit with status 1 if there are any")
+    args = parser.parse_args()
+
+    configure_logging(settings.log_level, settings.log_debug_sample_rate)
+    engine = create_engine(args.database_url)
+    try:
+        stats = rebuild_rollups(engine, args.check)
+        logger.info("Rollups checked" if args.check else "Rollups rebuilt",
+                    extra={key: value for key, value in stats.items() if key != "mismatches"})
+    finally:
+        engine.dispose()
+        shutdown_logging()
+    print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode())
+    if args.check and stats["mismatched_groups"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""Fill the database with realistic synthetic data at volume.
+
+Generates event types, events, participants and users from a random
+seed, so the same arguments always produce the same rows, and appends
+them after any existing data. The shape of the data is configurable:
+
+- ``--skew`` spreads participants over events by a Zipf-like law. At 0
+  every event is equally likely; around 1 a few events draw large
+  crowds while most stay small, as in production.
+- ``--start-year`` and ``--years`` spread event dates over several
+  years. Participants register in the weeks before their event.
+
+Rows are inserted with executemany in large batches, each committed on
+its own. The participant indexes are dropped while more participants
+are loaded than the table already holds, then rebuilt in one pass,
+which is much faster than maintaining them row by row; they are rebuilt
+even if the load fails. Rows get explicit ids, so on PostgreSQL the id
+sequences are moved past them afterwards. On SQLite the
+load runs with ``synchronous=OFF``, so a power loss or operating
+system crash during it can corrupt the file; seed a copy of any
+database worth keeping. The rollup tables are rebuilt and
+every table's ETag version bumped at the end.
+
+All seeded users share the password given with ``--user-password``,
+hashed once.
+
+Usage:
+    python -m jobs.seed --participants 1000000
+    python -m jobs.seed --database-url sqlite:///./big.db --events 100000 --participants 5000000 --skew 1.1
+"""
+
+import argparse
+import itertools
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, NamedTuple
+
+import orjson
+from sqlalchemy import Connection, Engine, Select, Table, create_engine, func, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlmodel import SQLModel
+
+from config.app_config import settings
+from config.logging_config import configure_logging, shutdown_logging
+from jobs.rollups import rebuild_rollups
+from models import Event, EventType, Participant, User
+from utils.blocking import email_key, soundex
+from utils.etag import version_bump_statement
+from utils.search import create_search_index
+
+logger = logging.getLogger('main.jobs.seed')
+
+BATCH_SIZE = 50_000
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Lisa", "Daniel", "Nancy", "Matthew", "Betty", "Anthony", "Sandra", "Mark", "Margaret",
+    "Donald", "Ashley", "Steven", "Kimberly", "Andrew", "Emily", "Paul", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Melissa", "George", "Deborah", "Timothy", "Stephanie",
+    "Luis", "Maria", "Carlos", "Ana", "Wei", "Mei", "Hiroshi", "Yuki", "Ahmed", "Fatima",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "Kowalski", "Novak", "Schmidt", "Muller", "Rossi", "Tanaka", "Kim", "Patel", "Singh", "Chen",
+]
+# City, state, and the first three digits of its zip codes.
+PLACES = [
+    ("Springfield", "IL", "627"), ("Chicago", "IL", "606"), ("Peoria", "IL", "616"), ("Madison", "WI", "537"),
+    ("Milwaukee", "WI", "532"), ("Columbus", "OH", "432"), ("Cleveland", "OH", "441"), ("Detroit", "MI", "482"),
+    ("Indianapolis", "IN", "462"), ("St. Louis", "MO", "631"), ("Minneapolis", "MN", "554"),
+    ("Des Moines", "IA", "503"), ("Austin", "TX", "787"), ("Houston", "TX", "770"), ("Denver", "CO", "802"),
+    ("Phoenix", "AZ", "850"), ("Seattle", "WA", "981"), ("Portland", "OR", "972"), ("Sacramento", "CA", "958"),
+    ("San Diego", "CA", "921"), ("Atlanta", "GA", "303"), ("Miami", "FL", "331"), ("Boston", "MA", "021"),
+    ("Brooklyn", "NY", "112"), ("Philadelphia", "PA", "191"),
+]
+STREETS = ["Main", "Oak", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Park", "Pine", "Walnut", "River"]
+STREET_SUFFIXES = ["St", "Ave", "Rd", "Blvd", "Ln", "Dr", "Ct"]
+DOMAINS = ["example.com", "example.org", "example.net", "mail.example.com"]
+EVENT_TYPE_NAMES = [
+    "Workshop", "Conference", "Meetup", "Webinar", "Health Fair", "Food Drive", "Job Fair", "Town Hall",
+    "Fundraiser", "Training", "Open House", "Volunteer Day", "Class", "Seminar", "Clinic", "Festival",
+]
+VENUES = ["Community Center", "Public Library", "High School Gym", "City Hall", "Convention Center", "Main Hall",
+          "Recreation Center", "Church Hall", "Union Hall", "Park Pavilion"]
+# Share of participants who leave a field empty.
+MISSING_PHONE = 0.1
+MISSING_STATE = 0.02
+ADMIN_SHARE = 0.01
+
+
+class SeedPlan(NamedTuple):
+    """How much data to generate and how to shape it.
+
+    Attributes:
+        event_types: Number of event types.
+        events: Number of events.
+        participants: Number of participants, spread over the events.
+        users: Number of users.
+        skew: Zipf exponent of participants per event; 0 is uniform.
+        start_year: Year of the earliest event date.
+        years: Number of years the event dates span.
+        seed: Random seed; equal plans generate equal rows.
+    """
+
+    event_types: int = 8
+    events: int = 1_000
+    participants: int = 100_000
+    users: int = 100
+    skew: float = 1.0
+    start_year: int = 2020
+    years: int = 5
+    seed: int = 42
+
+
+def _next_id(conn: Connection, table: Table) -> int:
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def _moment(rng: random.Random, day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(86400))
+
+
+def event_type_rows(rng: random.Random, plan: SeedPlan, first_id: int) -> list[dict]:
+    """Generate the event types.
+
+    Args:
+        rng: Random generator of the plan.
+        plan: What to generate.
+        first_id: Id of the first event type.
+
+    Returns:
+        The event type rows.
+    """
+    created = _moment(rng, date(plan.start_year, 1, 1) - timedelta(days=30))
+    return [{"id": first_id + n, "created_at": created,
+             "name": EVENT_TYPE_NAMES[n % len(EVENT_TYPE_NAMES)]
+             + (f" {n // len(EVENT_TYPE_NAMES) + 1}" if n >= len(EVENT_TYPE_NAMES) else ""),
+             "description": f"Synthetic {EVENT_TYPE_NAMES[n % len(EVENT_TYPE_NAMES)].lower()} events"}
+            for n in range(plan.event_types)]
+
+
+def event_rows(rng: random.Random, plan: SeedPlan, first_id: int, type_ids: list[int]) -> Iterator[dict]:
+    """Generate the events, dated uniformly over the plan's years.
+
+    Args:
+        rng: Random generator of the plan.
+        plan: What to generate.
+        first_id: Id of the first event.
+        type_ids: Ids of the event types to choose from.
+
+    Yields:
+        One row per event.
+    """
+    start = date(plan.start_year, 1, 1)
+    days = (date(plan.start_year + plan.years, 1, 1) - start).days
+    for n in range(plan.events):
+        event_date = start + timedelta(days=rng.randrange(days))
+        city, state, _ = rng.choice(PLACES)
+        type_id = rng.choice(type_ids)
+        type_name = EVENT_TYPE_NAMES[(type_id - type_ids[0]) % len(EVENT_TYPE_NAMES)]
+        yield {
+            "id": first_id + n,
+            "name": f"{city} {type_name} #{first_id + n}"[:50],
+            "event_date": event_date,
+            "description": f"{type_name} for residents of {city}, {state}",
+            "location": f"{rng.choice(VENUES)}, {city}, {state}",
+            "event_type_id": type_id,
+            "created_at": _moment(rng, event_date - timedelta(days=rng.randrange(30, 365))),
+        }
+
+
+def participant_rows(rng: random.Random, plan: SeedPlan, first_id: int,
+                     events: list[tuple[int, date]]) -> Iterator[dict]:
+    """Generate the participants, spread over events by the plan's skew.
+
+    Events are ranked in a random order and drawn with weight
+    ``1 / rank ** skew``, so popular events are not just the first ones.
+
+    Args:
+        rng: Random generator of the plan.
+        plan: What to generate.
+        first_id: Id of the first participant.
+        events: Id and date of each event to register participants for.
+
+    Yields:
+        One row per participant.
+    """
+    ranked = events[:]
+    rng.shuffle(ranked)
+    weights = list(itertools.accumulate(1 / rank ** plan.skew for rank in range(1, len(ranked) + 1)))
+    first_keys = {name: soundex(name) for name in FIRST_NAMES}
+    last_keys = {name: soundex(name) for name in LAST_NAMES}
+    for n in range(plan.participants):
+        event_id, event_date = rng.choices(ranked, cum_weights=weights)[0]
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state, zip_prefix = rng.choice(PLACES)
+        email = f"{first}.{last}{first_id + n}@{rng.choice(DOMAINS)}".lower()
+        yield {
+            "id": first_id + n,
+            "first_name": first,
+            "last_name": last,
+            "email": email,
+            "phone": (None if rng.random() < MISSING_PHONE
+                      else f"({rng.randrange(200, 1000)}) 555-{rng.randrange(10000):04d}"),
+            "address": f"{rng.randrange(1, 9999)} {rng.choice(STREETS)} {rng.choice(STREET_SUFFIXES)}",
+            "city": city,
+            "state": None if rng.random() < MISSING_STATE else state,
+            "zip_code": f"{zip_prefix}{rng.randrange(100):02d}",
+            "created_at": _moment(rng, event_date - timedelta(days=rng.randrange(90))),
+            "event_id": event_id,
+            "first_name_key": first_keys[first],
+            "last_name_key": last_keys[last],
+            "email_key": email_key(email),
+        }
+
+
+def user_rows(rng: random.Random, plan: SeedPlan, first_id: int, password_hash: str) -> Iterator[dict]:
+    """Generate the users, a few of them admins.
+
+    Args:
+        rng: Random generator of the plan.
+        plan: What to generate.
+        first_id: Id of the first user.
+        password_hash: Hash of the password all of them share.
+
+    Yields:
+        One row per user.
+    """
+    for n in range(plan.users):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f"{first[0]}{last}{first_id + n}".lower()
+        yield {
+            "id": first_id + n,
+            "username": username,
+            "password": password_hash,
+            "first_name": first,
+            "last_name": last,
+            "email": f"{username}@{rng.choice(DOMAINS)}",
+            "user_role": "ADMIN" if rng.random() < ADMIN_SHARE else "MEMBER",
+            "created_at": _moment(rng, date(plan.start_year, 1, 1) + timedelta(days=rng.randrange(365 * plan.years))),
+        }
+
+
+def sequence_reset_statement(table: Table) -> Select:
+    """Build the PostgreSQL query that moves a table's id sequence to its highest id.
+
+    Seeded rows carry explicit ids, which leave the sequence behind, and
+    the application's next insert would then reuse an id.
+
+    Args:
+        table: A table with a serial ``id`` primary key.
+
+    Returns:
+        The query; run it after loading the table.
+    """
+    sequence = func.pg_get_serial_sequence(postgresql.dialect().identifier_preparer.quote(table.name), "id")
+    return select(func.setval(sequence, select(func.max(table.c.id)).scalar_subquery()))
+
+
+def _load(conn: Connection, table: Table, rows: Iterator[dict], batch_size: int) -> int:
+    loaded = 0
+    while batch := list(itertools.islice(rows, batch_size)):
+        conn.execute(insert(table), batch)
+        conn.commit()
+        loaded += len(batch)
+    return loaded
+
+
+def seed_database(engine: Engine, plan: SeedPlan, password_hash: str, batch_size: int = BATCH_SIZE) -> dict:
+    """Create the schema if needed and append the plan's rows.
+
+    Args:
+        engine: Synchronous engine for the application database.
+        plan: What to generate.
+        password_hash: Stored password of every seeded user.
+        batch_size: Rows per INSERT batch and commit.
+
+    Returns:
+        Row counts and timings.
+    """
+    started = time.perf_counter()
+    rng = random.Random(plan.seed)
+    timings = {}
+    with engine.begin() as conn:
+        SQLModel.metadata.create_all(conn)
+        create_search_index(conn)
+
+    with engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA cache_size=-262144")
+            conn.commit()
+
+        types = event_type_rows(rng, plan, _next_id(conn, EventType.__table__))
+        _load(conn, EventType.__table__, iter(types), batch_size)
+
+        mark = time.perf_counter()
+        events = []
+
+        def remembered(rows: Iterator[dict]) -> Iterator[dict]:
+            for row in rows:
+                events.append((row["id"], row["event_date"]))
+                yield row
+
+        type_ids = [row["id"] for row in types]
+        _load(conn, Event.__table__, remembered(event_rows(rng, plan, _next_id(conn, Event.__table__), type_ids)),
+              batch_size)
+        timings["events_seconds"] = round(time.perf_counter() - mark, 2)
+
+        mark = time.perf_counter()
+        table = Participant.__table__
+        existing = conn.execute(select(func.count()).select_from(table)).scalar()
+        # Rebuilding an index once is cheaper than updating it per row,
+        # unless the table already holds more rows than are added.
+        deferred = list(table.indexes) if events and plan.participants > existing else []
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+        conn.commit()
+        try:
+            if events:
+                _load(conn, table, participant_rows(rng, plan, _next_id(conn, table), events), batch_size)
+            timings["participants_seconds"] = round(time.perf_counter() - mark, 2)
+        finally:
+            # Batches commit as they go; only a failed one is rolled back.
+            conn.rollback()
+            mark = time.perf_counter()
+            for index in deferred:
+                index.create(conn, checkfirst=True)
+            conn.commit()
+            timings["indexes_seconds"] = round(time.perf_counter() - mark, 2)
+
+        _load(conn, User.__table__, user_rows(rng, plan, _next_id(conn, User.__table__), password_hash), batch_size)
+        if conn.dialect.name == "postgresql":
+            for model in (EventType, Event, Participant, User):
+                conn.execute(sequence_reset_statement(model.__table__))
+        conn.execute(version_bump_statement(conn.dialect.name, EventType, Event, Participant, User))
+        conn.commit()
+
+    rollups = rebuild_rollups(engine)
+    return {
+        "event_types": len(types),
+        "events": len(events),
+        "participants": plan.participants if events else 0,
+        "users": plan.users,
+        **timings,
+        "rollups_seconds": rollups["total_seconds"],
+        "total_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    defaults = SeedPlan()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.database_url, help="Synchronous database URL")
+    parser.add_argument("--event-types", type=int, default=defaults.event_types)
+    parser.add_argument("--events", type=int, default=defaults.events)
+    parser.add_argument("--participants", type=int, default=defaults.participants)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--skew", type=float, default=defaults.skew,
+                        help="Zipf exponent of participants per event; 0 is uniform")
+    parser.add_argument("--start-year", type=int, default=defaults.start_year, help="year of the earliest event")
+    parser.add_argument("--years", type=int, default=defaults.years, help="number of years event dates span")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--user-password", default="outreach-seed", help="password of every seeded user")
+    args = parser.parse_args()
+    if args.event_types < 1 and args.events:
+        parser.error("events need at least one event type")
+
+    from auth.hashing import get_password_hash
+
+    plan = SeedPlan(args.event_types, args.events, args.participants, args.users, args.skew, args.start_year,
+                    args.years, args.seed)
+    configure_logging(settings.log_level, settings.log_debug_sample_rate)
+    engine = create_engine(args.database_url)
+    try:
+        stats = seed_database(engine, plan, get_password_hash(args.user_password), args.batch_size)
+        logger.info("Database seeded", extra=stats)
+    finally:
+        engine.dispose()
+        shutdown_logging()
+    print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
@@ -7,23 +7,30 @@ and exception handlers.
 
 import logging
 import os
-import tracemalloc
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.responses import PlainTextResponse, FileResponse
+from starlette.responses import PlainTextResponse, FileResponse, Response
 from config.app_config import settings
-from config.db import init_db
+from auth.security import shutdown_hash_pool
+from config.db import ReadYourWritesMiddleware, engine, init_db, replica_router
+from config.logging_config import configure_logging, parse_log_level, shutdown_logging
+from routes.dashboard_routes import router as dashboard_router
+from routes.diagnostics_routes import router as diagnostics_router
 from routes.event_routes import router as event_router
 from routes.event_type_routes import router as event_type_router
 from routes.participant_routes import router as participant_router
 from routes.security_routes import router as security_router
+from routes.stats_routes import router as stats_router
 from routes.user_routes import router as user_router
+from utils import memory_diagnostics
+from utils.etag import CACHE_CONTROL, NotModified
 
 logger = logging.getLogger('main')
 
@@ -32,8 +39,12 @@ logger = logging.getLogger('main')
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage application startup and shutdown lifecycle.
 
-    Initializes the database on startup. Can optionally apply
-    Alembic migrations if uncommented.
+    On startup, starts the background log writer, initializes the
+    database and, when the memory_diagnostics setting is enabled, starts
+    tracing allocations. On shutdown, disposes of the engine's connection
+    and replica pools, stops the password hash workers and flushes queued
+    log records.
+    Can optionally apply Alembic migrations if uncommented.
 
     Args:
         app: The FastAPI application instance.
@@ -41,14 +52,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Yields:
         Control to the application after startup is complete.
     """
-    init_db()
+    configure_logging(settings.log_level, settings.log_debug_sample_rate)
+    await init_db()
+    if settings.memory_diagnostics:
+        memory_diagnostics.start(settings.memory_diagnostics_frames)
     # Apply migrations
     # alembic_cfg = Config("alembic.ini")
     # command.upgrade(alembic_cfg, "head")
     yield
+    shutdown_hash_pool()
+    await engine.dispose()
+    await replica_router.dispose()
+    if settings.memory_diagnostics:
+        memory_diagnostics.stop()
+    shutdown_logging()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware for frontend development
 app.add_middleware(
@@ -59,7 +79,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-tracemalloc.start()
+app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.read_your_writes_seconds)
+
+# Attributes memory growth to routes; a no-op unless tracing is running
+app.add_middleware(memory_diagnostics.RouteMemoryMiddleware)
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -71,9 +94,24 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
         exc: The HTTP exception that was raised.
 
     Returns:
-        Plain text response with the error detail and status code.
+        Plain text response with the error detail, status code and any
+        headers set on the exception.
+    """
+    return PlainTextResponse(str(exc.detail), status_code=exc.status_code, headers=exc.headers)
+
+
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    """Answer a conditional GET whose cached copy is still current.
+
+    Args:
+        request: The conditional request.
+        exc: The exception carrying the current entity tag.
+
+    Returns:
+        An empty 304 response with the entity tag.
     """
-    return PlainTextResponse(str(exc.detail), status_code=exc.status_code)
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": CACHE_CONTROL})
 
 
 @app.exception_handler(RequestValidationError)
@@ -96,6 +134,9 @@ app.include_router(event_router)
 app.include_router(participant_router)
 app.include_router(user_router)
 app.include_router(security_router)
+app.include_router(stats_router)
+app.include_router(dashboard_router)
+app.include_router(diagnostics_router)
 
 # Serve static files for production
 static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -113,4 +154,4 @@ if os.path.exists(static_dir):
 
 if __name__ == "__main__":
     uvicorn.run(app, host=settings.host, port=settings.port,
-                log_level=settings.log_level)
+                log_level=parse_log_level(settings.log_level)[0].lower())
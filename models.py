@@ -4,9 +4,12 @@ This module defines the SQLModel ORM classes that map to database tables
 for events, event types, participants, and users.
 """
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import date, datetime, timezone
 
+from utils.blocking import column_key, email_key, soundex
+
 
 def utc_now() -> datetime:
     """Return the current UTC timestamp.
@@ -54,21 +57,25 @@ class Event(SQLModel, table=True):
         event_type_id: Foreign key to the event type.
         created_at: Timestamp when the record was created.
         participants: List of participants registered for this event.
+        event_type: Relationship to the EventType model.
     """
 
     __tablename__ = "Event"
     id: int = Field(default=None, primary_key=True)
     name: str = Field(index=True, nullable=False, max_length=50)
-    event_date: date = Field(nullable=False)
+    event_date: date = Field(index=True, nullable=False)
     description: str = Field(nullable=True)
     location: str = Field(nullable=True, max_length=200)
-    event_type_id: int = Field(foreign_key="Event_Type.id", nullable=False)
+    event_type_id: int = Field(foreign_key="Event_Type.id", index=True, nullable=False)
     created_at: datetime = Field(default_factory=utc_now)
     participants: list["Participant"] = Relationship(
         back_populates="event",
         # link_model=Participant,
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"}
+        # The database deletes the participants (ON DELETE CASCADE), so
+        # deleting an event never loads its roster.
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "passive_deletes": True}
     )
+    event_type: "EventType" = Relationship()
 
     def __repr__(self):
         return f"Event(id={self.id}, name='{self.name}', description='{self.description}', location='{self.location}', event_type_id={self.event_type_id}, created_at='{self.created_at}')"
@@ -92,10 +99,14 @@ class Participant(SQLModel, table=True):
         zip_code: Optional postal code.
         created_at: Timestamp when the record was created.
         event_id: Foreign key to the associated event.
+        first_name_key: Soundex of the first name, for fuzzy lookup.
+        last_name_key: Soundex of the last name, for fuzzy lookup.
+        email_key: Normalized email prefix, for fuzzy lookup.
         event: Relationship to the Event model.
     """
 
     __tablename__ = "Participant"
+    __table_args__ = (Index("ix_Participant_event_id_email", "event_id", "email"),)
 
     id: int = Field(default=None, primary_key=True)
     first_name: str = Field(index=False, nullable=False, max_length=50)
@@ -107,7 +118,13 @@ class Participant(SQLModel, table=True):
     state: str = Field(index=False, nullable=True, max_length=2)
     zip_code: str = Field(index=False, nullable=True, max_length=10)
     created_at: datetime = Field(default_factory=utc_now)
-    event_id: int = Field(foreign_key="Event.id", nullable=False)
+    event_id: int = Field(foreign_key="Event.id", ondelete="CASCADE", index=True, nullable=False)
+    first_name_key: str = Field(default=None, index=True, nullable=True, max_length=4,
+                                sa_column_kwargs={"default": column_key("first_name", soundex)})
+    last_name_key: str = Field(default=None, index=True, nullable=True, max_length=4,
+                               sa_column_kwargs={"default": column_key("last_name", soundex)})
+    email_key: str = Field(default=None, index=True, nullable=True, max_length=4,
+                           sa_column_kwargs={"default": column_key("email", email_key)})
     event: "Event" = Relationship(back_populates="participants")
 
     def __repr__(self):
@@ -148,3 +165,71 @@ class User(SQLModel, table=True):
 
     def __repr__(self):
         return f"User(id={self.id}, username='{self.username}', first_name='{self.first_name}', last_name='{self.last_name}', email='{self.email}', created_at='{self.created_at}')"
+
+
+class ResourceVersion(SQLModel, table=True):
+    """Change counter for a table, used to build HTTP ETags.
+
+    Every write to a table increments its counter in the same
+    transaction, so read endpoints can tell whether their data changed
+    without re-running the query.
+
+    Attributes:
+        resource: Name of the table the counter belongs to.
+        version: Number of write transactions committed to the table.
+    """
+
+    __tablename__ = "Resource_Version"
+
+    resource: str = Field(primary_key=True, max_length=50)
+    version: int = Field(default=0, nullable=False)
+
+    def __repr__(self):
+        return f"ResourceVersion(resource='{self.resource}', version={self.version})"
+
+
+class EventRollup(SQLModel, table=True):
+    """Number of events per event type and month.
+
+    Maintained in the same transaction as event writes by
+    ``utils.rollups`` and recomputed by ``jobs.rollups``.
+
+    Attributes:
+        event_type_id: Event type of the counted events.
+        month: Month of the event date, as ``YYYY-MM``.
+        events: Number of events in the group.
+    """
+
+    __tablename__ = "Event_Rollup"
+
+    event_type_id: int = Field(primary_key=True)
+    month: str = Field(primary_key=True, max_length=7)
+    events: int = Field(default=0, nullable=False)
+
+    def __repr__(self):
+        return f"EventRollup(event_type_id={self.event_type_id}, month='{self.month}', events={self.events})"
+
+
+class ParticipantRollup(SQLModel, table=True):
+    """Number of participants per event type, event month and state.
+
+    Maintained in the same transaction as participant and event writes
+    by ``utils.rollups`` and recomputed by ``jobs.rollups``.
+
+    Attributes:
+        event_type_id: Event type of the participants' events.
+        month: Month of the event date, as ``YYYY-MM``.
+        state: Participant's state, or an empty string when not given.
+        participants: Number of participants in the group.
+    """
+
+    __tablename__ = "Participant_Rollup"
+
+    event_type_id: int = Field(primary_key=True)
+    month: str = Field(primary_key=True, max_length=7)
+    state: str = Field(primary_key=True, max_length=2)
+    participants: int = Field(default=0, nullable=False)
+
+    def __repr__(self):
+        return (f"ParticipantRollup(event_type_id={self.event_type_id}, month='{self.month}', "
+                f"state='{self.state}', participants={self.participants})")
@@ -0,0 +1,44 @@
+"""Dashboard API routes.
+
+This module serves the dashboard page's data in one request, computed
+by ``utils.dashboard`` and cached briefly in process.
+"""
+
+from datetime import date
+
+import orjson
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.db import get_read_db_conn
+from schemas.dashboard import DashboardSummary
+from utils.dashboard import build_summary, summary_cache
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+)
+
+
+@router.get("/summary", response_model=DashboardSummary,
+            description="Totals, upcoming events, recent registrations and counts per event type")
+async def get_summary(db: AsyncSession = Depends(get_read_db_conn)) -> Response:
+    """Return the dashboard summary.
+
+    The summary is recomputed at most once every
+    ``dashboard_cache_ttl_seconds``, and whenever the date changes, so
+    it can lag behind writes by that long.
+
+    Args:
+        db: Database session, used only when the cache is stale.
+
+    Returns:
+        The encoded summary.
+    """
+    today = date.today()
+
+    async def build() -> bytes:
+        return orjson.dumps((await build_summary(db, today)).model_dump(mode="json"))
+
+    return Response(await summary_cache.get_or_build(today, build), media_type="application/json")
@@ -0,0 +1,119 @@
+"""Memory diagnostics API routes.
+
+This module exposes tracemalloc snapshots, snapshot diffs and top
+allocation reports to administrators. The endpoints only respond while
+tracing is running, which requires the ``memory_diagnostics`` setting.
+"""
+
+import tracemalloc
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from auth.security import get_admin_principal
+from schemas.diagnostics import AllocationGrouping, AllocationStat, RouteAllocationStat, SnapshotInfo
+from utils import memory_diagnostics
+
+
+async def require_tracing() -> None:
+    """Reject requests while memory diagnostics are disabled.
+
+    Raises:
+        HTTPException: 404 error if tracemalloc is not running.
+    """
+    if not tracemalloc.is_tracing():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Memory diagnostics are disabled")
+
+
+router = APIRouter(
+    prefix="/diagnostics/memory",
+    tags=["Diagnostics"],
+    dependencies=[Depends(get_admin_principal), Depends(require_tracing)],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.post("/snapshots", response_model=SnapshotInfo)
+async def create_snapshot(name: Optional[str] = None) -> SnapshotInfo:
+    """Take and store a tracemalloc snapshot.
+
+    Args:
+        name: Name to store the snapshot under. Defaults to a timestamp.
+
+    Returns:
+        A summary of the stored snapshot.
+    """
+    return memory_diagnostics.take_snapshot(name)
+
+
+@router.get("/snapshots", response_model=list[SnapshotInfo])
+async def list_snapshots() -> list[SnapshotInfo]:
+    """List stored snapshots, oldest first.
+
+    Returns:
+        Summaries of the stored snapshots.
+    """
+    return memory_diagnostics.list_snapshots()
+
+
+@router.delete("/snapshots", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_snapshots() -> None:
+    """Drop all stored snapshots and per-route figures."""
+    memory_diagnostics.reset()
+
+
+@router.get("/top", response_model=list[AllocationStat])
+async def top_allocations(limit: int = Query(20, ge=1, le=500),
+                          group_by: AllocationGrouping = AllocationGrouping.LINENO) -> list[AllocationStat]:
+    """Report the locations holding the most traced memory.
+
+    Args:
+        limit: Maximum number of locations to return.
+        group_by: Group allocations by line, file or traceback.
+
+    Returns:
+        The largest allocation sites, biggest first.
+    """
+    return memory_diagnostics.top_allocations(limit, group_by)
+
+
+@router.get("/diff", response_model=list[AllocationStat])
+async def diff_snapshots(base: str, target: Optional[str] = None, limit: int = Query(20, ge=1, le=500),
+                         group_by: AllocationGrouping = AllocationGrouping.LINENO) -> list[AllocationStat]:
+    """Compare two stored snapshots, or a stored snapshot with now.
+
+    Args:
+        base: Name of the earlier snapshot.
+        target: Name of the later snapshot. Defaults to a fresh snapshot.
+        limit: Maximum number of locations to return.
+        group_by: Group allocations by line, file or traceback.
+
+    Returns:
+        The locations with the largest change, biggest first.
+
+    Raises:
+        HTTPException: 404 error if a named snapshot does not exist.
+    """
+    base_snapshot = memory_diagnostics.get_snapshot(base)
+    if base_snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Snapshot {base} not found")
+    if target is None:
+        target_snapshot = memory_diagnostics.current_snapshot()
+    else:
+        target_snapshot = memory_diagnostics.get_snapshot(target)
+        if target_snapshot is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Snapshot {target} not found")
+    return memory_diagnostics.diff_snapshots(base_snapshot, target_snapshot, limit, group_by)
+
+
+@router.get("/routes", response_model=list[RouteAllocationStat])
+async def top_routes(limit: int = Query(20, ge=1, le=500)) -> list[RouteAllocationStat]:
+    """Report the routes with the largest net memory growth since tracing began.
+
+    Args:
+        limit: Maximum number of routes to return.
+
+    Returns:
+        Per-route figures, largest net growth first.
+    """
+    return memory_diagnostics.top_routes(limit)
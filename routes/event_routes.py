@@ -6,12 +6,26 @@ and adding participants to events.
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from config.db import get_db_conn
-from models import Event, Participant
-from schemas.event import EventSchemaInput, EventSchema
-from schemas.participant import ParticipantSchemaInput
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Select, delete, func, insert, literal, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from config.db import get_db_conn, get_read_db_conn
+from models import Event, EventType, Participant, utc_now
+from schemas.event import (BatchStatus, EventBatchCreate, EventBatchRequest, EventBatchResponse, EventBatchResult,
+                           EventExpanded, EventExpansion, EventSchemaInput, EventSchema)
+from schemas.export import ExportFormat
+from schemas.page import Page
+from schemas.participant import ParticipantRegistration, ParticipantSchema, ParticipantSchemaInput
+from utils.blocking import match_keys
+from utils.etag import bump_versions, conditional
+from utils.expand import EXPANSION_MODELS, embed_relationships, event_expansions, expanded_columns, paginate_expanded
+from utils.export import export_response
+from utils.fields import json_response, sparse_fields
+from utils.pagination import PageParams
+from utils.rollups import record_events, record_participants
+from utils.search import search_events
 
 router = APIRouter(
     prefix="/event",
@@ -20,6 +34,23 @@ router = APIRouter(
 )
 
 
+async def _check_event_type(db: AsyncSession, event_type_id: int | None) -> None:
+    """Reject an event whose type does not exist.
+
+    The foreign key would reject it too, but as an IntegrityError at
+    commit that surfaces as a server error.
+
+    Args:
+        db: Database session.
+        event_type_id: The event type the event refers to.
+
+    Raises:
+        HTTPException: 422 error if the event type is missing or unknown.
+    """
+    if event_type_id is None or (await db.exec(select(EventType.id).where(EventType.id == event_type_id))).first() is None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Event type not found")
+
+
 @router.post("/create", response_model=EventSchema, description="Creates an event record in the database", responses={
     404: {
         "description": "Item not found",
@@ -27,7 +58,7 @@ router = APIRouter(
     500: {
         "description": "Server error"
     }})
-async def create_event(event: EventSchemaInput, db: Session = Depends(get_db_conn)) -> Event:
+async def create_event(event: EventSchemaInput, db: AsyncSession = Depends(get_db_conn)) -> Event:
     """Create a new event record.
 
     Args:
@@ -36,46 +67,112 @@ async def create_event(event: EventSchemaInput, db: Session = Depends(get_db_con
 
     Returns:
         The created event with its generated id.
+
+    Raises:
+        HTTPException: 422 error if the event type does not exist.
     """
+    await _check_event_type(db, event.event_type_id)
     new_evnt = Event(**event.model_dump())
     db.add(new_evnt)
-    db.commit()
-    db.refresh(new_evnt)
+    await bump_versions(db, Event)
+    await db.commit()
+    await db.refresh(new_evnt)
 
     return new_evnt
 
 
-@router.get("/list", response_model=list[EventSchema], description="Returns the events in the database", responses={
+@router.get("/list", dependencies=[Depends(conditional(Event, expansions=EXPANSION_MODELS))],
+            response_model=Page[EventExpanded], description="Returns a page of the events in the database", responses={
     404: {
         "description": "Item not found",
     },
     500: {
         "description": "Server error"
     }})
-async def get_events(db: Session = Depends(get_db_conn)) -> list[Event]:
-    """Retrieve all events from the database.
+async def get_events(response: Response, page: PageParams = Depends(),
+                     fields: Select = Depends(sparse_fields(Event, EventSchema)),
+                     expand: list[EventExpansion] = Depends(event_expansions),
+                     db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """Retrieve a page of events ordered by id.
+
+    Rows are serialized straight from the selected columns.
+
+    Args:
+        response: Response carrying headers set by dependencies.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
+        expand: Related data requested with ``?expand=``.
+        db: Database session.
+
+    Returns:
+        A page of event records and the cursor for the next page.
+    """
+    return await paginate_expanded(db, expanded_columns(fields, expand), [Event.id], page, response, expand)
+
+
+@router.get("/export", response_class=StreamingResponse,
+            description="Streams all events as NDJSON, CSV or XLSX")
+async def export_events(format: ExportFormat = ExportFormat.NDJSON,
+                        db: AsyncSession = Depends(get_read_db_conn)) -> StreamingResponse:
+    """Stream all event records as a file download.
+
+    Args:
+        format: Output file format.
+        db: Database session.
+
+    Returns:
+        A streaming file download of the event records.
+    """
+    return export_response(db, select(Event.__table__).order_by(Event.id), format, "events")
+
+
+@router.get("/search", dependencies=[Depends(conditional(Event, expansions=EXPANSION_MODELS))],
+            response_model=Page[EventExpanded],
+            description="Searches event names, descriptions and locations, best matches first")
+async def search(response: Response, q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+                 page: PageParams = Depends(), fields: Select = Depends(sparse_fields(Event, EventSchema)),
+                 expand: list[EventExpansion] = Depends(event_expansions),
+                 db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """Search events by the words in their name, description and location.
+
+    Every word must match; the last one also matches as a prefix.
+    Results are ranked with matches in the name weighted highest, then
+    location, then description.
 
     Args:
+        response: Response carrying headers set by dependencies.
+        q: The search text.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
+        expand: Related data requested with ``?expand=``.
         db: Database session.
 
     Returns:
-        List of all event records.
+        A page of matching events, best match first.
     """
-    return list(db.exec(select(Event)).all())
+    statement, keys = search_events(fields, q, db.bind.dialect.name)
+    statement = expanded_columns(statement, expand, keys[-1])
+    return await paginate_expanded(db, statement, keys, page, response, expand)
 
 
-@router.get("/read/{id}", response_model=EventSchema)
-async def get_event(id: int, db: Session = Depends(get_db_conn), responses={
+@router.get("/read/{id}", dependencies=[Depends(conditional(Event, expansions=EXPANSION_MODELS))],
+            response_model=EventExpanded)
+async def get_event(id: int, response: Response, fields: Select = Depends(sparse_fields(Event, EventSchema)),
+                    expand: list[EventExpansion] = Depends(event_expansions),
+                    db: AsyncSession = Depends(get_read_db_conn), responses={
     404: {
         "description": "Item not found",
     },
     500: {
         "description": "Server error"
-    }}) -> Event:
+    }}) -> ORJSONResponse:
     """Retrieve a single event by ID.
 
     Args:
         id: The event ID to retrieve.
+        response: Response carrying headers set by dependencies.
+        fields: Select of the columns requested with ``?fields=``.
+        expand: Related data requested with ``?expand=``.
         db: Database session.
 
     Returns:
@@ -84,14 +181,16 @@ async def get_event(id: int, db: Session = Depends(get_db_conn), responses={
     Raises:
         HTTPException: 404 error if event not found.
     """
-    event = db.exec(select(Event).where(Event.id == id)).first()
+    event = (await db.exec(expanded_columns(fields, expand).where(Event.id == id))).first()
 
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
-    return event
+    [item] = await embed_relationships(db, [event._asdict()], expand)
+    return json_response(item, response)
 
 
-@router.get("/list/{start_date}/{end_date}", response_model=list[EventSchema],
+@router.get("/list/{start_date}/{end_date}", dependencies=[Depends(conditional(Event, expansions=EXPANSION_MODELS))],
+            response_model=Page[EventExpanded],
             description="Returns events in the database for a given date range", responses={
         404: {
             "description": "Item not found",
@@ -99,22 +198,31 @@ async def get_event(id: int, db: Session = Depends(get_db_conn), responses={
         500: {
             "description": "Server error"
         }})
-async def find_events_by_date(start_date: date, end_date: date, db: Session = Depends(get_db_conn)) -> list[Event]:
-    """Retrieve events within a date range.
+async def find_events_by_date(start_date: date, end_date: date, response: Response, page: PageParams = Depends(),
+                              fields: Select = Depends(sparse_fields(Event, EventSchema)),
+                              expand: list[EventExpansion] = Depends(event_expansions),
+                              db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """Retrieve a page of events within a date range.
+
+    Events are ordered by date, then id, and serialized straight from
+    the selected columns.
 
     Args:
         start_date: Start of the date range (inclusive).
         end_date: End of the date range (inclusive).
+        response: Response carrying headers set by dependencies.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
+        expand: Related data requested with ``?expand=``.
         db: Database session.
 
     Returns:
-        List of events occurring within the specified date range.
+        A page of events occurring within the specified date range.
     """
-    return list(db.exec(
-        select(Event).where(
-            (Event.event_date >= start_date) & (Event.event_date <= end_date)
-        )
-    ).all())
+    statement = expanded_columns(fields, expand).where(
+        (Event.event_date >= start_date) & (Event.event_date <= end_date)
+    )
+    return await paginate_expanded(db, statement, [Event.event_date, Event.id], page, response, expand)
 
 
 @router.put("/update/{id}", response_model=EventSchema, description="Updates an event record", responses={
@@ -124,7 +232,7 @@ async def find_events_by_date(start_date: date, end_date: date, db: Session = De
     500: {
         "description": "Server error"
     }})
-async def update_event(id: int, evnt: EventSchemaInput, db: Session = Depends(get_db_conn)) -> Event:
+async def update_event(id: int, evnt: EventSchemaInput, db: AsyncSession = Depends(get_db_conn)) -> Event:
     """Update an existing event record.
 
     Args:
@@ -136,12 +244,14 @@ async def update_event(id: int, evnt: EventSchemaInput, db: Session = Depends(ge
         The updated event record.
 
     Raises:
-        HTTPException: 404 error if event not found.
+        HTTPException: 404 error if event not found, 422 error if the
+            event type does not exist.
     """
-    db_evnt = db.exec(select(Event).where(Event.id == id)).first()
+    db_evnt = (await db.exec(select(Event).where(Event.id == id))).first()
 
     if not db_evnt:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event record not found")
+    await _check_event_type(db, evnt.event_type_id)
 
     db_evnt.name = evnt.name
     db_evnt.description = evnt.description
@@ -149,8 +259,9 @@ async def update_event(id: int, evnt: EventSchemaInput, db: Session = Depends(ge
     db_evnt.location = evnt.location
     db_evnt.event_type_id = evnt.event_type_id
 
-    db.commit()
-    db.refresh(db_evnt)
+    await bump_versions(db, Event)
+    await db.commit()
+    await db.refresh(db_evnt)
 
     return db_evnt
 
@@ -163,10 +274,11 @@ async def update_event(id: int, evnt: EventSchemaInput, db: Session = Depends(ge
                    500: {
                        "description": "Server error"
                    }})
-async def delete_event(id: int, db: Session = Depends(get_db_conn)) -> None:
+async def delete_event(id: int, db: AsyncSession = Depends(get_db_conn)) -> None:
     """Delete an event record.
 
-    Deletes the event and all associated participants due to cascade.
+    The database deletes the event's participants through the foreign
+    key's ON DELETE CASCADE, so the roster is never loaded.
 
     Args:
         id: The event ID to delete.
@@ -175,17 +287,18 @@ async def delete_event(id: int, db: Session = Depends(get_db_conn)) -> None:
     Raises:
         HTTPException: 404 error if event not found.
     """
-    event = db.exec(select(Event).where(Event.id == id)).first()
+    event = (await db.exec(select(Event).where(Event.id == id))).first()
 
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event record not found")
 
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await bump_versions(db, Event, Participant)
+    await db.commit()
     return
 
 
-@router.post("/participant/add/{event_id}", response_model=EventSchema,
+@router.post("/participant/add/{event_id}", response_model=ParticipantRegistration,
              description="Adds a participant record to an event", responses={
         404: {
             "description": "Item not found",
@@ -194,33 +307,135 @@ async def delete_event(id: int, db: Session = Depends(get_db_conn)) -> None:
             "description": "Server error"
         }})
 async def add_participant_to_event(event_id: int, participant: ParticipantSchemaInput,
-                                   db: Session = Depends(get_db_conn)) -> Event:
+                                   include_count: bool = Query(
+                                       False, description="Also return the event's participant count"),
+                                   db: AsyncSession = Depends(get_db_conn)) -> ParticipantRegistration:
     """Add a participant to an existing event.
 
-    Creates a new participant record and associates it with the event.
+    The participant is written with a single INSERT ... SELECT from the
+    event row, so the event's existence is checked by the same statement
+    and neither the event nor its roster is loaded. The cost stays the
+    same however many participants the event already has.
 
     Args:
         event_id: The event ID to add the participant to.
-        participant: Participant data to create.
+        participant: Participant data to create; its event_id is ignored.
+        include_count: Also count the event's participants, through the
+            event_id index.
         db: Database session.
 
     Returns:
-        The updated event record with the new participant.
+        The new participant, with the event's participant count if requested.
 
     Raises:
         HTTPException: 404 error if event not found.
     """
-    event = db.exec(select(Event).where(Event.id == event_id)).first()
-
-    if not event:
+    table = Participant.__table__
+    values = {**participant.model_dump(exclude={"event_id"}), "created_at": utc_now()}
+    values.update(match_keys(values))
+    source = (select(*(literal(value, table.c[name].type) for name, value in values.items()), Event.id)
+              .where(Event.id == event_id))
+    statement = (insert(table).from_select([*values, "event_id"], source, include_defaults=False)
+                 .returning(*(table.c[name] for name in ParticipantSchema.model_fields)))
+    row = (await db.exec(statement)).first()
+
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event record not found")
 
-    db_participant = Participant(**participant.model_dump())
-    db.add(db_participant)
+    await record_participants(db, [(event_id, participant.state)])
+    await bump_versions(db, Participant)
+    count = None
+    if include_count:
+        count = (await db.exec(select(func.count()).where(Participant.event_id == event_id))).one()
+    await db.commit()
+    return ParticipantRegistration(**row._asdict(), event_participants=count)
+
+
+@router.post("/batch", response_model=EventBatchResponse,
+             description="Creates, updates and deletes events in a single transaction", responses={
+        404: {
+            "description": "Item not found",
+        },
+        500: {
+            "description": "Server error"
+        }})
+async def batch_events(batch: EventBatchRequest, db: AsyncSession = Depends(get_db_conn)) -> EventBatchResponse:
+    """Apply a batch of event creates, updates and deletes.
+
+    Each list is executed as set-based statements (one multi-row INSERT,
+    one executemany UPDATE, one DELETE per table) and the whole batch is
+    committed in a single transaction. Ids that do not exist are reported
+    as not found, and creates and updates naming an unknown event type
+    as invalid, instead of failing the batch. All referenced event types
+    are checked with one query before anything is written.
 
-    event.participants.append(db_participant)
-    db.add(event)
-    db.commit()
-    db.refresh(event)
+    Deleting an event also deletes its participants, through the foreign
+    key's ON DELETE CASCADE.
+
+    Args:
+        batch: The events to create, update and delete.
+        db: Database session.
+
+    Returns:
+        Per-item results for each list, in request order.
+    """
+    result = EventBatchResponse()
+
+    type_ids = {item.event_type_id for item in [*batch.create, *batch.update]}
+    known_types = (set((await db.exec(select(EventType.id).where(EventType.id.in_(type_ids)))).all())
+                   if type_ids else set())
+
+    def invalid(index: int, item: EventBatchCreate, id: int | None = None) -> EventBatchResult:
+        return EventBatchResult(index=index, id=id, status=BatchStatus.INVALID,
+                                error=f"event_type_id: event type {item.event_type_id} does not exist")
+
+    if batch.create:
+        now = utc_now()
+        valid = [i for i, item in enumerate(batch.create) if item.event_type_id in known_types]
+        rows = (await db.exec(
+            insert(Event.__table__).returning(*Event.__table__.c, sort_by_parameter_order=True),
+            params=[{**batch.create[i].model_dump(), "created_at": now} for i in valid],
+        )).all() if valid else []
+        await record_events(db, [row.id for row in rows])
+        created = dict(zip(valid, rows))
+        result.created = [
+            EventBatchResult(index=i, id=created[i].id, status=BatchStatus.CREATED,
+                             event=EventSchema.model_validate(created[i]))
+            if i in created else invalid(i, item)
+            for i, item in enumerate(batch.create)
+        ]
+
+    if batch.update:
+        ids = {item.id for item in batch.update}
+        existing = set((await db.exec(select(Event.id).where(Event.id.in_(ids)))).all())
+        valid = [item for item in batch.update if item.id in existing and item.event_type_id in known_types]
+        changed = {item.id for item in valid}
+        if changed:
+            await record_events(db, changed, -1)
+            await db.exec(update(Event), params=[item.model_dump() for item in valid])
+            await record_events(db, changed)
+        updated = {event.id: event for event in (await db.exec(select(Event).where(Event.id.in_(changed)))).all()}
+        result.updated = [
+            EventBatchResult(index=i, id=item.id, status=BatchStatus.NOT_FOUND) if item.id not in existing
+            else invalid(i, item, item.id) if item.event_type_id not in known_types
+            else EventBatchResult(index=i, id=item.id, status=BatchStatus.UPDATED,
+                                  event=EventSchema.model_validate(updated[item.id]))
+            for i, item in enumerate(batch.update)
+        ]
+
+    if batch.delete:
+        existing = set((await db.exec(select(Event.id).where(Event.id.in_(batch.delete)))).all())
+        if existing:
+            await record_events(db, existing, -1)
+            await db.exec(delete(Event).where(Event.id.in_(existing)))
+            await bump_versions(db, Participant)
+        result.deleted = [
+            EventBatchResult(index=i, id=event_id,
+                             status=BatchStatus.DELETED if event_id in existing else BatchStatus.NOT_FOUND)
+            for i, event_id in enumerate(batch.delete)
+        ]
+
+    await bump_versions(db, Event)
+    await db.commit()
+    return result
 
-    return event
@@ -4,14 +4,23 @@ This module provides CRUD endpoints for managing event types
 (categories of events like workshops, conferences, etc.).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from config.db import get_db_conn
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from config.db import get_db_conn, get_read_db_conn
 from models import EventType
 from schemas.event_type import EventTypeSchema, EventTypeSchemaInput
-from config.app_config import settings
+from schemas.page import Page
+from utils.etag import bump_versions, conditional
+from utils.fields import json_response, sparse_fields
+from utils.pagination import PageParams, paginate_json
 import logging
 
+logger = logging.getLogger('main.routes.event_type')
+
 router = APIRouter(
     prefix="/type",
     tags=["Event Types"],
@@ -19,7 +28,7 @@ router = APIRouter(
 )
 
 @router.post("/create", response_model=EventTypeSchema)
-async def create_event_type(event_type: EventTypeSchemaInput, db: Session = Depends(get_db_conn)) -> EventType:
+async def create_event_type(event_type: EventTypeSchemaInput, db: AsyncSession = Depends(get_db_conn)) -> EventType:
     """Create a new event type.
 
     Args:
@@ -31,17 +40,22 @@ async def create_event_type(event_type: EventTypeSchemaInput, db: Session = Depe
     """
     new_event_type = EventType(**event_type.model_dump())
     db.add(new_event_type)
-    db.commit()
-    db.refresh(new_event_type)
+    await bump_versions(db, EventType)
+    await db.commit()
+    await db.refresh(new_event_type)
     return new_event_type
 
 
-@router.get("/read/{id}", response_model=EventTypeSchema)
-async def get_event_type(id: int, db: Session = Depends(get_db_conn)) -> EventType:
+@router.get("/read/{id}", dependencies=[Depends(conditional(EventType))], response_model=EventTypeSchema)
+async def get_event_type(id: int, response: Response,
+                         fields: Select = Depends(sparse_fields(EventType, EventTypeSchema)),
+                         db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
     """Retrieve a single event type by ID.
 
     Args:
         id: The event type ID to retrieve.
+        response: Response carrying headers set by dependencies.
+        fields: Select of the columns requested with ``?fields=``.
         db: Database session.
 
     Returns:
@@ -50,15 +64,15 @@ async def get_event_type(id: int, db: Session = Depends(get_db_conn)) -> EventTy
     Raises:
         HTTPException: 404 error if event type not found.
     """
-    event_type = db.exec(select(EventType).where(EventType.id == id)).first()
+    event_type = (await db.exec(fields.where(EventType.id == id))).first()
 
     if not event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
-    return event_type
+    return json_response(event_type._asdict(), response)
 
 
 @router.put("/update/{id}", response_model=EventTypeSchema)
-async def update_event_type(id: int, event_type: EventTypeSchemaInput, db: Session = Depends(get_db_conn)) -> EventType:
+async def update_event_type(id: int, event_type: EventTypeSchemaInput, db: AsyncSession = Depends(get_db_conn)) -> EventType:
     """Update an existing event type.
 
     Args:
@@ -72,21 +86,22 @@ async def update_event_type(id: int, event_type: EventTypeSchemaInput, db: Sessi
     Raises:
         HTTPException: 404 error if event type not found.
     """
-    db_event_type = db.exec(select(EventType).where(EventType.id == id)).first()
+    db_event_type = (await db.exec(select(EventType).where(EventType.id == id))).first()
 
     if not db_event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
 
     db_event_type.name = event_type.name
     db_event_type.description = event_type.description
-    db.commit()
-    db.refresh(db_event_type)
+    await bump_versions(db, EventType)
+    await db.commit()
+    await db.refresh(db_event_type)
 
     return db_event_type
 
 
 @router.delete("/delete/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_event_type(id: int, db: Session = Depends(get_db_conn)) -> None:
+async def delete_event_type(id: int, db: AsyncSession = Depends(get_db_conn)) -> None:
     """Delete an event type.
 
     Args:
@@ -94,27 +109,38 @@ async def delete_event_type(id: int, db: Session = Depends(get_db_conn)) -> None
         db: Database session.
 
     Raises:
-        HTTPException: 404 error if event type not found.
+        HTTPException: 404 error if event type not found, 409 error if
+            events still use it.
     """
-    db_event_type = db.exec(select(EventType).where(EventType.id == id)).first()
+    db_event_type = (await db.exec(select(EventType).where(EventType.id == id))).first()
 
     if not db_event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
 
-    db.delete(db_event_type)
-    db.commit()
+    await db.delete(db_event_type)
+    try:
+        await bump_versions(db, EventType)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Event type is used by events")
     return
 
 
-@router.get("/list", response_model=list[EventTypeSchema])
-async def get_event_types(db: Session = Depends(get_db_conn)) -> list[EventType]:
-    """Retrieve all event types.
+@router.get("/list", dependencies=[Depends(conditional(EventType))], response_model=Page[EventTypeSchema])
+async def get_event_types(response: Response, page: PageParams = Depends(),
+                          fields: Select = Depends(sparse_fields(EventType, EventTypeSchema)),
+                          db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """Retrieve a page of event types ordered by id.
 
     Args:
+        response: Response carrying headers set by dependencies.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
         db: Database session.
 
     Returns:
-        List of all event type records.
+        A page of event type records and the cursor for the next page.
     """
-    print(f"Fetching all event types from {settings.db_username}")
-    return list(db.exec(select(EventType)).all())
+    logger.debug("Listing event types", extra={"limit": page.limit, "sampled": True})
+    return await paginate_json(db, fields, [EventType.id], page, response)
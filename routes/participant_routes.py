@@ -3,11 +3,24 @@
 This module provides CRUD endpoints for managing event participants.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from config.db import get_db_conn
-from models import Participant
-from schemas.participant import ParticipantSchema, ParticipantSchemaInput
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from config.db import get_db_conn, get_read_db_conn
+from models import Event, Participant
+from schemas.export import ExportFormat, ImportFormat
+from schemas.page import Page
+from schemas.participant import ParticipantImportReport, ParticipantMatch, ParticipantSchema, ParticipantSchemaInput
+from utils.etag import bump_versions, conditional
+from utils.export import export_response
+from utils.fields import json_response, sparse_fields
+from utils.pagination import PageParams, paginate_json
+from utils.participant_import import import_participants
+from utils.participant_search import MATCH_KEY_COLUMNS, search_participants
 
 
 router = APIRouter(
@@ -17,7 +30,7 @@ router = APIRouter(
 )
 
 @router.post("/create", response_model=ParticipantSchema, description="add a participant to an event")
-async def create_participant(input: ParticipantSchemaInput, db: Session = Depends(get_db_conn)) -> Participant:
+async def create_participant(input: ParticipantSchemaInput, db: AsyncSession = Depends(get_db_conn)) -> Participant:
     """Create a new participant record.
 
     Args:
@@ -26,45 +39,83 @@ async def create_participant(input: ParticipantSchemaInput, db: Session = Depend
 
     Returns:
         The created participant with its generated id.
+
+    Raises:
+        HTTPException: 422 error if the event does not exist.
     """
+    if input.event_id is None or (await db.exec(select(Event.id).where(Event.id == input.event_id))).first() is None:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Event not found")
     participant = Participant(**input.model_dump())
     db.add(participant)
-    db.commit()
-    db.refresh(participant)
+    await bump_versions(db, Participant)
+    await db.commit()
+    await db.refresh(participant)
 
     return participant
 
-@router.get("/list/{event_id}", response_model=list[ParticipantSchema], description="Lists the participants for a given event")
-async def list_participants(event_id: int, db: Session = Depends(get_db_conn)) -> list[Participant]:
-    """List all participants for a specific event.
+@router.get("/list/{event_id}", dependencies=[Depends(conditional(Participant))], response_model=Page[ParticipantSchema], description="Lists the participants for a given event")
+async def list_participants(event_id: int, response: Response, page: PageParams = Depends(),
+                            fields: Select = Depends(sparse_fields(Participant, ParticipantSchema)),
+                            db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """List a page of participants for a specific event.
+
+    Rows are serialized straight from the selected columns.
 
     Args:
         event_id: The event ID to filter participants by.
+        response: Response carrying headers set by dependencies.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
+        db: Database session.
+
+    Returns:
+        A page of participants registered for the event.
+    """
+    statement = fields.where(Participant.event_id == event_id)
+    return await paginate_json(db, statement, [Participant.id], page, response)
+
+
+@router.get("/search", dependencies=[Depends(conditional(Participant))], response_model=list[ParticipantMatch],
+            description="Finds participants by a possibly misspelled name or email, best match first")
+async def search(q: str = Query(..., min_length=2, max_length=100, description="Name and/or email to look for"),
+                 event_id: Optional[int] = Query(None, description="Only search this event's participants"),
+                 limit: int = Query(10, ge=1, le=50, description="Maximum number of matches"),
+                 db: AsyncSession = Depends(get_read_db_conn)) -> list[ParticipantMatch]:
+    """Fuzzy-search participants by name or email.
+
+    Args:
+        q: Name and/or email text to look for.
+        event_id: Optional event to restrict the search to.
+        limit: Maximum number of matches to return.
         db: Database session.
 
     Returns:
-        List of participants registered for the event.
+        The best matching participants with their similarity scores.
     """
-    return list(db.exec(select(Participant).where(Participant.event_id == event_id)).all())
+    return await search_participants(db, q, event_id, limit)
 
 
-@router.get("/read/{id}", response_model=ParticipantSchema, description="Returns the details for a given participant id")
-async def get_participant(id: int, db: Session = Depends(get_db_conn)) -> Participant | None:
+@router.get("/read/{id}", dependencies=[Depends(conditional(Participant))], response_model=ParticipantSchema, description="Returns the details for a given participant id")
+async def get_participant(id: int, response: Response,
+                          fields: Select = Depends(sparse_fields(Participant, ParticipantSchema)),
+                          db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
     """Retrieve a single participant by ID.
 
     Args:
         id: The participant ID to retrieve.
+        response: Response carrying headers set by dependencies.
+        fields: Select of the columns requested with ``?fields=``.
         db: Database session.
 
     Returns:
         The requested participant record, or None if not found.
     """
-    participant = db.exec(select(Participant).where(Participant.id == id)).first()
+    participant = (await db.exec(fields.where(Participant.id == id))).first()
 
-    return participant
+    return json_response(participant._asdict() if participant else None, response)
 
 @router.delete("/delete/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_participant(id: int, db: Session = Depends(get_db_conn)) -> None:
+async def delete_participant(id: int, db: AsyncSession = Depends(get_db_conn)) -> None:
     """Delete a participant record.
 
     Args:
@@ -74,26 +125,89 @@ async def delete_participant(id: int, db: Session = Depends(get_db_conn)) -> Non
     Raises:
         HTTPException: 404 error if participant not found.
     """
-    participant = db.exec(select(Participant).where(Participant.id == id)).first()
+    participant = (await db.exec(select(Participant).where(Participant.id == id))).first()
 
     if not participant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Participant record not found")
 
-    db.delete(participant)
-    db.commit()
+    await db.delete(participant)
+    await bump_versions(db, Participant)
+    await db.commit()
     return
 
 
-@router.get("/list", response_model=list[ParticipantSchema], description="Returns all the participants in the database")
-async def list_all_participants(db: Session = Depends(get_db_conn)) -> list[Participant]:
-    """Retrieve all participants from the database.
+@router.get("/list", dependencies=[Depends(conditional(Participant))], response_model=Page[ParticipantSchema], description="Returns a page of the participants in the database")
+async def list_all_participants(response: Response, page: PageParams = Depends(),
+                                fields: Select = Depends(sparse_fields(Participant, ParticipantSchema)),
+                                db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """Retrieve a page of participants ordered by id.
+
+    Rows are serialized straight from the selected columns.
+
+    Args:
+        response: Response carrying headers set by dependencies.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
+        db: Database session.
+
+    Returns:
+        A page of participant records and the cursor for the next page.
+    """
+    return await paginate_json(db, fields, [Participant.id], page, response)
+
+
+@router.get("/export", response_class=StreamingResponse,
+            description="Streams participants as NDJSON, CSV or XLSX, optionally for a single event")
+async def export_participants(format: ExportFormat = ExportFormat.NDJSON, event_id: Optional[int] = None,
+                              db: AsyncSession = Depends(get_read_db_conn)) -> StreamingResponse:
+    """Stream participant records as a file download.
+
+    Rows are read through a server-side cursor, so memory use stays flat
+    regardless of how many participants are exported.
 
     Args:
+        format: Output file format.
+        event_id: Optional event ID to restrict the export to one roster.
         db: Database session.
 
     Returns:
-        List of all participant records.
+        A streaming file download of the participant records.
     """
-    return list(db.exec(select(Participant)).all())
+    columns = [column for column in Participant.__table__.c if column.key not in MATCH_KEY_COLUMNS]
+    statement = select(*columns).order_by(Participant.id)
+    filename = "participants"
+    if event_id is not None:
+        statement = statement.where(Participant.event_id == event_id)
+        filename = f"participants-event-{event_id}"
+    return export_response(db, statement, format, filename)
+
+
+@router.post("/import", response_model=ParticipantImportReport,
+             description="Bulk-creates participants from an uploaded CSV or NDJSON file")
+async def import_participants_file(file: UploadFile, format: Optional[ImportFormat] = None,
+                                   db: AsyncSession = Depends(get_db_conn)) -> ParticipantImportReport:
+    """Create participants in bulk from an uploaded file.
 
+    Rows are validated against ParticipantSchemaInput and inserted in
+    batches; invalid rows are skipped and reported rather than failing
+    the whole upload.
+
+    Args:
+        file: The uploaded CSV (with header row) or NDJSON file.
+        format: File format; inferred from the file name when omitted.
+        db: Database session.
+
+    Returns:
+        Counts of rows received and inserted, plus per-row errors.
+
+    Raises:
+        HTTPException: 400 error if the file format cannot be determined.
+    """
+    if format is None:
+        suffix = (file.filename or "").rsplit(".", 1)[-1].lower()
+        format = ImportFormat.CSV if suffix == "csv" else ImportFormat.NDJSON if suffix in ("ndjson", "jsonl") else None
+    if format is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Could not determine file format; pass ?format=csv or ?format=ndjson")
+    return await import_participants(db, file.file, format)
 
@@ -6,10 +6,12 @@ and retrieving the current authenticated user.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from config.db import get_db_conn
 from schemas.token import Token
-from auth.security import pwd_context, create_access_token, authenticate_user, decode_access_token, get_user_principal
+from schemas.principal_cache import PrincipalCacheStats
+from auth.security import create_access_token, authenticate_user, get_admin_principal, get_user_principal
+from auth.principal_cache import principal_cache
 from fastapi.security import OAuth2PasswordBearer
 from models import User
 from typing import Annotated
@@ -24,7 +26,7 @@ router = APIRouter(
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/security/token")
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(login: str, pwd: str, db: Session = Depends(get_db_conn)) -> Token:
+async def login_for_access_token(login: str, pwd: str, db: AsyncSession = Depends(get_db_conn)) -> Token:
     """Authenticate user and return a JWT access token.
 
     Args:
@@ -61,3 +63,18 @@ async def get_user_me(user: Annotated[User, Depends(get_user_principal)]) -> Use
     """
     return user
 
+
+@router.get("/cache/stats", response_model=PrincipalCacheStats)
+async def get_principal_cache_stats(user: Annotated[User, Depends(get_admin_principal)]) -> PrincipalCacheStats:
+    """Report hit/miss counters for the authenticated-principal cache.
+
+    The counters are process-wide operational data, so only
+    administrators can read them.
+
+    Args:
+        user: The authenticated administrator from the JWT token.
+
+    Returns:
+        Current cache size, capacity and counters.
+    """
+    return principal_cache.stats()
@@ -0,0 +1,128 @@
+"""Participation statistics API routes.
+
+This module answers grouped counts of events and participants from the
+rollup tables maintained by ``utils.rollups``, so each request reads
+one row per group instead of every event and participant.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.db import get_read_db_conn
+from models import Event, EventRollup, Participant, ParticipantRollup
+from schemas.stats import EventStat, ParticipantStat, StatsDimension
+from utils.etag import conditional
+from utils.rollups import UNKNOWN_STATE
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["Statistics"],
+    responses={400: {"description": "Invalid grouping"}},
+)
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _dimensions(group_by: Optional[str], allowed: tuple[StatsDimension, ...]) -> list[StatsDimension]:
+    names = list(dict.fromkeys(name.strip() for name in (group_by or "").split(",") if name.strip()))
+    unknown = [name for name in names if name not in {dimension.value for dimension in allowed}]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unknown group_by dimensions: {', '.join(unknown)}")
+    return [StatsDimension(name) for name in names]
+
+
+def _month_range(statement, month_column, start_month: Optional[str], end_month: Optional[str]):
+    if start_month:
+        statement = statement.where(month_column >= start_month)
+    if end_month:
+        statement = statement.where(month_column <= end_month)
+    return statement
+
+
+@router.get("/events", dependencies=[Depends(conditional(Event))], response_model=list[EventStat],
+            description="Counts events, optionally grouped by event type and month")
+async def event_stats(group_by: Optional[str] = Query(
+                          None, description="Comma-separated subset of: event_type, month"),
+                      event_type_id: Optional[int] = Query(None, description="Only count this event type"),
+                      start_month: Optional[str] = Query(None, pattern=MONTH_PATTERN,
+                                                         description="First month, YYYY-MM"),
+                      end_month: Optional[str] = Query(None, pattern=MONTH_PATTERN,
+                                                       description="Last month, YYYY-MM"),
+                      db: AsyncSession = Depends(get_read_db_conn)) -> list[EventStat]:
+    """Count events per group.
+
+    Args:
+        group_by: Dimensions to group by; none gives a single total.
+        event_type_id: Only count events of this type.
+        start_month: Only count events from this month on.
+        end_month: Only count events up to and including this month.
+        db: Database session.
+
+    Returns:
+        One row per non-empty group, ordered by the grouping dimensions.
+
+    Raises:
+        HTTPException: 400 error if group_by names an unknown dimension.
+    """
+    columns = {StatsDimension.EVENT_TYPE: EventRollup.event_type_id, StatsDimension.MONTH: EventRollup.month}
+    keys = [columns[dimension] for dimension in _dimensions(group_by, tuple(columns))]
+    total = func.coalesce(func.sum(EventRollup.events), 0)
+    statement = select(*keys, total.label("events")).group_by(*keys).order_by(*keys)
+    if keys:
+        statement = statement.having(total > 0)
+    if event_type_id is not None:
+        statement = statement.where(EventRollup.event_type_id == event_type_id)
+    statement = _month_range(statement, EventRollup.month, start_month, end_month)
+    return [EventStat(**row._asdict()) for row in (await db.exec(statement)).all()]
+
+
+@router.get("/participants", dependencies=[Depends(conditional(Event, Participant))],
+            response_model=list[ParticipantStat],
+            description="Counts participants, optionally grouped by event type, event month and state")
+async def participant_stats(group_by: Optional[str] = Query(
+                                None, description="Comma-separated subset of: event_type, month, state"),
+                            event_type_id: Optional[int] = Query(None, description="Only count this event type"),
+                            state: Optional[str] = Query(None, min_length=2, max_length=2,
+                                                         description="Only count participants from this state"),
+                            start_month: Optional[str] = Query(None, pattern=MONTH_PATTERN,
+                                                               description="First event month, YYYY-MM"),
+                            end_month: Optional[str] = Query(None, pattern=MONTH_PATTERN,
+                                                             description="Last event month, YYYY-MM"),
+                            db: AsyncSession = Depends(get_read_db_conn)) -> list[ParticipantStat]:
+    """Count participants per group.
+
+    Args:
+        group_by: Dimensions to group by; none gives a single total.
+        event_type_id: Only count participants of events of this type.
+        state: Only count participants from this state.
+        start_month: Only count participants of events from this month on.
+        end_month: Only count participants of events up to and including
+            this month.
+        db: Database session.
+
+    Returns:
+        One row per non-empty group, ordered by the grouping dimensions.
+
+    Raises:
+        HTTPException: 400 error if group_by names an unknown dimension.
+    """
+    columns = {
+        StatsDimension.EVENT_TYPE: ParticipantRollup.event_type_id,
+        StatsDimension.MONTH: ParticipantRollup.month,
+        StatsDimension.STATE: func.nullif(ParticipantRollup.state, UNKNOWN_STATE).label("state"),
+    }
+    keys = [columns[dimension] for dimension in _dimensions(group_by, tuple(columns))]
+    total = func.coalesce(func.sum(ParticipantRollup.participants), 0)
+    statement = select(*keys, total.label("participants")).group_by(*keys).order_by(*keys)
+    if keys:
+        statement = statement.having(total > 0)
+    if event_type_id is not None:
+        statement = statement.where(ParticipantRollup.event_type_id == event_type_id)
+    if state is not None:
+        statement = statement.where(ParticipantRollup.state == state)
+    statement = _month_range(statement, ParticipantRollup.month, start_month, end_month)
+    return [ParticipantStat(**row._asdict()) for row in (await db.exec(statement)).all()]
@@ -5,13 +5,21 @@ This module provides CRUD endpoints for managing user accounts.
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
-from config.db import get_db_conn
+from sqlalchemy import Select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from config.db import get_db_conn, get_read_db_conn
 from models import User
+from schemas.page import Page
 from schemas.user import UserSchema, UserSchemaInput
-from auth.security import get_password_hash
+from utils.etag import bump_versions, conditional
+from utils.fields import json_response, sparse_fields
+from utils.pagination import PageParams, fetch_column_page
+from auth import security
+from auth.principal_cache import principal_cache
 from schemas.role import Role
 
 router = APIRouter(
@@ -21,7 +29,7 @@ router = APIRouter(
 )
 
 @router.post("/create", response_model=UserSchema, description="Creates a new user record in the database")
-async def create_user(user: UserSchemaInput, db: Session = Depends(get_db_conn)) -> User:
+async def create_user(user: UserSchemaInput, db: AsyncSession = Depends(get_db_conn)) -> User:
     """Create a new user account.
 
     The password is hashed before storage and the user is assigned
@@ -36,23 +44,27 @@ async def create_user(user: UserSchemaInput, db: Session = Depends(get_db_conn))
     """
     new_user = User(**user.model_dump())
     new_user.user_role = Role.MEMBER.value
-    new_user.password = get_password_hash(user.password)
+    new_user.password = await security.hash_password_async(user.password)
     db.add(new_user)
 
     try:
-        db.commit()
-        db.refresh(new_user)
+        await bump_versions(db, User)
+        await db.commit()
+        await db.refresh(new_user)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
     return new_user
 
 
-@router.get("/read/{id}", response_model=UserSchema, description="Reads a user record from the database")
-async def get_user(id: int, db: Session = Depends(get_db_conn)) -> User:
+@router.get("/read/{id}", dependencies=[Depends(conditional(User))], response_model=UserSchema, description="Reads a user record from the database")
+async def get_user(id: int, response: Response, fields: Select = Depends(sparse_fields(User, UserSchema)),
+                   db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
     """Retrieve a user by ID.
 
     Args:
         id: The user ID to retrieve.
+        response: Response carrying headers set by dependencies.
+        fields: Select of the columns requested with ``?fields=``.
         db: Database session.
 
     Returns:
@@ -61,18 +73,21 @@ async def get_user(id: int, db: Session = Depends(get_db_conn)) -> User:
     Raises:
         HTTPException: 404 error if user not found.
     """
-    db_user = db.exec(select(User).where(User.id == id)).first()
+    db_user = (await db.exec(fields.where(User.id == id))).first()
 
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found in database")
-    return db_user
+    return json_response(db_user._asdict(), response)
 
-@router.get("/find/{username}", response_model=UserSchema, description="Finds a user by username")
-async def find_user(username: str, db: Session = Depends(get_db_conn)) -> User:
+@router.get("/find/{username}", dependencies=[Depends(conditional(User))], response_model=UserSchema, description="Finds a user by username")
+async def find_user(username: str, response: Response, fields: Select = Depends(sparse_fields(User, UserSchema)),
+                    db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
     """Find a user by username.
 
     Args:
         username: The username to search for.
+        response: Response carrying headers set by dependencies.
+        fields: Select of the columns requested with ``?fields=``.
         db: Database session.
 
     Returns:
@@ -81,17 +96,20 @@ async def find_user(username: str, db: Session = Depends(get_db_conn)) -> User:
     Raises:
         HTTPException: 404 error if user not found.
     """
-    db_user = db.exec(select(User).where(User.username == username)).first()
+    db_user = (await db.exec(fields.where(User.username == username))).first()
 
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found in database")
-    return db_user
+    return json_response(db_user._asdict(), response)
 
 
 @router.delete("/delete/{id}", status_code=status.HTTP_204_NO_CONTENT, description="deletes a user record")
-async def delete_user(id: int, db: Session = Depends(get_db_conn)) -> None:
+async def delete_user(id: int, db: AsyncSession = Depends(get_db_conn)) -> None:
     """Delete a user account.
 
+    Any cached principal for the user is dropped, so tokens issued to
+    the account stop working immediately.
+
     Args:
         id: The user ID to delete.
         db: Database session.
@@ -99,29 +117,36 @@ async def delete_user(id: int, db: Session = Depends(get_db_conn)) -> None:
     Raises:
         HTTPException: 404 error if user not found.
     """
-    db_user = db.exec(select(User).where(User.id == id)).first()
+    db_user = (await db.exec(select(User).where(User.id == id))).first()
 
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user not found in database")
 
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await bump_versions(db, User)
+    await db.commit()
+    principal_cache.invalidate(db_user.username)
     return
 
-@router.get("/list", response_model=list[UserSchema], description="Lists all users in the database")
-async def list_all_users(db: Session = Depends(get_db_conn)) -> list[User]:
-    """Retrieve all users from the database.
+@router.get("/list", dependencies=[Depends(conditional(User))], response_model=Page[UserSchema], description="Lists the users in the database")
+async def list_all_users(response: Response, page: PageParams = Depends(),
+                         fields: Select = Depends(sparse_fields(User, UserSchema)),
+                         db: AsyncSession = Depends(get_read_db_conn)) -> ORJSONResponse:
+    """Retrieve a page of users ordered by id.
 
     Args:
+        response: Response carrying headers set by dependencies.
+        page: Page size and cursor from the previous page.
+        fields: Select of the columns requested with ``?fields=``.
         db: Database session.
 
     Returns:
-        List of all user records.
+        A page of user records and the cursor for the next page.
 
     Raises:
         HTTPException: 404 error if no users found.
     """
-    users = list(db.exec(select(User)).all())
+    users, next_cursor = await fetch_column_page(db, fields, [User.id], page)
     if not users:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No users found in database")
-    return users
\ No newline at end of file
+    return json_response({"items": users, "next_cursor": next_cursor}, response)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""Pydantic schemas for the dashboard summary.
+
+This module defines the single response the dashboard page loads,
+built by ``utils.dashboard``.
+"""
+
+from datetime import date, datetime
+from pydantic import BaseModel
+from typing import Optional
+
+
+class DashboardTotals(BaseModel):
+    """Overall record counts.
+
+    Attributes:
+        events: Number of events.
+        event_types: Number of event types.
+        participants: Number of participants.
+    """
+
+    events: int
+    event_types: int
+    participants: int
+
+
+class UpcomingEvent(BaseModel):
+    """An event on or after today.
+
+    Attributes:
+        id: Event id.
+        name: Name of the event.
+        event_date: Date when the event occurs.
+        location: Where the event takes place.
+        event_type_id: The event's type.
+        participants: Number of participants registered for the event.
+    """
+
+    id: int
+    name: str
+    event_date: date
+    location: Optional[str] = None
+    event_type_id: Optional[int] = None
+    participants: int
+
+
+class RecentRegistration(BaseModel):
+    """A recently created participant record.
+
+    Attributes:
+        id: Participant id.
+        first_name: Participant's first name.
+        last_name: Participant's last name.
+        event_id: Event the participant registered for.
+        event_name: Name of that event.
+        created_at: When the registration was recorded.
+    """
+
+    id: int
+    first_name: str
+    last_name: str
+    event_id: int
+    event_name: str
+    created_at: datetime
+
+
+class EventTypeSummary(BaseModel):
+    """Counts for one event type.
+
+    Attributes:
+        id: Event type id.
+        name: Name of the event type.
+        events: Number of events of this type.
+        participants: Number of participants in events of this type.
+    """
+
+    id: int
+    name: str
+    events: int
+    participants: int
+
+
+class DashboardSummary(BaseModel):
+    """Everything the dashboard page shows.
+
+    Attributes:
+        generated_at: When the summary was computed. It may be served
+            from cache for a few seconds after that.
+        totals: Overall record counts.
+        upcoming_events: The next events, soonest first.
+        recent_registrations: The newest participant records, newest first.
+        event_types: Counts per event type, by name.
+    """
+
+    generated_at: datetime
+    totals: DashboardTotals
+    upcoming_events: list[UpcomingEvent]
+    recent_registrations: list[RecentRegistration]
+    event_types: list[EventTypeSummary]
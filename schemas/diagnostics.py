@@ -0,0 +1,74 @@
+"""Pydantic schemas for memory diagnostics responses.
+
+This module defines the payloads returned by the admin-only
+tracemalloc endpoints.
+"""
+
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AllocationGrouping(str, Enum):
+    """How traced allocations are grouped in a report.
+
+    Attributes:
+        LINENO: One entry per source line.
+        FILENAME: One entry per source file.
+        TRACEBACK: One entry per captured call stack.
+    """
+
+    LINENO = 'lineno'
+    FILENAME = 'filename'
+    TRACEBACK = 'traceback'
+
+
+class SnapshotInfo(BaseModel):
+    """Summary of a stored tracemalloc snapshot.
+
+    Attributes:
+        name: Name the snapshot is stored under.
+        taken_at: When the snapshot was taken.
+        traced_bytes: Memory traced at the time of the snapshot.
+        peak_bytes: Highest traced memory seen before the snapshot.
+    """
+
+    name: str
+    taken_at: datetime
+    traced_bytes: int
+    peak_bytes: int
+
+
+class AllocationStat(BaseModel):
+    """One line of a top-allocations or snapshot-diff report.
+
+    Attributes:
+        location: Source location or call stack the memory was allocated from.
+        size: Bytes currently allocated from the location.
+        count: Number of live allocations from the location.
+        size_diff: Change in bytes since the base snapshot, for diffs.
+        count_diff: Change in allocation count since the base snapshot, for diffs.
+    """
+
+    location: str
+    size: int
+    count: int
+    size_diff: Optional[int] = None
+    count_diff: Optional[int] = None
+
+
+class RouteAllocationStat(BaseModel):
+    """Net memory growth attributed to a route.
+
+    Attributes:
+        route: The route's path template.
+        requests: Requests measured for the route.
+        net_bytes: Total traced memory growth across those requests.
+        max_net_bytes: Largest growth seen in a single request.
+    """
+
+    route: str
+    requests: int
+    net_bytes: int
+    max_net_bytes: int
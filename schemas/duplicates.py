@@ -0,0 +1,62 @@
+"""Pydantic schemas for the duplicate-participant report.
+
+This module defines the records written by the duplicate detection job
+in ``jobs/duplicates.py``.
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+
+
+class DuplicateMember(BaseModel):
+    """One participant record within a duplicate cluster.
+
+    Attributes:
+        id: Participant id.
+        event_id: Event the record belongs to.
+        first_name: First name as stored.
+        last_name: Last name as stored.
+        email: Email address as stored.
+        phone: Phone number as stored, if any.
+        zip_code: Postal code as stored, if any.
+    """
+
+    id: int
+    event_id: int
+    first_name: str
+    last_name: str
+    email: str
+    phone: Optional[str] = None
+    zip_code: Optional[str] = None
+
+
+class DuplicatePair(BaseModel):
+    """A scored link between two records of a cluster.
+
+    Attributes:
+        left: Participant id of one record.
+        right: Participant id of the other record.
+        score: Match score from 0 to 100.
+    """
+
+    left: int
+    right: int
+    score: float
+
+
+class DuplicateCluster(BaseModel):
+    """A group of records that likely describe the same person.
+
+    Attributes:
+        cluster: Sequential cluster number within the report.
+        size: Number of records in the cluster.
+        min_score: Lowest score among the links that formed the cluster.
+        members: The records, ordered by id.
+        pairs: The links above the threshold that formed the cluster.
+    """
+
+    cluster: int
+    size: int
+    min_score: float
+    members: list[DuplicateMember]
+    pairs: list[DuplicatePair]
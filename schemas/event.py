@@ -5,9 +5,13 @@ for event-related API operations.
 """
 
 from datetime import date
+from enum import Enum
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from schemas.event_type import EventTypeSchema
+from schemas.participant import ParticipantSchema
+
 
 class EventBase(BaseModel):
     """Base schema for event data.
@@ -42,6 +46,36 @@ class EventSchema(EventBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EventExpansion(str, Enum):
+    """Related data that event read endpoints can embed with ``?expand=``.
+
+    Attributes:
+        EVENT_TYPE: The event's type.
+        PARTICIPANTS: The event's participants, by id.
+        PARTICIPANT_COUNT: The number of participants in the event.
+    """
+
+    EVENT_TYPE = 'event_type'
+    PARTICIPANTS = 'participants'
+    PARTICIPANT_COUNT = 'participant_count'
+
+
+class EventExpanded(EventSchema):
+    """Schema for event API responses with related data embedded.
+
+    Each related field is only present when requested with ``?expand=``.
+
+    Attributes:
+        event_type: The event's type.
+        participants: The event's participants.
+        participant_count: Number of participants in the event.
+    """
+
+    event_type: Optional[EventTypeSchema] = None
+    participants: Optional[list[ParticipantSchema]] = None
+    participant_count: Optional[int] = None
+
+
 class EventSchemaInput(EventBase):
     """Schema for event creation and update requests.
 
@@ -49,3 +83,89 @@ class EventSchemaInput(EventBase):
     """
 
     pass
+
+
+class EventBatchCreate(EventBase):
+    """Schema for one event creation within a batch request.
+
+    Attributes:
+        event_type_id: Foreign key to the event type; required, since
+            the batch writes rows without loading them first.
+    """
+
+    event_type_id: int
+
+
+class EventBatchUpdate(EventBatchCreate):
+    """Schema for one event update within a batch request.
+
+    Attributes:
+        id: Identifier of the event to update.
+    """
+
+    id: int
+
+
+class EventBatchRequest(BaseModel):
+    """Schema for a batch of event writes applied in one transaction.
+
+    Attributes:
+        create: Events to create.
+        update: Events to update, identified by id.
+        delete: Ids of events to delete.
+    """
+
+    create: list[EventBatchCreate] = []
+    update: list[EventBatchUpdate] = []
+    delete: list[int] = []
+
+
+class BatchStatus(str, Enum):
+    """Outcome of a single item in a batch request.
+
+    Attributes:
+        CREATED: The event was created.
+        UPDATED: The event was updated.
+        DELETED: The event was deleted.
+        NOT_FOUND: No event exists with the given id.
+        INVALID: The item was rejected; see the result's error.
+    """
+
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    NOT_FOUND = 'not_found'
+    INVALID = 'invalid'
+
+
+class EventBatchResult(BaseModel):
+    """Result for one item of a batch request.
+
+    Attributes:
+        index: Position of the item in its request list.
+        id: Identifier of the affected event.
+        status: Outcome of the operation.
+        event: The event as stored after the operation, if it exists.
+        error: Why the item was rejected, if it was.
+    """
+
+    index: int
+    id: Optional[int] = None
+    status: BatchStatus
+    event: Optional[EventSchema] = None
+    error: Optional[str] = None
+
+
+class EventBatchResponse(BaseModel):
+    """Schema for the per-item results of a batch request.
+
+    Attributes:
+        created: Results for the create list, in request order.
+        updated: Results for the update list, in request order.
+        deleted: Results for the delete list, in request order.
+    """
+
+    created: list[EventBatchResult] = []
+    updated: list[EventBatchResult] = []
+    deleted: list[EventBatchResult] = []
+
@@ -0,0 +1,33 @@
+"""File format enumerations for bulk transfer endpoints.
+
+This module defines the file formats supported by the
+streaming export and bulk import endpoints.
+"""
+
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """File formats supported by the export endpoints.
+
+    Attributes:
+        NDJSON: Newline-delimited JSON, one object per row.
+        CSV: Comma-separated values with a header row.
+        XLSX: Excel workbook with a single sheet.
+    """
+
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+    XLSX = 'xlsx'
+
+
+class ImportFormat(str, Enum):
+    """File formats accepted by the bulk import endpoints.
+
+    Attributes:
+        NDJSON: Newline-delimited JSON, one object per line.
+        CSV: Comma-separated values with a header row.
+    """
+
+    NDJSON = 'ndjson'
+    CSV = 'csv'
@@ -0,0 +1,23 @@
+"""Pydantic schema for paginated list responses.
+
+This module defines the envelope returned by every list endpoint
+that supports keyset (cursor) pagination.
+"""
+
+from pydantic import BaseModel
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Envelope for one page of a cursor-paginated listing.
+
+    Attributes:
+        items: The records on this page.
+        next_cursor: Opaque cursor to pass as ``after`` for the next page,
+            or None when this is the last page.
+    """
+
+    items: list[T]
+    next_cursor: Optional[str] = None
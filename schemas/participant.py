@@ -49,6 +49,27 @@ class ParticipantSchema(ParticipantBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ParticipantMatch(ParticipantSchema):
+    """Schema for one result of a fuzzy participant search.
+
+    Attributes:
+        score: Similarity to the query, from 0 to 100.
+    """
+
+    score: float
+
+
+class ParticipantRegistration(ParticipantSchema):
+    """Schema for the response to adding a participant to an event.
+
+    Attributes:
+        event_participants: Number of participants registered for the
+            event, including this one. Only set when requested.
+    """
+
+    event_participants: Optional[int] = None
+
+
 class ParticipantSchemaInput(ParticipantBase):
     """Schema for participant creation and update requests.
 
@@ -56,3 +77,30 @@ class ParticipantSchemaInput(ParticipantBase):
     """
 
     pass
+
+
+class ParticipantImportError(BaseModel):
+    """A row that was rejected by a bulk import.
+
+    Attributes:
+        row: 1-based line number of the row in the uploaded file.
+        errors: Reasons the row was rejected.
+    """
+
+    row: int
+    errors: list[str]
+
+
+class ParticipantImportReport(BaseModel):
+    """Summary of a bulk participant import.
+
+    Attributes:
+        received: Number of data rows read from the upload.
+        inserted: Number of participants created.
+        errors: Rejected rows with the reason for each.
+    """
+
+    received: int
+    inserted: int
+    errors: list[ParticipantImportError]
+
@@ -0,0 +1,29 @@
+"""Pydantic schema for principal cache statistics.
+
+This module defines the monitoring payload returned by the
+security cache stats endpoint.
+"""
+
+from pydantic import BaseModel
+
+
+class PrincipalCacheStats(BaseModel):
+    """Counters describing principal cache effectiveness.
+
+    Attributes:
+        size: Number of principals currently cached.
+        max_entries: Capacity before least recently used entries are evicted.
+        ttl_seconds: Maximum lifetime of an entry.
+        hits: Lookups answered from the cache.
+        misses: Lookups that fell through to the database.
+        evictions: Entries dropped to make room for new ones.
+        invalidations: Entries dropped because their user changed.
+    """
+
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
@@ -0,0 +1,48 @@
+"""Pydantic schemas for the participation statistics endpoints.
+
+This module defines the grouped counts returned by ``/stats``. Each row
+holds the dimensions the request grouped by; the others are null.
+"""
+
+from enum import Enum
+from pydantic import BaseModel
+from typing import Optional
+
+
+class StatsDimension(str, Enum):
+    """Dimensions the statistics can be grouped by."""
+
+    EVENT_TYPE = "event_type"
+    MONTH = "month"
+    STATE = "state"
+
+
+class EventStat(BaseModel):
+    """Number of events in one group.
+
+    Attributes:
+        event_type_id: Event type of the group, when grouped by event type.
+        month: Event month as ``YYYY-MM``, when grouped by month.
+        events: Number of events in the group.
+    """
+
+    event_type_id: Optional[int] = None
+    month: Optional[str] = None
+    events: int
+
+
+class ParticipantStat(BaseModel):
+    """Number of participants in one group.
+
+    Attributes:
+        event_type_id: Event type of the group, when grouped by event type.
+        month: Event month as ``YYYY-MM``, when grouped by month.
+        state: Participants' state, when grouped by state. Participants
+            who gave no state are grouped under null.
+        participants: Number of participants in the group.
+    """
+
+    event_type_id: Optional[int] = None
+    month: Optional[str] = None
+    state: Optional[str] = None
+    participants: int
@@ -1,24 +1,59 @@
+import os
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlmodel import SQLModel, Session, create_engine
-from sqlalchemy.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 from main import app
-from config.db import get_db_conn
+from config.db import get_db_conn, get_read_db_conn, to_async_url
 from models import EventType, Event, Participant, User
 from auth.security import get_password_hash
+from auth.principal_cache import principal_cache
+from utils.dashboard import summary_cache
+from utils.index_advisor import IndexAdvisor
+
+# Set INDEX_ADVISOR=1 to explain every statement the suite runs and list
+# the ones that scan whole tables at the end of the run.
+index_advisor = IndexAdvisor() if os.environ.get("INDEX_ADVISOR") else None
+index_advisor_report = []
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # Matches the pragma the application's engines set on connect.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if index_advisor_report:
+        terminalreporter.section("index advisor")
+        terminalreporter.write_line(index_advisor_report[0])
 
 
 @pytest.fixture(scope="session")
-def test_db():
+def test_db(tmp_path_factory):
+    # A file-backed database lets the synchronous fixtures below and the
+    # application's async sessions see the same data.
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
     engine = create_engine(
-        "sqlite://",
+        f"sqlite:///{db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
+    event.listen(engine, "connect", _enable_foreign_keys)
     SQLModel.metadata.create_all(engine)
+    if index_advisor:
+        index_advisor.attach(engine)
     yield engine
+    if index_advisor:
+        index_advisor.detach()
+        with engine.connect() as conn:
+            index_advisor_report.append(index_advisor.format_report(index_advisor.analyze(conn)))
     SQLModel.metadata.drop_all(engine)
     engine.dispose()
 
@@ -31,11 +66,25 @@ def db_session(test_db):
 
 
 @pytest_asyncio.fixture()
-async def client(db_session):
-    def _override():
-        yield db_session
+async def async_test_db(test_db):
+    engine = create_async_engine(to_async_url(str(test_db.url)), poolclass=NullPool)
+    event.listen(engine.sync_engine, "connect", _enable_foreign_keys)
+    if index_advisor:
+        index_advisor.attach(engine.sync_engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def client(db_session, async_test_db):
+    async def _override():
+        async with AsyncSession(async_test_db, expire_on_commit=False) as session:
+            yield session
 
     app.dependency_overrides[get_db_conn] = _override
+    app.dependency_overrides[get_read_db_conn] = _override
+    principal_cache.clear()
+    summary_cache.clear()
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
@@ -0,0 +1,29 @@
+import pytest
+
+from utils.blocking import email_key, soundex
+from utils.participant_search import blocking_keys
+
+
+@pytest.mark.parametrize("name, code", [
+    ("Robert", "R163"), ("Rupert", "R163"), ("Ashcraft", "A261"), ("Tymczak", "T522"),
+    ("Pfister", "P236"), ("Smith", "S530"), ("Smyth", "S530"), ("Lee", "L000"), ("O'Brien", "O165"),
+])
+def test_soundex(name, code):
+    assert soundex(name) == code
+
+
+def test_soundex_without_letters():
+    assert soundex("") is None
+    assert soundex("42") is None
+
+
+def test_email_key_normalizes_local_part():
+    assert email_key("J.Smith+news@example.org") == "jsmi"
+    assert email_key("jsmith") == "jsmi"
+    assert email_key("@example.org") is None
+
+
+def test_blocking_keys_from_query():
+    names, emails = blocking_keys("Jon Smyth, j.smith@")
+    assert names == {"J500", "S530", "J530"}
+    assert emails == {"jon", "smyt", "jsmi"}
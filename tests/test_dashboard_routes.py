@@ -0,0 +1,48 @@
+from datetime import date
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func
+from sqlmodel import select
+
+from models import Event, Participant
+from utils.dashboard import summary_cache
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary(client: AsyncClient, db_session, create_event, create_event_type,
+                                 create_participant):
+    et = create_event_type(name="Dashboard Type")
+    today = create_event(name="Dashboard Today", event_date=date.today(), event_type_id=et.id)
+    create_event(name="Dashboard Past", event_date="2020-01-01", event_type_id=et.id)
+    create_participant(first_name="Early", email="early@example.com", event_id=today.id)
+    latest = create_participant(first_name="Latest", email="latest@example.com", event_id=today.id)
+
+    response = await client.get("/dashboard/summary")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["totals"]["events"] == db_session.exec(select(func.count()).select_from(Event)).one()
+    assert data["totals"]["participants"] == db_session.exec(select(func.count()).select_from(Participant)).one()
+    assert {"id": et.id, "name": "Dashboard Type", "events": 2, "participants": 2} in data["event_types"]
+
+    upcoming = {event["id"]: event for event in data["upcoming_events"]}
+    assert upcoming[today.id]["participants"] == 2
+    assert all(event["event_date"] >= date.today().isoformat() for event in data["upcoming_events"])
+    assert data["recent_registrations"][0] == {
+        "id": latest.id, "first_name": "Latest", "last_name": "Doe", "event_id": today.id,
+        "event_name": "Dashboard Today", "created_at": data["recent_registrations"][0]["created_at"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_dashboard_summary_is_cached(client: AsyncClient, create_event):
+    first = (await client.get("/dashboard/summary")).json()
+    create_event(name="Dashboard Cached", event_date=date.today())
+    second = (await client.get("/dashboard/summary")).json()
+    assert second == first
+    assert (summary_cache.hits, summary_cache.misses) == (1, 1)
+
+    summary_cache.clear()
+    third = (await client.get("/dashboard/summary")).json()
+    assert third["totals"]["events"] == first["totals"]["events"] + 1
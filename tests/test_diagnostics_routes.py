@@ -0,0 +1,74 @@
+import tracemalloc
+
+import pytest
+from httpx import AsyncClient
+
+from utils import memory_diagnostics
+
+
+@pytest.fixture()
+def tracing():
+    memory_diagnostics.start()
+    yield
+    memory_diagnostics.stop()
+
+
+async def _auth_headers(client: AsyncClient, create_user, username: str, role: str) -> dict:
+    create_user(username=username, password="diagpass", email=f"{username}@example.com", user_role=role)
+    response = await client.post("/security/token", params={"login": username, "pwd": "diagpass"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_tracemalloc_off_by_default():
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_disabled_returns_404(client: AsyncClient, create_user):
+    headers = await _auth_headers(client, create_user, "diagadmin", "ADMIN")
+    response = await client.get("/diagnostics/memory/top", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_requires_admin(client: AsyncClient, create_user, tracing):
+    headers = await _auth_headers(client, create_user, "diagmember", "MEMBER")
+    response = await client.get("/diagnostics/memory/top", headers=headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_snapshot_diff_and_route_report(client: AsyncClient, create_user, create_event, tracing):
+    headers = await _auth_headers(client, create_user, "diagops", "ADMIN")
+    create_event()
+
+    response = await client.post("/diagnostics/memory/snapshots", params={"name": "before"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "before"
+
+    for _ in range(5):
+        assert (await client.get("/event/list")).status_code == 200
+    await client.post("/diagnostics/memory/snapshots", params={"name": "after"}, headers=headers)
+
+    names = [s["name"] for s in (await client.get("/diagnostics/memory/snapshots", headers=headers)).json()]
+    assert names == ["before", "after"]
+
+    diff = await client.get("/diagnostics/memory/diff", params={"base": "before", "target": "after", "limit": 5},
+                            headers=headers)
+    assert diff.status_code == 200
+    assert len(diff.json()) <= 5
+    assert all("size_diff" in stat for stat in diff.json())
+
+    top = await client.get("/diagnostics/memory/top", params={"group_by": "filename"}, headers=headers)
+    assert top.status_code == 200
+    assert top.json()
+
+    routes = {r["route"]: r for r in (await client.get("/diagnostics/memory/routes", headers=headers)).json()}
+    assert routes["/event/list"]["requests"] == 5
+
+
+@pytest.mark.asyncio
+async def test_diff_unknown_snapshot_returns_404(client: AsyncClient, create_user, tracing):
+    headers = await _auth_headers(client, create_user, "diagmiss", "ADMIN")
+    response = await client.get("/diagnostics/memory/diff", params={"base": "missing"}, headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,75 @@
+import csv
+import json
+from datetime import date
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from jobs.duplicates import (UnionFind, candidate_pairs, find_duplicates, normalize_email, normalize_phone,
+                             write_report)
+from models import Event, EventType, Participant
+
+
+@pytest.fixture()
+def duplicates_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'duplicates.db'}")
+    SQLModel.metadata.create_all(engine)
+    people = [
+        # One person registered three times with variations.
+        ("Katherine", "Szymanski", "kath.sz@example.com", "(217) 555-0142", "62704"),
+        ("Katharine", "Szymanski", "kathsz+spring@example.com", "217-555-0199", "62704"),
+        ("Kate", "Szymanski", "kate.s@work.org", "1 217 555 0199", "62704-1234"),
+        # Two unrelated people sharing the front desk phone and a zip.
+        ("Omar", "Haddad", "omar@example.com", "217-555-0100", "62701"),
+        ("Lena", "Novak", "lena@example.com", "217-555-0100", "62701"),
+    ]
+    with Session(engine) as session:
+        session.add(EventType(id=1, name="Type"))
+        session.add(Event(id=1, name="Spring", event_date=date(2025, 3, 1), event_type_id=1))
+        session.add(Event(id=2, name="Fall", event_date=date(2025, 9, 1), event_type_id=1))
+        session.commit()
+        for number, (first, last, email, phone, zip_code) in enumerate(people):
+            session.add(Participant(first_name=first, last_name=last, email=email, phone=phone, address="1 Main St",
+                                    city="Springfield", state="IL", zip_code=zip_code, event_id=number % 2 + 1))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_normalizers():
+    assert normalize_email(" K.ath+news@Example.com") == "kath@example.com"
+    assert normalize_email("not-an-email") == ""
+    assert normalize_phone("+1 (217) 555-0142") == "2175550142"
+    assert normalize_phone("ext 12") == ""
+
+
+def test_candidate_pairs_dedupes_and_skips_large_blocks():
+    pairs = candidate_pairs([["a", "a", "", "b"], ["x", "x", "x", "x"]], max_block_size=3)
+    assert pairs.tolist() == [[0, 1]]
+
+
+def test_union_find_merges_transitively():
+    sets = UnionFind(5)
+    sets.union(0, 1)
+    sets.union(3, 1)
+    assert sets.find(0) == sets.find(3)
+    assert sets.find(2) != sets.find(0)
+
+
+def test_find_duplicates_clusters_variations(duplicates_db, tmp_path):
+    clusters, stats = find_duplicates(duplicates_db)
+    assert stats["participants"] == 5
+    assert len(clusters) == 1
+    cluster = clusters[0]
+    assert cluster.size == 3
+    assert {member.first_name for member in cluster.members} == {"Katherine", "Katharine", "Kate"}
+    assert cluster.min_score >= 85
+
+    write_report(clusters, str(tmp_path / "report.ndjson"), "ndjson")
+    lines = (tmp_path / "report.ndjson").read_text().splitlines()
+    assert json.loads(lines[0])["size"] == 3
+
+    write_report(clusters, str(tmp_path / "report.csv"), "csv")
+    with open(tmp_path / "report.csv", newline="") as report:
+        rows = list(csv.DictReader(report))
+    assert [row["cluster"] for row in rows] == ["1", "1", "1"]
@@ -1,5 +1,8 @@
+import json
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
 
 @pytest.mark.asyncio
@@ -19,6 +22,15 @@ async def test_create_event(client: AsyncClient, create_event_type):
     assert "id" in data
 
 
+@pytest.mark.asyncio
+async def test_create_event_unknown_type(client: AsyncClient):
+    event = {"name": "Orphan", "event_date": "2025-06-20", "location": "Nowhere"}
+    for event_type_id in (None, 999999):
+        response = await client.post("/event/create", json={**event, "event_type_id": event_type_id})
+        assert response.status_code == 422
+        assert response.text == "Event type not found"
+
+
 @pytest.mark.asyncio
 async def test_get_events_list(client: AsyncClient, create_event):
     create_event(name="Event One")
@@ -50,6 +62,49 @@ async def test_find_events_by_date(client: AsyncClient, create_event):
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_get_events_pagination(client: AsyncClient, create_event):
+    created = [create_event(name=f"Paged {i}").id for i in range(5)]
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["after"] = cursor
+        response = await client.get("/event/list", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(seen)
+    assert set(created) <= set(seen)
+
+
+@pytest.mark.asyncio
+async def test_find_events_by_date_pagination(client: AsyncClient, create_event):
+    create_event(name="Late", event_date="2031-03-20")
+    create_event(name="Early", event_date="2031-03-02")
+    create_event(name="Middle", event_date="2031-03-10")
+    first = await client.get("/event/list/2031-03-01/2031-03-31", params={"limit": 2})
+    assert first.status_code == 200
+    page = first.json()
+    assert [e["name"] for e in page["items"]] == ["Early", "Middle"]
+    second = await client.get("/event/list/2031-03-01/2031-03-31",
+                              params={"limit": 2, "after": page["next_cursor"]})
+    page = second.json()
+    assert [e["name"] for e in page["items"]] == ["Late"]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_events_invalid_cursor(client: AsyncClient):
+    response = await client.get("/event/list", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_update_event(client: AsyncClient, create_event, create_event_type):
     et = create_event_type(name="Updated Type")
@@ -67,8 +122,286 @@ async def test_update_event(client: AsyncClient, create_event, create_event_type
     assert data["location"] == "New Venue"
 
 
+@pytest.mark.asyncio
+async def test_update_event_unknown_type(client: AsyncClient, create_event):
+    ev = create_event(name="Typed Event")
+    event = {"name": "Retyped", "event_date": "2025-07-01", "location": "Main Hall"}
+    for event_type_id in (None, 999999):
+        response = await client.put(f"/event/update/{ev.id}", json={**event, "event_type_id": event_type_id})
+        assert response.status_code == 422
+    assert (await client.get(f"/event/read/{ev.id}")).json()["event_type_id"] == ev.event_type_id
+
+
 @pytest.mark.asyncio
 async def test_delete_event(client: AsyncClient, create_event):
     ev = create_event(name="To Delete")
     response = await client.delete(f"/event/delete/{ev.id}")
     assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_delete_event_cascades_in_database(client: AsyncClient, async_test_db, create_event,
+                                                 create_participant):
+    ev = create_event(name="Large Roster")
+    for n in range(25):
+        create_participant(email=f"cascade{n}@example.com", event_id=ev.id)
+    statements = []
+    event.listen(async_test_db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert (await client.delete(f"/event/delete/{ev.id}")).status_code == 204
+    # The roster is neither loaded nor deleted row by row.
+    assert not [s for s in statements if 'FROM "Participant"' in s and "count(" not in s]
+    assert (await client.get(f"/participant/list/{ev.id}")).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_export_events(client: AsyncClient, create_event):
+    ev = create_event(name="Exported Event")
+    response = await client.get("/event/export")
+    assert response.status_code == 200
+    assert 'filename="events.ndjson"' in response.headers["content-disposition"]
+    names = {json.loads(line)["name"] for line in response.text.splitlines()}
+    assert ev.name in names
+
+
+@pytest.mark.asyncio
+async def test_batch_events(client: AsyncClient, create_event, create_event_type, create_participant):
+    et = create_event_type(name="Batch Type")
+    to_update = create_event(name="Batch Old", event_type_id=et.id)
+    to_delete = create_event(name="Batch Doomed", event_type_id=et.id)
+    create_participant(email="doomed@example.com", event_id=to_delete.id)
+    new_event = {"name": "Batch New", "event_date": "2026-01-10", "location": "Annex", "event_type_id": et.id}
+    response = await client.post("/event/batch", json={
+        "create": [new_event, {**new_event, "name": "Batch New 2"}],
+        "update": [
+            {"id": to_update.id, "name": "Batch Renamed", "event_date": "2026-02-01",
+             "location": "Hall B", "event_type_id": et.id},
+            {"id": 999999, "name": "Ghost", "event_date": "2026-02-01", "location": "Nowhere", "event_type_id": et.id},
+        ],
+        "delete": [to_delete.id, 999998],
+    })
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [r["status"] for r in data["created"]] == ["created", "created"]
+    assert [r["event"]["name"] for r in data["created"]] == ["Batch New", "Batch New 2"]
+    assert [r["status"] for r in data["updated"]] == ["updated", "not_found"]
+    assert data["updated"][0]["event"]["name"] == "Batch Renamed"
+    assert [r["status"] for r in data["deleted"]] == ["deleted", "not_found"]
+
+    assert (await client.get(f"/event/read/{data['created'][0]['id']}")).status_code == 200
+    assert (await client.get(f"/event/read/{to_update.id}")).json()["location"] == "Hall B"
+    assert (await client.get(f"/event/read/{to_delete.id}")).status_code == 404
+    roster = (await client.get(f"/participant/list/{to_delete.id}")).json()
+    assert roster["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_events_unknown_event_type(client: AsyncClient, create_event, create_event_type):
+    et = create_event_type(name="Batch Known Type")
+    ev = create_event(name="Batch Keep", event_type_id=et.id)
+    good = {"name": "Batch Good", "event_date": "2026-03-01", "location": "Annex", "event_type_id": et.id}
+    bad = {**good, "name": "Batch Bad", "event_type_id": 999999}
+    response = await client.post("/event/batch", json={
+        "create": [bad, good],
+        "update": [{**bad, "id": ev.id}, {**good, "id": 999998}, {**good, "id": ev.id, "name": "Batch Kept"}],
+    })
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [r["status"] for r in data["created"]] == ["invalid", "created"]
+    assert data["created"][0]["error"] == "event_type_id: event type 999999 does not exist"
+    assert data["created"][1]["event"]["name"] == "Batch Good"
+    assert [r["status"] for r in data["updated"]] == ["invalid", "not_found", "updated"]
+    assert data["updated"][0]["id"] == ev.id
+    assert (await client.get(f"/event/read/{ev.id}")).json()["name"] == "Batch Kept"
+
+    response = await client.post("/event/batch", json={"create": [{**good, "event_type_id": None}]})
+    assert response.status_code == 400
+
+
+
+@pytest.mark.asyncio
+async def test_event_list_etag_not_modified(client: AsyncClient, create_event):
+    ev = create_event(name="Cached Event")
+    first = await client.get("/event/list")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    cached = await client.get("/event/list", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    other_page = await client.get("/event/list", params={"limit": 1})
+    assert other_page.headers["etag"] != etag
+
+    updated = await client.put(f"/event/update/{ev.id}", json={
+        "name": "Renamed Event", "event_date": "2025-06-15", "location": "Main Hall",
+        "event_type_id": ev.event_type_id,
+    })
+    assert updated.status_code == 200
+    changed = await client.get("/event/list", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_event_read_etag_weak_and_wildcard_match(client: AsyncClient, create_event):
+    ev = create_event(name="Tagged Event")
+    etag = (await client.get(f"/event/read/{ev.id}")).headers["etag"]
+    assert (await client.get(f"/event/read/{ev.id}", headers={"If-None-Match": f'"other", W/{etag}'})).status_code == 304
+    assert (await client.get(f"/event/read/{ev.id}", headers={"If-None-Match": "*"})).status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_participant_writes_invalidate_participant_etags(client: AsyncClient, create_event):
+    ev = create_event(name="Roster Event")
+    roster = f"/participant/list/{ev.id}"
+    etag = (await client.get(roster)).headers["etag"]
+    event_etag = (await client.get("/event/list")).headers["etag"]
+
+    added = await client.post(f"/event/participant/add/{ev.id}", json={
+        "first_name": "New", "last_name": "Person", "email": "new@example.com", "phone": "555-0100",
+        "address": "1 Main St", "city": "Springfield", "state": "IL", "zip_code": "62704",
+    })
+    assert added.status_code == 200
+    assert (await client.get(roster, headers={"If-None-Match": etag})).status_code == 200
+    # Adding a participant leaves the event list untouched.
+    assert (await client.get("/event/list", headers={"If-None-Match": event_etag})).status_code == 304
+
+    etag = (await client.get(roster)).headers["etag"]
+    assert (await client.post("/event/batch", json={"delete": [ev.id]})).status_code == 200
+    assert (await client.get(roster, headers={"If-None-Match": etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_add_participant_to_event(client: AsyncClient, async_test_db, create_event, create_participant):
+    ev = create_event(name="Growing Event")
+    body = {"first_name": "Robert", "last_name": "Smith", "email": "rob.smith@example.com", "phone": "555-0100",
+            "address": "1 Main St", "city": "Springfield", "state": "IL", "zip_code": "62704", "event_id": 999999}
+    statements = []
+    event.listen(async_test_db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    first = await client.post(f"/event/participant/add/{ev.id}", json=body)
+    assert first.status_code == 200
+    assert first.json() == {**body, "id": first.json()["id"], "event_id": ev.id, "event_participants": None}
+    cost = len(statements)
+
+    for n in range(20):
+        create_participant(email=f"roster{n}@example.com", event_id=ev.id)
+    statements.clear()
+    response = await client.post(f"/event/participant/add/{ev.id}", params={"include_count": True}, json=body)
+    assert response.json()["event_participants"] == 22
+    # One extra statement for the count; the roster is never loaded.
+    assert len(statements) == cost + 1
+
+    matches = (await client.get("/participant/search", params={"q": "Robrt Smith", "event_id": ev.id})).json()
+    assert first.json()["id"] in {match["id"] for match in matches}
+
+    missing = await client.post("/event/participant/add/999999", json=body)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_event_sparse_fields(client: AsyncClient, create_event):
+    ev = create_event(name="Sparse Event")
+    response = await client.get(f"/event/read/{ev.id}", params={"fields": "name, id,name"})
+    assert response.status_code == 200
+    assert response.json() == {"name": "Sparse Event", "id": ev.id}
+    assert response.headers["etag"] != (await client.get(f"/event/read/{ev.id}")).headers["etag"]
+
+    page = (await client.get("/event/list", params={"fields": "event_date"})).json()
+    assert page["items"] and all(item.keys() == {"event_date"} for item in page["items"])
+
+    response = await client.get("/event/list", params={"fields": "name,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.text
+
+
+@pytest.mark.asyncio
+async def test_event_sparse_fields_page_without_sort_keys(client: AsyncClient, create_event):
+    for name, day in [("First", "2025-01-01"), ("Second", "2025-01-02"), ("Third", "2025-01-03")]:
+        create_event(name=name, event_date=day)
+    names, cursor = [], None
+    while True:
+        params = {"fields": "name", "limit": 2, **({"after": cursor} if cursor else {})}
+        page = (await client.get("/event/list/2025-01-01/2025-01-31", params=params)).json()
+        names += [item["name"] for item in page["items"]]
+        assert all(list(item) == ["name"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert names == ["First", "Second", "Third"]
+
+
+@pytest.mark.asyncio
+async def test_search_events_ranked_and_paged(client: AsyncClient, create_event):
+    in_description = create_event(name="Harvest Dinner", description="zephyrine potluck")
+    in_name = create_event(name="Zephyrine Gala", description="formal")
+    create_event(name="Unrelated", description="nothing")
+
+    page = (await client.get("/event/search", params={"q": "zephyrine", "limit": 1})).json()
+    assert [item["id"] for item in page["items"]] == [in_name.id]
+    rest = (await client.get("/event/search", params={"q": "zephyr", "after": page["next_cursor"]})).json()
+    assert [item["id"] for item in rest["items"]] == [in_description.id]
+    assert rest["next_cursor"] is None
+
+    response = await client.get("/event/search", params={"q": '(gala" zephyrine*', "fields": "name"})
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"name": "Zephyrine Gala"}]
+
+
+@pytest.mark.asyncio
+async def test_search_follows_updates_and_deletes(client: AsyncClient, create_event):
+    ev = create_event(name="Quokka Meetup", location="Library")
+    assert len((await client.get("/event/search", params={"q": "quokka"})).json()["items"]) == 1
+
+    response = await client.put(f"/event/update/{ev.id}", json={
+        "name": "Wombat Meetup", "event_date": "2025-06-15", "location": "Library",
+        "event_type_id": ev.event_type_id})
+    assert response.status_code == 200
+    assert (await client.get("/event/search", params={"q": "quokka"})).json()["items"] == []
+    assert len((await client.get("/event/search", params={"q": "wombat library"})).json()["items"]) == 1
+
+    assert (await client.delete(f"/event/delete/{ev.id}")).status_code == 204
+    assert (await client.get("/event/search", params={"q": "wombat"})).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_event_expand(client: AsyncClient, async_test_db, create_event_type, create_event, create_participant):
+    et = create_event_type(name="Expanded Type")
+    events = [create_event(name=f"Expanded {n}", event_date="2040-01-01", event_type_id=et.id) for n in range(3)]
+    for n in range(4):
+        create_participant(email=f"expand{n}@example.com", event_id=events[0].id)
+    statements = []
+    event.listen(async_test_db.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    params = {"expand": "event_type,participants,participant_count", "fields": "name"}
+    response = await client.get("/event/list/2040-01-01/2040-01-01", params=params)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [ev.id for ev in events]
+    assert items[0]["name"] == "Expanded 0"
+    assert items[0]["event_type"] == {"id": et.id, "name": "Expanded Type", "description": et.description}
+    assert [p["email"] for p in items[0]["participants"]] == [f"expand{n}@example.com" for n in range(4)]
+    assert [item["participant_count"] for item in items] == [4, 0, 0]
+    # The ETag check, the page, its events' keys, and one IN query per relationship.
+    assert len(statements) == 5
+
+    plain = await client.get(f"/event/read/{events[1].id}")
+    expanded = await client.get(f"/event/read/{events[1].id}", params={"expand": "participant_count"})
+    assert expanded.json() == {**plain.json(), "participant_count": 0}
+    await client.post(f"/event/participant/add/{events[1].id}", json={
+        "first_name": "Late", "last_name": "Comer", "email": "late@example.com", "phone": "555-0100",
+        "address": "1 Main St", "city": "Springfield", "state": "IL", "zip_code": "62704", "event_id": events[1].id})
+    # Participant writes change the expanded representation only.
+    assert (await client.get(f"/event/read/{events[1].id}")).headers["etag"] == plain.headers["etag"]
+    response = await client.get(f"/event/read/{events[1].id}", params={"expand": "participant_count"},
+                                headers={"If-None-Match": expanded.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()["participant_count"] == 1
+
+    response = await client.get("/event/list", params={"expand": "participant_count,organizer"})
+    assert response.status_code == 400
+    assert "Unknown expand values: organizer" in response.text
@@ -32,8 +32,8 @@ async def test_get_event_types_list(client: AsyncClient, create_event_type):
     response = await client.get("/type/list")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 2
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) >= 2
 
 
 @pytest.mark.asyncio
@@ -54,3 +54,12 @@ async def test_delete_event_type(client: AsyncClient, create_event_type):
     et = create_event_type(name="To Delete")
     response = await client.delete(f"/type/delete/{et.id}")
     assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_delete_event_type_in_use(client: AsyncClient, create_event_type, create_event):
+    et = create_event_type(name="In Use")
+    create_event(event_type_id=et.id)
+    response = await client.delete(f"/type/delete/{et.id}")
+    assert response.status_code == 409
+    assert (await client.get(f"/type/read/{et.id}")).status_code == 200
@@ -0,0 +1,85 @@
+import csv
+import os
+import resource
+import tracemalloc
+from datetime import date, datetime, timezone
+
+import orjson
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.db import to_async_url
+from models import Event, EventType, Participant
+from schemas.export import ExportFormat
+from utils.export import export_rows
+
+# Set EXPORT_TEST_ROWS=1000000 to run the export at production scale.
+EXPORT_TEST_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", "50000"))
+PEAK_ALLOCATION_LIMIT = 16 * 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def seeded_url(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('export') / 'export.db'}"
+    engine = create_engine(url)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(EventType), [{"id": 1, "name": "Bulk", "created_at": now}])
+        conn.execute(insert(Event), [{"id": 1, "name": "Bulk Event", "event_date": date(2025, 1, 1),
+                                      "event_type_id": 1, "created_at": now}])
+        for start in range(0, EXPORT_TEST_ROWS, 50000):
+            conn.execute(insert(Participant), [
+                {"first_name": f"First{i}", "last_name": f"Last{i}", "email": f"p{i}@example.com",
+                 "phone": "555-0100", "address": "1 Main St", "city": "Springfield", "state": "IL",
+                 "zip_code": "62704", "created_at": now, "event_id": 1}
+                for i in range(start, min(start + 50000, EXPORT_TEST_ROWS))
+            ])
+    engine.dispose()
+    return url
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", [ExportFormat.NDJSON, ExportFormat.CSV, ExportFormat.XLSX])
+async def test_export_memory_is_bounded(seeded_url, export_format, tmp_path):
+    engine = create_async_engine(to_async_url(seeded_url))
+    statement = select(Participant.__table__).order_by(Participant.id)
+    output_path = tmp_path / f"export.{export_format.value}"
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    was_tracing = tracemalloc.is_tracing()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        with open(output_path, "wb") as output:
+            async with AsyncSession(engine) as db:
+                async for chunk in export_rows(db, statement, export_format):
+                    output.write(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+        await engine.dispose()
+    rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    # Parse the output rather than count newlines, so a truncated or
+    # corrupt file fails too.
+    if export_format is ExportFormat.XLSX:
+        workbook = load_workbook(output_path, read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        workbook.close()
+    elif export_format is ExportFormat.CSV:
+        with open(output_path, newline="") as output:
+            rows = list(csv.reader(output))
+    else:
+        with open(output_path, "rb") as output:
+            rows = [orjson.loads(line) for line in output]
+
+    header_rows = 0 if export_format is ExportFormat.NDJSON else 1
+    assert len(rows) == EXPORT_TEST_ROWS + header_rows
+    assert peak - baseline < PEAK_ALLOCATION_LIMIT
+    assert rss_growth_kb * 1024 < 4 * PEAK_ALLOCATION_LIMIT
@@ -0,0 +1,43 @@
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+from sqlmodel import SQLModel, Session
+
+from models import Event, Participant
+from utils.index_advisor import IndexAdvisor
+
+
+def _explain(statements):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    advisor = IndexAdvisor()
+    advisor.attach(engine)
+    with Session(engine) as session:
+        for statement in statements:
+            session.exec(statement).all()
+    advisor.detach()
+    with engine.connect() as conn:
+        findings = advisor.analyze(conn)
+    engine.dispose()
+    return advisor, findings
+
+
+def test_hot_query_shapes_use_indexes():
+    advisor, findings = _explain([
+        select(Participant).where(Participant.event_id == 1).order_by(Participant.id).limit(50),
+        select(Participant.id).where(Participant.event_id == 1, Participant.email == "a@example.com"),
+        select(Event).where(Event.event_date.between(date(2025, 1, 1), date(2025, 12, 31)))
+        .order_by(Event.event_date, Event.id).limit(50),
+        # The foreign key check run when an event type is deleted.
+        select(Event.id).where(Event.event_type_id == 1).limit(1),
+    ])
+    assert advisor.statement_count == 4
+    assert findings == []
+
+
+def test_full_scan_is_flagged_once_per_statement():
+    statement = select(func.count()).select_from(Participant).where(Participant.phone == "555-1234")
+    advisor, findings = _explain([statement, statement])
+    assert advisor.statement_count == 1
+    assert [(finding.table, finding.runs) for finding in findings] == [("Participant", 2)]
+    assert "SCAN Participant (2 runs)" in advisor.format_report(findings)
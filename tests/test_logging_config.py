@@ -0,0 +1,63 @@
+import json
+import logging
+
+import pytest
+from httpx import AsyncClient
+
+from config.logging_config import configure_logging, parse_log_level, shutdown_logging
+
+
+@pytest.fixture()
+def log_lines(capsys):
+    def _read():
+        shutdown_logging()
+        return [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith("{")]
+    yield _read
+    shutdown_logging()
+
+
+def test_parse_log_level_with_module_overrides():
+    assert parse_log_level("info") == ("INFO", {})
+    assert parse_log_level("info, main.security=debug,main.routes=Warning") == (
+        "INFO", {"main.security": "DEBUG", "main.routes": "WARNING"})
+
+
+@pytest.mark.parametrize("spec", ["loud", "info,main.security", "info,main.security=loud"])
+def test_parse_log_level_rejects_bad_values(spec):
+    with pytest.raises(ValueError):
+        parse_log_level(spec)
+
+
+def test_records_are_written_as_json_with_extras(log_lines):
+    configure_logging("warning,main.jobs=debug")
+    logging.getLogger("main.jobs").debug("job finished", extra={"rows": 3})
+    logging.getLogger("main.other").debug("filtered by base level")
+
+    lines = log_lines()
+    assert len(lines) == 1
+    assert lines[0]["logger"] == "main.jobs"
+    assert lines[0]["msg"] == "job finished"
+    assert lines[0]["rows"] == 3
+
+
+def test_sampled_debug_records_are_dropped_at_zero_rate(log_lines):
+    configure_logging("debug", sample_rate=0)
+    logger = logging.getLogger("main.hot")
+    for _ in range(20):
+        logger.debug("hot path", extra={"sampled": True})
+    logger.debug("kept")
+    logger.info("also kept", extra={"sampled": True})
+
+    assert [line["msg"] for line in log_lines()] == ["kept", "also kept"]
+
+
+@pytest.mark.asyncio
+async def test_auth_flow_never_logs_tokens(client: AsyncClient, create_user, log_lines):
+    configure_logging("debug")
+    create_user(username="loguser", password="logpass", email="log@example.com")
+    token = (await client.post("/security/token", params={"login": "loguser", "pwd": "logpass"})).json()["access_token"]
+    assert (await client.get("/security/users/me", headers={"Authorization": f"Bearer {token}"})).status_code == 200
+
+    lines = log_lines()
+    assert {"Issued access token", "Authenticated request"} <= {line["msg"] for line in lines}
+    assert all(token not in json.dumps(line) for line in lines)
@@ -1,5 +1,10 @@
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
+from openpyxl import load_workbook
 
 
 @pytest.mark.asyncio
@@ -23,6 +28,16 @@ async def test_create_participant(client: AsyncClient, create_event):
     assert "id" in data
 
 
+@pytest.mark.asyncio
+async def test_create_participant_unknown_event(client: AsyncClient):
+    participant = {"first_name": "Lost", "last_name": "Person", "email": "lost@example.com", "phone": "555-0000",
+                   "address": "1 Nowhere Rd", "city": "Chicago", "state": "IL", "zip_code": "60601"}
+    for event_id in (None, 999999):
+        response = await client.post("/participant/create", json={**participant, "event_id": event_id})
+        assert response.status_code == 422
+        assert response.text == "Event not found"
+
+
 @pytest.mark.asyncio
 async def test_list_participants_by_event(client: AsyncClient, create_participant, create_event):
     ev = create_event(name="Participant Event")
@@ -31,8 +46,8 @@ async def test_list_participants_by_event(client: AsyncClient, create_participan
     response = await client.get(f"/participant/list/{ev.id}")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 1
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) >= 1
 
 
 @pytest.mark.asyncio
@@ -52,8 +67,162 @@ async def test_list_all_participants(client: AsyncClient, create_participant):
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_list_participants_matches_schema_and_pages(client: AsyncClient, create_participant, create_event):
+    ev = create_event(name="Fast Path Event")
+    first = create_participant(first_name="Fay", email="fay@example.com", event_id=ev.id)
+    create_participant(first_name="Gus", email="gus@example.com", event_id=ev.id)
+
+    response = await client.get(f"/participant/list/{ev.id}", params={"limit": 1})
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    page = response.json()
+    assert page["items"] == [(await client.get(f"/participant/read/{first.id}")).json()]
+
+    cached = await client.get(f"/participant/list/{ev.id}", params={"limit": 1},
+                              headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    second = (await client.get(f"/participant/list/{ev.id}",
+                               params={"limit": 1, "after": page["next_cursor"]})).json()
+    assert [p["first_name"] for p in second["items"]] == ["Gus"]
+    assert second["next_cursor"] is None
+
+
 @pytest.mark.asyncio
 async def test_delete_participant(client: AsyncClient, create_participant):
     p = create_participant(first_name="Eve", email="eve@example.com")
     response = await client.delete(f"/participant/delete/{p.id}")
     assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_export_participants_ndjson(client: AsyncClient, create_participant, create_event):
+    ev = create_event(name="Export Event")
+    create_participant(first_name="Fay", email="fay@example.com", event_id=ev.id)
+    create_participant(first_name="Gus", email="gus@example.com", event_id=ev.id)
+    response = await client.get("/participant/export", params={"event_id": ev.id})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["first_name"] for r in rows] == ["Fay", "Gus"]
+    assert all(r["event_id"] == ev.id for r in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_participants_csv(client: AsyncClient, create_participant, create_event):
+    ev = create_event(name="CSV Event")
+    create_participant(first_name="Hal", email="hal@example.com", event_id=ev.id)
+    response = await client.get("/participant/export", params={"event_id": ev.id, "format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["email"] == "hal@example.com"
+
+
+@pytest.mark.asyncio
+async def test_export_participants_xlsx(client: AsyncClient, create_participant, create_event):
+    ev = create_event(name="XLSX Event")
+    create_participant(first_name="Ivy", email="ivy@example.com", event_id=ev.id)
+    response = await client.get("/participant/export", params={"event_id": ev.id, "format": "xlsx"})
+    assert response.status_code == 200
+    sheet = load_workbook(io.BytesIO(response.content), read_only=True).active
+    header, *rows = list(sheet.values)
+    assert "first_name" in header
+    assert rows[0][header.index("first_name")] == "Ivy"
+
+
+@pytest.mark.asyncio
+async def test_import_participants_csv(client: AsyncClient, create_event):
+    ev = create_event(name="Import Event")
+    header = "first_name,last_name,email,phone,address,city,state,zip_code,event_id"
+    body = "\n".join([
+        header,
+        f"Kim,Lee,kim@example.com,555-1111,1 A St,Peoria,IL,61602,{ev.id}",
+        "Lou,Ray,lou@example.com,555-2222,2 B St,Peoria,IL,61602,abc",
+        "Max,Fox,max@example.com,555-3333,3 C St,Peoria,IL,61602,999999",
+        f"Ned,Orr,ned@example.com,555-4444,4 D St,Peoria,IL,61602,{ev.id}",
+    ])
+    response = await client.post("/participant/import",
+                                 files={"file": ("signups.csv", body.encode(), "text/csv")})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["received"] == 4
+    assert report["inserted"] == 2
+    assert [e["row"] for e in report["errors"]] == [3, 4]
+    assert report["errors"][0]["errors"][0].startswith("event_id")
+    assert "does not exist" in report["errors"][1]["errors"][0]
+
+    roster = (await client.get(f"/participant/list/{ev.id}")).json()["items"]
+    assert {p["first_name"] for p in roster} == {"Kim", "Ned"}
+
+
+@pytest.mark.asyncio
+async def test_import_participants_csv_bad_rows(client: AsyncClient, create_event):
+    ev = create_event(name="Messy Import Event")
+    header = b"first_name,last_name,email,phone,address,city,state,zip_code,event_id"
+    body = b"\n".join([
+        b"\xef\xbb\xbf" + header,
+        b"Ola,Ash,ola@example.com,555-1111,1 A St,Peoria,IL,61602,%d" % ev.id,
+        b"Ren\xe9,Bay,rene@example.com,555-2222,2 B St,Peoria,IL,61602,%d" % ev.id,
+        b"Sam,Cox,sam@example.com,555-3333,3 C St,Peoria,IL,61602,%d,extra,cells" % ev.id,
+        b'Tia,Dee,tia@example.com,555-4444,"4 D St\nApt 5",Peoria,IL,61602,%d' % ev.id,
+    ])
+    response = await client.post("/participant/import", files={"file": ("signups.csv", body, "text/csv")})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["received"] == 4
+    assert report["inserted"] == 2
+    assert report["errors"] == [
+        {"row": 3, "errors": ["row is not valid UTF-8"]},
+        {"row": 4, "errors": ["row has 2 more cells than the header"]},
+    ]
+
+    roster = (await client.get(f"/participant/list/{ev.id}")).json()["items"]
+    assert {p["first_name"] for p in roster} == {"Ola", "Tia"}
+
+
+@pytest.mark.asyncio
+async def test_import_participants_ndjson(client: AsyncClient, create_event):
+    ev = create_event(name="NDJSON Import Event")
+    good = json.dumps({"first_name": "Oda", "last_name": "Poe", "email": "oda@example.com",
+                       "phone": "555-5555", "address": "5 E St", "city": "Joliet", "state": "IL",
+                       "zip_code": "60431", "event_id": ev.id})
+    missing = json.dumps({"first_name": "Pat", "event_id": ev.id})
+    body = "\n".join([good, "{not json", missing, ""])
+    response = await client.post("/participant/import", params={"format": "ndjson"},
+                                 files={"file": ("signups.txt", body.encode())})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["received"] == 3
+    assert report["inserted"] == 1
+    assert [e["row"] for e in report["errors"]] == [2, 3]
+    assert any(msg.startswith("last_name") for msg in report["errors"][1]["errors"])
+
+
+@pytest.mark.asyncio
+async def test_import_participants_unknown_format(client: AsyncClient):
+    response = await client.post("/participant/import", files={"file": ("signups.txt", b"")})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_participants_tolerates_misspelling(client: AsyncClient, create_participant, create_event):
+    ev = create_event(name="Front Desk Event")
+    target = create_participant(first_name="Katherine", last_name="Szymanski", email="kath.sz@example.com",
+                                event_id=ev.id)
+    create_participant(first_name="Kevin", last_name="Brown", email="kb@example.com", event_id=ev.id)
+    other = create_event(name="Other Event")
+    create_participant(first_name="Katherine", last_name="Szymanski", email="k2@example.com", event_id=other.id)
+
+    response = await client.get("/participant/search", params={"q": "Kathrine Szymansky", "event_id": ev.id})
+    assert response.status_code == 200
+    matches = response.json()
+    assert [match["id"] for match in matches] == [target.id]
+    assert matches[0]["score"] >= 80
+    assert "last_name_key" not in matches[0]
+
+    by_email = (await client.get("/participant/search", params={"q": "kathsz@example.com"})).json()
+    assert by_email[0]["id"] == target.id
+
+    assert (await client.get("/participant/search", params={"q": "Zzyzx"})).json() == []
@@ -1,5 +1,15 @@
+import os
+import signal
+
 import pytest
 from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from auth.hashing import get_password_hash
+from auth.principal_cache import PrincipalCache
+from auth import security
+from auth.security import create_access_token, decode_access_token, hash_password_async, verify_password_async
+from config.app_config import settings
 
 
 @pytest.mark.asyncio
@@ -45,3 +55,104 @@ async def test_get_current_user(client: AsyncClient, create_user):
     assert response.status_code == 200
     data = response.json()
     assert data["username"] == "meuser"
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_round_trip():
+    hashed = await hash_password_async("pooled-secret")
+    assert await verify_password_async("pooled-secret", hashed)
+    assert not await verify_password_async("wrong", get_password_hash("pooled-secret"))
+
+
+@pytest.mark.asyncio
+async def test_login_rejected_when_hash_pool_saturated(client: AsyncClient, create_user, monkeypatch):
+    create_user(username="busyuser", password="busypass", email="busy@example.com")
+    monkeypatch.setattr(settings, "password_hash_max_pending", 0)
+    response = await client.post("/security/token", params={
+        "login": "busyuser",
+        "pwd": "busypass",
+    })
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_login_recovers_from_dead_hash_worker(client: AsyncClient, create_user):
+    create_user(username="crashuser", password="crashpass", email="crash@example.com")
+    await _token_for(client, "crashuser", "crashpass")
+    pool = security._hash_pool
+    process = next(iter(pool._processes.values()))
+    os.kill(process.pid, signal.SIGKILL)
+    process.join()
+
+    await _token_for(client, "crashuser", "crashpass")
+    assert security._hash_pool is not pool
+
+
+async def _token_for(client: AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/security/token", params={"login": username, "pwd": password})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+@pytest.mark.asyncio
+async def test_current_user_served_from_principal_cache(client: AsyncClient, create_user, db_session):
+    user = create_user(username="cacheduser", password="cachepass", email="cached@example.com")
+    headers = {"Authorization": f"Bearer {await _token_for(client, 'cacheduser', 'cachepass')}"}
+
+    assert (await client.get("/security/users/me", headers=headers)).json()["first_name"] == "Test"
+    # Change the row behind the cache's back: the cached principal is
+    # still served, proving the second request skipped the database.
+    user.first_name = "Changed"
+    db_session.add(user)
+    db_session.commit()
+    assert (await client.get("/security/users/me", headers=headers)).json()["first_name"] == "Test"
+
+    assert (await client.get("/security/cache/stats", headers=headers)).status_code == 403
+
+    create_user(username="cacheadmin", password="adminpass", email="cacheadmin@example.com", user_role="ADMIN")
+    admin_headers = {"Authorization": f"Bearer {await _token_for(client, 'cacheadmin', 'adminpass')}"}
+    stats = (await client.get("/security/cache/stats", headers=admin_headers)).json()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 2
+    assert stats["size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_user_invalidates_principal_cache(client: AsyncClient, create_user):
+    user = create_user(username="goneuser", password="gonepass", email="gone@example.com")
+    headers = {"Authorization": f"Bearer {await _token_for(client, 'goneuser', 'gonepass')}"}
+    assert (await client.get("/security/users/me", headers=headers)).status_code == 200
+
+    assert (await client.delete(f"/user/delete/{user.id}")).status_code == 204
+    assert (await client.get("/security/users/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_decode_access_token(async_test_db, create_user):
+    create_user(username="decodeuser", password="decodepass", email="decode@example.com")
+    async with AsyncSession(async_test_db) as db:
+        user = await decode_access_token(await create_access_token({"sub": "decodeuser"}), db)
+        assert user is not None and user.username == "decodeuser"
+        assert await decode_access_token(await create_access_token({"sub": "nobody"}), db) is None
+        assert await decode_access_token("not-a-token", db) is None
+
+
+def test_principal_cache_evicts_least_recently_used(create_user):
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    user = create_user(username="lruuser", password="lrupass", email="lru@example.com")
+    cache.put("a", 1, user)
+    cache.put("b", 1, user)
+    assert cache.get("a", 1) is not None
+    cache.put("c", 1, user)
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    assert cache.stats().evictions == 1
+
+
+def test_principal_cache_honours_token_expiry(create_user):
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+    user = create_user(username="expuser", password="exppass", email="exp@example.com")
+    cache.put("expuser", "jti", user, token_exp=0)
+    assert cache.get("expuser", "jti") is None
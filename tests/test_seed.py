@@ -0,0 +1,85 @@
+import itertools
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.dialects import postgresql
+
+from jobs import seed
+from jobs.rollups import rebuild_rollups
+from jobs.seed import SeedPlan, seed_database, sequence_reset_statement
+from models import Event, EventType, Participant, ResourceVersion, User
+from utils.blocking import match_keys
+
+PLAN = SeedPlan(event_types=3, events=40, participants=2000, users=5, skew=1.2, start_year=2021, years=3, seed=7)
+
+
+def _seed(path, plan=PLAN):
+    engine = create_engine(f"sqlite:///{path}")
+    stats = seed_database(engine, plan, "hash", batch_size=500)
+    return engine, stats
+
+
+def _rows(engine, model):
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(select(model.__table__).order_by(model.id))]
+
+
+def test_seed_is_deterministic(tmp_path):
+    first, stats = _seed(tmp_path / "first.db")
+    second, _ = _seed(tmp_path / "second.db")
+    assert (stats["event_types"], stats["events"], stats["participants"], stats["users"]) == (3, 40, 2000, 5)
+    for model in (EventType, Event, Participant, User):
+        assert _rows(first, model) == _rows(second, model)
+
+
+def test_seed_shapes_the_data(tmp_path):
+    engine, _ = _seed(tmp_path / "shape.db")
+    with engine.connect() as conn:
+        per_event = Counter(conn.execute(select(Participant.event_id)).scalars())
+        years = set(conn.execute(select(func.strftime("%Y", Event.event_date))).scalars())
+        participant = conn.execute(select(Participant).limit(1)).one()
+        versions = dict(conn.execute(select(ResourceVersion.resource, ResourceVersion.version)).all())
+
+    # The skew gives a few events far more than their share.
+    assert max(per_event.values()) > 5 * PLAN.participants / PLAN.events
+    assert years == {"2021", "2022", "2023"}
+    assert {key: getattr(participant, key) for key in match_keys({})} == match_keys(participant._asdict())
+    assert versions == {"Event_Type": 1, "Event": 1, "Participant": 1, "User": 1}
+    assert rebuild_rollups(engine, check=True)["mismatched_groups"] == 0
+
+
+def test_seed_appends_to_existing_data(tmp_path):
+    engine, _ = _seed(tmp_path / "append.db")
+    _, stats = _seed(tmp_path / "append.db", PLAN._replace(seed=8))
+    assert stats["participants"] == PLAN.participants
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Participant)).scalar() == 2 * PLAN.participants
+        assert conn.execute(select(func.count(func.distinct(Participant.email)))).scalar() == 2 * PLAN.participants
+        orphans = conn.execute(select(func.count()).select_from(Participant)
+                               .where(Participant.event_id.not_in(select(Event.id)))).scalar()
+    assert orphans == 0
+    assert rebuild_rollups(engine, check=True)["mismatched_groups"] == 0
+
+
+def test_seed_restores_indexes_after_failed_load(tmp_path, monkeypatch):
+    def failing_rows(*args):
+        yield from itertools.islice(participant_rows(*args), 700)
+        raise RuntimeError("load interrupted")
+
+    participant_rows = seed.participant_rows
+    monkeypatch.setattr(seed, "participant_rows", failing_rows)
+    engine = create_engine(f"sqlite:///{tmp_path / 'failed.db'}")
+    with pytest.raises(RuntimeError):
+        seed_database(engine, PLAN, "hash", batch_size=500)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes(Participant.__tablename__)}
+    assert indexes == {index.name for index in Participant.__table__.indexes}
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Participant)).scalar() == 500
+
+
+def test_sequence_reset_statement():
+    sql = str(sequence_reset_statement(EventType.__table__).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "setval(pg_get_serial_sequence('\"Event_Type\"', 'id'), (SELECT max(\"Event_Type\".id)" in sql
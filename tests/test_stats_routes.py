@@ -0,0 +1,102 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from jobs.rollups import rebuild_rollups
+from models import ParticipantRollup
+
+
+@pytest.mark.asyncio
+async def test_participant_stats_follow_writes(client: AsyncClient, create_event, create_event_type,
+                                               create_participant):
+    et = create_event_type(name="Stats Type")
+    ev = create_event(name="Stats Event", event_date="2031-03-14", event_type_id=et.id)
+    create_participant(email="nostate@example.com", state=None, event_id=ev.id)
+    for email, state in [("il1@example.com", "IL"), ("il2@example.com", "IL"), ("wi@example.com", "WI")]:
+        response = await client.post("/participant/create", json={
+            "first_name": "Stat", "last_name": "Person", "email": email, "phone": "555-0101",
+            "address": "1 Count St", "city": "Springfield", "state": state, "zip_code": "62704", "event_id": ev.id,
+        })
+        assert response.status_code == 200
+    wi_id = response.json()["id"]
+
+    params = {"group_by": "month,state", "event_type_id": et.id}
+    response = await client.get("/stats/participants", params=params)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"event_type_id": None, "month": "2031-03", "state": None, "participants": 1},
+        {"event_type_id": None, "month": "2031-03", "state": "IL", "participants": 2},
+        {"event_type_id": None, "month": "2031-03", "state": "WI", "participants": 1},
+    ]
+
+    # Moving the event moves all of its participants to the new month.
+    response = await client.put(f"/event/update/{ev.id}", json={
+        "name": "Stats Event", "event_date": "2031-04-01", "location": "Main Hall", "event_type_id": et.id,
+    })
+    assert response.status_code == 200
+    assert (await client.delete(f"/participant/delete/{wi_id}")).status_code == 204
+    response = await client.get("/stats/participants", params={**params, "group_by": "month"})
+    assert response.json() == [{"event_type_id": None, "month": "2031-04", "state": None, "participants": 3}]
+    response = await client.get("/stats/events", params={"group_by": "event_type,month", "event_type_id": et.id})
+    assert response.json() == [{"event_type_id": et.id, "month": "2031-04", "events": 1}]
+
+    assert (await client.delete(f"/event/delete/{ev.id}")).status_code == 204
+    assert (await client.get("/stats/participants", params=params)).json() == []
+    assert (await client.get("/stats/events", params={"event_type_id": et.id})).json() == [{
+        "event_type_id": None, "month": None, "events": 0}]
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_bulk_writes(client: AsyncClient, create_event, create_event_type, create_participant):
+    et = create_event_type(name="Bulk Stats Type")
+    moved = create_event(name="Bulk Moved", event_date="2032-01-05", event_type_id=et.id)
+    doomed = create_event(name="Bulk Doomed", event_date="2032-01-06", event_type_id=et.id)
+    create_participant(email="moved@example.com", state="OH", event_id=moved.id)
+    create_participant(email="doomed@example.com", state="OH", event_id=doomed.id)
+    body = "\n".join([
+        "first_name,last_name,email,phone,address,city,state,zip_code,event_id",
+        f"Kim,Lee,kim@example.com,555-1111,1 A St,Peoria,IN,61602,{moved.id}",
+        f"Ned,Orr,ned@example.com,555-4444,4 D St,Peoria,IN,61602,{moved.id}",
+    ])
+    response = await client.post("/participant/import", files={"file": ("signups.csv", body.encode(), "text/csv")})
+    assert response.json()["inserted"] == 2
+    response = await client.post("/event/batch", json={
+        "create": [{"name": "Bulk New", "event_date": "2032-03-01", "location": "Annex", "event_type_id": et.id}],
+        "update": [{"id": moved.id, "name": "Bulk Moved", "event_date": "2032-02-01", "location": "Annex",
+                    "event_type_id": et.id}],
+        "delete": [doomed.id],
+    })
+    assert response.status_code == 200
+
+    response = await client.get("/stats/participants", params={"group_by": "month,state", "event_type_id": et.id})
+    assert response.json() == [
+        {"event_type_id": None, "month": "2032-02", "state": "IN", "participants": 2},
+        {"event_type_id": None, "month": "2032-02", "state": "OH", "participants": 1},
+    ]
+    response = await client.get("/stats/events", params={"group_by": "month", "event_type_id": et.id,
+                                                         "start_month": "2032-02"})
+    assert response.json() == [{"event_type_id": None, "month": "2032-02", "events": 1},
+                               {"event_type_id": None, "month": "2032-03", "events": 1}]
+
+
+@pytest.mark.asyncio
+async def test_stats_unknown_dimension(client: AsyncClient):
+    response = await client.get("/stats/events", params={"group_by": "month,state"})
+    assert response.status_code == 400
+    assert "Unknown group_by dimensions: state" in response.text
+
+
+def test_rebuild_rollups_repairs_drift(test_db, db_session, create_event, create_participant):
+    ev = create_event(name="Drift Event", event_date="2033-05-01")
+    create_participant(email="drift@example.com", state="KS", event_id=ev.id)
+    assert rebuild_rollups(test_db, check=True)["mismatched_groups"] == 0
+
+    db_session.exec(update(ParticipantRollup).where(ParticipantRollup.state == "KS")
+                    .values(participants=ParticipantRollup.participants + 5))
+    db_session.commit()
+    stats = rebuild_rollups(test_db, check=True)
+    assert stats["mismatched_groups"] == 1
+    assert stats["mismatches"][0]["stored"] == stats["mismatches"][0]["expected"] + 5
+
+    assert rebuild_rollups(test_db)["rebuilt"] is True
+    assert rebuild_rollups(test_db, check=True)["mismatched_groups"] == 0
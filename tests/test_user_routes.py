@@ -53,8 +53,8 @@ async def test_list_users(client: AsyncClient, create_user):
     response = await client.get("/user/list")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 2
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) >= 2
 
 
 @pytest.mark.asyncio
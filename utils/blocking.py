@@ -0,0 +1,104 @@
+"""Blocking keys for fuzzy participant lookup.
+
+A blocking key maps similar-looking values to the same short string so
+an indexed equality lookup can narrow a fuzzy search to a few candidate
+rows. Names are keyed by Soundex, which tolerates most misspellings
+that keep the first letter, and email addresses by a normalized prefix
+of their local part.
+
+The keys are stored on ``Participant`` and filled in by column defaults,
+so every insert path, including bulk Core inserts, computes them.
+"""
+
+import re
+from typing import Callable, Optional
+
+from sqlalchemy.engine.default import DefaultExecutionContext
+
+EMAIL_KEY_LENGTH = 4
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def soundex(value: Optional[str]) -> Optional[str]:
+    """Return the American Soundex code of a name.
+
+    Args:
+        value: The name to encode. Non-letters are ignored.
+
+    Returns:
+        A four-character code such as ``S530``, or None if the value
+        has no letters.
+    """
+    letters = [c for c in (value or "").lower() if "a" <= c <= "z"]
+    if not letters:
+        return None
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # H and W do not separate letters with the same code; vowels do.
+        if letter not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def email_key(value: Optional[str]) -> Optional[str]:
+    """Return the normalized prefix of an email address's local part.
+
+    Case, dots and any ``+tag`` are ignored, so ``J.Smith+news@x.org``
+    and ``jsmith@y.com`` share the key ``jsmi``. A value without ``@``
+    is treated as a bare local part, which lets search terms be keyed
+    the same way.
+
+    Args:
+        value: An email address or search term.
+
+    Returns:
+        The key, or None if the local part has no letters or digits.
+    """
+    local = (value or "").lower().split("@", 1)[0].split("+", 1)[0]
+    return _NON_ALNUM.sub("", local)[:EMAIL_KEY_LENGTH] or None
+
+
+def match_keys(values: dict) -> dict[str, Optional[str]]:
+    """Compute the blocking-key columns for a participant's values.
+
+    Insert paths that cannot rely on the column defaults, such as
+    INSERT ... SELECT, set the keys from this instead.
+
+    Args:
+        values: Column values with ``first_name``, ``last_name`` and ``email``.
+
+    Returns:
+        The ``first_name_key``, ``last_name_key`` and ``email_key`` values.
+    """
+    return {
+        "first_name_key": soundex(values.get("first_name")),
+        "last_name_key": soundex(values.get("last_name")),
+        "email_key": email_key(values.get("email")),
+    }
+
+
+def column_key(source: str, encode: Callable[[Optional[str]], Optional[str]]) -> Callable:
+    """Create a column default that derives a key from another column.
+
+    Args:
+        source: Name of the column the key is computed from.
+        encode: Function turning the source value into the key.
+
+    Returns:
+        A context-sensitive default for ``sa_column_kwargs``.
+    """
+    def default(context: DefaultExecutionContext) -> Optional[str]:
+        return encode(context.get_current_parameters().get(source))
+
+    return default
@@ -0,0 +1,154 @@
+"""Dashboard summary built from a fixed number of aggregate queries.
+
+The dashboard used to download every event, event type and participant
+to count them and pick the next few events. ``build_summary`` answers
+the same questions with three queries, whatever the size of the tables:
+
+1. Counts per event type, summed from the rollup tables maintained by
+   ``utils.rollups``, so they read one row per group. The totals are
+   the sums of these rows.
+2. The next events by date, through the ``event_date`` index, each with
+   its participant count from the ``event_id`` index.
+3. The newest participants, newest id first, with their event's name.
+
+``SummaryCache`` keeps the encoded response for a few seconds, so a
+page load served from memory costs no queries at all. Concurrent
+requests that find it stale wait for a single rebuild instead of each
+running the queries.
+"""
+
+import asyncio
+import time
+from datetime import date
+from typing import Awaitable, Callable, Hashable, Optional
+
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.app_config import settings
+from models import Event, EventRollup, EventType, Participant, ParticipantRollup, utc_now
+from schemas.dashboard import (DashboardSummary, DashboardTotals, EventTypeSummary, RecentRegistration,
+                               UpcomingEvent)
+
+UPCOMING_EVENTS = 5
+RECENT_REGISTRATIONS = 5
+
+
+async def build_summary(db: AsyncSession, today: date, upcoming: int = UPCOMING_EVENTS,
+                        recent: int = RECENT_REGISTRATIONS) -> DashboardSummary:
+    """Compute the dashboard summary.
+
+    Args:
+        db: Database session.
+        today: First date that counts as upcoming.
+        upcoming: Number of upcoming events to list.
+        recent: Number of recent registrations to list.
+
+    Returns:
+        The summary.
+    """
+    events = (select(EventRollup.event_type_id, func.sum(EventRollup.events).label("events"))
+              .group_by(EventRollup.event_type_id).subquery())
+    participants = (select(ParticipantRollup.event_type_id,
+                           func.sum(ParticipantRollup.participants).label("participants"))
+                    .group_by(ParticipantRollup.event_type_id).subquery())
+    type_rows = (await db.exec(
+        select(EventType.id, EventType.name,
+               func.coalesce(events.c.events, 0).label("events"),
+               func.coalesce(participants.c.participants, 0).label("participants"))
+        .outerjoin(events, events.c.event_type_id == EventType.id)
+        .outerjoin(participants, participants.c.event_type_id == EventType.id)
+        .order_by(EventType.name, EventType.id)
+    )).all()
+
+    registered = select(func.count()).where(Participant.event_id == Event.id).scalar_subquery()
+    upcoming_rows = (await db.exec(
+        select(Event.id, Event.name, Event.event_date, Event.location, Event.event_type_id,
+               registered.label("participants"))
+        .where(Event.event_date >= today)
+        .order_by(Event.event_date, Event.id)
+        .limit(upcoming)
+    )).all()
+
+    recent_rows = (await db.exec(
+        select(Participant.id, Participant.first_name, Participant.last_name, Participant.event_id,
+               Event.name.label("event_name"), Participant.created_at)
+        .join(Event, Event.id == Participant.event_id)
+        .order_by(Participant.id.desc())
+        .limit(recent)
+    )).all()
+
+    event_types = [EventTypeSummary(**row._asdict()) for row in type_rows]
+    return DashboardSummary(
+        generated_at=utc_now(),
+        totals=DashboardTotals(
+            events=sum(event_type.events for event_type in event_types),
+            event_types=len(event_types),
+            participants=sum(event_type.participants for event_type in event_types),
+        ),
+        upcoming_events=[UpcomingEvent(**row._asdict()) for row in upcoming_rows],
+        recent_registrations=[RecentRegistration(**row._asdict()) for row in recent_rows],
+        event_types=event_types,
+    )
+
+
+class SummaryCache:
+    """Holds one encoded summary for a short time.
+
+    Args:
+        ttl_seconds: How long a summary is served before being rebuilt;
+            0 disables caching.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._key: Optional[Hashable] = None
+        self._expires = 0.0
+        self._value: Optional[bytes] = None
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _current(self, key: Hashable) -> Optional[bytes]:
+        if self._value is not None and self._key == key and self._expires > time.monotonic():
+            return self._value
+        return None
+
+    async def get_or_build(self, key: Hashable, build: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return the cached value for a key, building it if stale.
+
+        Args:
+            key: What the value depends on besides time, such as the date.
+            build: Coroutine function producing a fresh value.
+
+        Returns:
+            The cached or freshly built value.
+        """
+        if self.ttl_seconds <= 0:
+            self.misses += 1
+            return await build()
+        value = self._current(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        async with self._lock:
+            # Another request may have rebuilt it while this one waited.
+            value = self._current(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = await build()
+            self._key, self._value = key, value
+            self._expires = time.monotonic() + self.ttl_seconds
+            return value
+
+    def clear(self) -> None:
+        """Drop the cached value and reset the counters."""
+        self._key = self._value = None
+        self._expires = 0.0
+        self.hits = self.misses = 0
+
+
+# Singleton instance
+summary_cache = SummaryCache(ttl_seconds=settings.dashboard_cache_ttl_seconds)
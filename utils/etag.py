@@ -0,0 +1,122 @@
+"""ETag / If-None-Match support for read endpoints.
+
+Each table has a change counter in ``ResourceVersion`` that write
+handlers increment with ``bump_versions`` in the same transaction as
+their change. Read endpoints declare the tables they depend on with
+``conditional``; the dependency turns the counters and the request URL
+into a strong ETag and answers ``304 Not Modified`` when the client
+already holds that version, before the handler runs its query.
+
+Every code path that writes to a table must bump its version, or
+clients will keep being told their stale copy is current.
+"""
+
+import hashlib
+from typing import Callable, Mapping, Optional
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import Insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.db import get_read_db_conn
+from models import ResourceVersion
+
+# Clients may keep a copy but must revalidate it before each use.
+CACHE_CONTROL = "no-cache"
+
+
+class NotModified(Exception):
+    """Raised when the client's cached representation is still current.
+
+    Args:
+        etag: The current entity tag, echoed on the 304 response.
+    """
+
+    def __init__(self, etag: str):
+        super().__init__(etag)
+        self.etag = etag
+
+
+def version_bump_statement(dialect: str, *models: type[SQLModel]) -> Insert:
+    """Build the upsert that increments the change counters of tables.
+
+    Args:
+        dialect: Name of the database dialect.
+        *models: Table models whose data is being changed.
+
+    Returns:
+        The statement, for code that writes outside a request.
+    """
+    table = ResourceVersion.__table__
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    statement = insert(table).values([{"resource": model.__tablename__, "version": 1} for model in models])
+    return statement.on_conflict_do_update(index_elements=[table.c.resource], set_={"version": table.c.version + 1})
+
+
+async def bump_versions(db: AsyncSession, *models: type[SQLModel]) -> None:
+    """Increment the change counters of the given tables.
+
+    Call this before committing a write so the new versions become
+    visible in the same transaction as the data.
+
+    Args:
+        db: Database session holding the write transaction.
+        *models: Table models whose data is being changed.
+    """
+    await db.exec(version_bump_statement(db.bind.dialect.name, *models))
+
+
+async def current_etag(db: AsyncSession, models: tuple[type[SQLModel], ...], request: Request) -> str:
+    """Build the ETag for a request from the versions of its tables.
+
+    Args:
+        db: Database session the handler will read from.
+        models: Table models the response is built from.
+        request: The incoming request; its path and query are part of the tag.
+
+    Returns:
+        A quoted strong entity tag.
+    """
+    names = [model.__tablename__ for model in models]
+    versions = dict((await db.exec(
+        select(ResourceVersion.resource, ResourceVersion.version).where(ResourceVersion.resource.in_(names))
+    )).all())
+    digest = hashlib.sha256(request.url.path.encode())
+    digest.update(repr(sorted(request.query_params.multi_items())).encode())
+    for name in names:
+        digest.update(f"|{name}={versions.get(name, 0)}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def conditional(*models: type[SQLModel],
+                expansions: Optional[Mapping[str, tuple[type[SQLModel], ...]]] = None) -> Callable:
+    """Create a dependency that adds an ETag and answers 304 when unchanged.
+
+    Args:
+        *models: Table models the endpoint's response is built from.
+        expansions: Extra tables read for each value of the ``expand``
+            query parameter, for endpoints that embed related data.
+
+    Returns:
+        A FastAPI dependency for the route's ``dependencies`` list.
+    """
+    async def check(request: Request, response: Response, db: AsyncSession = Depends(get_read_db_conn)) -> None:
+        tables = list(models)
+        for name in (request.query_params.get("expand") or "").split(","):
+            tables.extend(model for model in (expansions or {}).get(name.strip(), ()) if model not in tables)
+        etag = await current_etag(db, tuple(tables), request)
+        if _matches(request.headers.get("if-none-match", ""), etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+    return check
@@ -0,0 +1,144 @@
+"""Embedding related data in event responses with ``?expand=``.
+
+Clients that list events next to their type's name and participant
+count used to read each type separately, one request per row. Event
+read endpoints now accept ``?expand=event_type,participants,participant_count``
+and embed that data in the response at a fixed query cost per page:
+
+- ``participant_count`` is a correlated count added to the page query
+  itself, answered from the ``event_id`` index.
+- ``event_type`` and ``participants`` are loaded after the page with
+  ``selectinload``: one query loads the keys of the page's events, then
+  each relationship is fetched for all of them with one ``IN`` query.
+
+So a page of events costs at most four queries, however many events
+it holds.
+"""
+
+from operator import attrgetter
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import ColumnElement, Select, func
+from sqlalchemy.orm import load_only, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Event, EventType, Participant
+from schemas.event import EventExpansion
+from schemas.event_type import EventTypeSchema
+from schemas.participant import ParticipantSchema
+from utils.fields import json_response
+from utils.pagination import PageParams, fetch_column_page
+
+# Tables each expansion reads, for ``utils.etag.conditional``.
+EXPANSION_MODELS = {
+    EventExpansion.EVENT_TYPE.value: (EventType,),
+    EventExpansion.PARTICIPANTS.value: (Participant,),
+    EventExpansion.PARTICIPANT_COUNT.value: (Participant,),
+}
+
+RELATIONSHIPS = (EventExpansion.EVENT_TYPE, EventExpansion.PARTICIPANTS)
+
+
+def event_expansions(expand: Optional[str] = Query(
+        None, description=f"Comma-separated subset of: {', '.join(e.value for e in EventExpansion)}"),
+) -> list[EventExpansion]:
+    """Parse the ``expand`` query parameter.
+
+    Args:
+        expand: Comma-separated names of the related data to embed.
+
+    Returns:
+        The requested expansions, without duplicates.
+
+    Raises:
+        HTTPException: 400 error if an unknown expansion is requested.
+    """
+    names = list(dict.fromkeys(name.strip() for name in (expand or "").split(",") if name.strip()))
+    unknown = [name for name in names if name not in {e.value for e in EventExpansion}]
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unknown expand values: {', '.join(unknown)}")
+    return [EventExpansion(name) for name in names]
+
+
+def expanded_columns(statement: Select, expand: list[EventExpansion],
+                     id_column: ColumnElement = Event.id) -> Select:
+    """Add the columns an expansion needs to a select of event columns.
+
+    The event id is always returned with expanded data, even when a
+    sparse fieldset left it out, so the embedded data can be attributed.
+
+    Args:
+        statement: A select of event columns, see ``utils.fields.sparse_fields``.
+        expand: The requested expansions.
+        id_column: The event id column of the statement's FROM clause.
+
+    Returns:
+        The select with the id and any ``participant_count`` column added.
+    """
+    if not expand:
+        return statement
+    if "id" not in {column.key for column in statement.selected_columns}:
+        statement = statement.add_columns(id_column)
+    if EventExpansion.PARTICIPANT_COUNT in expand:
+        count = select(func.count()).where(Participant.event_id == id_column).scalar_subquery()
+        statement = statement.add_columns(count.label(EventExpansion.PARTICIPANT_COUNT.value))
+    return statement
+
+
+async def embed_relationships(db: AsyncSession, items: list[dict], expand: list[EventExpansion]) -> list[dict]:
+    """Add the requested related records to event rows.
+
+    Args:
+        db: Database session.
+        items: Event rows holding at least their ``id``; updated in place.
+        expand: The requested expansions.
+
+    Returns:
+        The same rows.
+    """
+    relationships = [expansion for expansion in RELATIONSHIPS if expansion in expand]
+    if not relationships or not items:
+        return items
+    events = (await db.exec(
+        select(Event)
+        .options(load_only(Event.id, Event.event_type_id),
+                 *(selectinload(getattr(Event, expansion.value)) for expansion in relationships))
+        .where(Event.id.in_([item["id"] for item in items]))
+    )).all()
+    by_id = {event.id: event for event in events}
+    for item in items:
+        event = by_id[item["id"]]
+        if EventExpansion.EVENT_TYPE in relationships:
+            item["event_type"] = (EventTypeSchema.model_validate(event.event_type).model_dump()
+                                  if event.event_type else None)
+        if EventExpansion.PARTICIPANTS in relationships:
+            item["participants"] = [ParticipantSchema.model_validate(participant).model_dump()
+                                    for participant in sorted(event.participants, key=attrgetter("id"))]
+    return items
+
+
+async def paginate_expanded(db: AsyncSession, statement: Select, keys: list, params: PageParams,
+                            response: Response, expand: list[EventExpansion]) -> ORJSONResponse:
+    """Fetch one page of event rows with their expansions, as JSON.
+
+    Works like ``utils.pagination.paginate_json``; pass the statement
+    through ``expanded_columns`` first.
+
+    Args:
+        db: Database session.
+        statement: A select of the columns to return.
+        keys: Columns that uniquely order the rows.
+        params: The requested page size and cursor.
+        response: The route's injected response, for its headers.
+        expand: The requested expansions.
+
+    Returns:
+        A JSON response holding ``items`` and ``next_cursor``.
+    """
+    items, next_cursor = await fetch_column_page(db, statement, keys, params)
+    await embed_relationships(db, items, expand)
+    return json_response({"items": items, "next_cursor": next_cursor}, response)
@@ -0,0 +1,126 @@
+"""Streaming table exports.
+
+Rows are read through a server-side cursor in fixed-size partitions and
+encoded one partition at a time, so an export holds at most one
+partition in memory no matter how many rows it covers.
+"""
+
+import csv
+import io
+import tempfile
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from schemas.export import ExportFormat
+
+PARTITION_SIZE = 1000
+FILE_CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+async def _partitions(db: AsyncSession, statement: Select) -> AsyncIterator[list]:
+    # The request's session is closed before a streaming body runs, so the
+    # export opens its own session on the same engine.
+    async with AsyncSession(db.bind) as session:
+        result = await session.stream(statement.execution_options(yield_per=PARTITION_SIZE))
+        async for partition in result.partitions():
+            yield partition
+
+
+async def _ndjson(db: AsyncSession, statement: Select) -> AsyncIterator[bytes]:
+    async for partition in _partitions(db, statement):
+        yield b"".join(orjson.dumps(dict(row._mapping)) + b"\n" for row in partition)
+
+
+async def _csv(db: AsyncSession, statement: Select) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in statement.selected_columns])
+    async for partition in _partitions(db, statement):
+        writer.writerows(partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _xlsx_value(value):
+    # Excel has no notion of time zones; store UTC wall-clock time.
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _append_rows(sheet, partition: list) -> None:
+    for row in partition:
+        sheet.append([_xlsx_value(value) for value in row])
+
+
+async def _xlsx(db: AsyncSession, statement: Select) -> AsyncIterator[bytes]:
+    # Write-only workbooks spool rows to a temporary file as they are
+    # appended; the finished workbook is then streamed back in chunks.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([column.key for column in statement.selected_columns])
+    async for partition in _partitions(db, statement):
+        await run_in_threadpool(_append_rows, sheet, partition)
+
+    with tempfile.TemporaryFile() as output:
+        await run_in_threadpool(workbook.save, output)
+        output.seek(0)
+        while chunk := await run_in_threadpool(output.read, FILE_CHUNK_SIZE):
+            yield chunk
+
+
+ENCODERS = {
+    ExportFormat.NDJSON: _ndjson,
+    ExportFormat.CSV: _csv,
+    ExportFormat.XLSX: _xlsx,
+}
+
+
+def export_rows(db: AsyncSession, statement: Select, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """Encode the rows of a query as a stream of bytes.
+
+    Args:
+        db: Database session whose engine the rows are read from.
+        statement: Column select to export, e.g. ``select(Event.__table__)``.
+        export_format: Output file format.
+
+    Returns:
+        An async iterator of encoded chunks.
+    """
+    return ENCODERS[export_format](db, statement)
+
+
+def export_response(db: AsyncSession, statement: Select, export_format: ExportFormat,
+                    filename: str) -> StreamingResponse:
+    """Build a streaming download response for a query.
+
+    Args:
+        db: Database session whose engine the rows are read from.
+        statement: Column select to export.
+        export_format: Output file format.
+        filename: Download file name without extension.
+
+    Returns:
+        A StreamingResponse with an attachment Content-Disposition.
+    """
+    return StreamingResponse(
+        export_rows(db, statement, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
@@ -0,0 +1,60 @@
+"""Sparse fieldsets for read and list endpoints.
+
+Endpoints accept ``?fields=id,name,event_date`` to return only some of
+their schema's fields. The selection is pushed down to the SELECT, so
+unrequested columns are neither read from the database nor sent to the
+client. Without ``fields`` every schema field is returned, as before.
+"""
+
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlmodel import SQLModel
+
+
+def sparse_fields(model: type[SQLModel], schema: type[BaseModel]) -> Callable:
+    """Create a dependency that turns ``?fields=`` into table columns.
+
+    Args:
+        model: The table model the endpoint reads from.
+        schema: The endpoint's response schema; only its fields may be requested.
+
+    Returns:
+        A FastAPI dependency returning a select of the requested
+        columns, in the order they were requested. Rows always come
+        back as named tuples, even for a single column.
+    """
+    allowed = list(schema.model_fields)
+
+    def parse(fields: Optional[str] = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}")) -> Select:
+        names = list(dict.fromkeys(name.strip() for name in (fields or "").split(",") if name.strip()))
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"Unknown fields: {', '.join(unknown)}")
+        return select(*(model.__table__.c[name] for name in names or allowed))
+
+    return parse
+
+
+def json_response(content: Any, response: Response) -> ORJSONResponse:
+    """Encode already-serializable content, keeping dependency-set headers.
+
+    FastAPI only merges headers set on the injected response, such as
+    the ETag, when the handler returns data rather than a Response of
+    its own, so they are copied here.
+
+    Args:
+        content: Plain data to encode, e.g. rows from ``row._asdict()``.
+        response: The route's injected response.
+
+    Returns:
+        The JSON response to return from the handler.
+    """
+    fast_response = ORJSONResponse(content)
+    fast_response.headers.raw.extend(response.headers.raw)
+    return fast_response
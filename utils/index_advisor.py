@@ -0,0 +1,139 @@
+"""Development aid that flags queries which read whole tables.
+
+``IndexAdvisor`` listens to one or more engines and records every
+distinct SELECT, UPDATE and DELETE statement they run, along with the
+parameters of its first run. ``analyze`` then asks SQLite for the
+``EXPLAIN QUERY PLAN`` of each statement and reports the ones that scan
+a table row by row instead of searching an index.
+
+The test suite turns it on when ``INDEX_ADVISOR`` is set:
+
+    INDEX_ADVISOR=1 python -m pytest -q
+
+A flagged scan is not always a problem. Listing a whole table in id
+order scans it by design, and small lookup tables are cheaper to scan
+than to index. Read the report as a list of places to check when a new
+query shape or filter is added.
+"""
+
+import re
+from typing import NamedTuple
+
+from sqlalchemy import Connection, Engine, event, inspect
+from sqlalchemy.exc import DBAPIError
+
+ANALYZED_VERBS = {"SELECT", "UPDATE", "DELETE", "WITH"}
+
+# "SCAN Participant" or "SCAN Participant AS p". Index scans
+# ("... USING INDEX ix_name") and virtual tables such as the full-text
+# index are matched by the optional tail and skipped.
+_SCAN = re.compile(r"^SCAN (?P<table>\S+)(?: AS \S+)?(?P<tail> .*)?$")
+
+
+class ScanFinding(NamedTuple):
+    """A statement whose plan reads a table without an index.
+
+    Attributes:
+        table: The scanned table.
+        statement: The SQL text, with bound parameters as placeholders.
+        runs: How many times the statement ran while recorded.
+    """
+
+    table: str
+    statement: str
+    runs: int
+
+
+class IndexAdvisor:
+    """Records statements run by engines and explains their plans."""
+
+    def __init__(self) -> None:
+        self._statements: dict[str, list] = {}
+        self._engines: list[Engine] = []
+
+    @property
+    def statement_count(self) -> int:
+        """Number of distinct statements recorded so far."""
+        return len(self._statements)
+
+    def attach(self, engine: Engine) -> None:
+        """Start recording the statements an engine runs.
+
+        Args:
+            engine: A synchronous engine. Pass ``sync_engine`` of an
+                async engine.
+        """
+        event.listen(engine, "before_cursor_execute", self._record)
+        self._engines.append(engine)
+
+    def detach(self) -> None:
+        """Stop recording on every attached engine."""
+        for engine in self._engines:
+            if event.contains(engine, "before_cursor_execute", self._record):
+                event.remove(engine, "before_cursor_execute", self._record)
+        self._engines.clear()
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if verb not in ANALYZED_VERBS:
+            return
+        entry = self._statements.get(statement)
+        if entry is None:
+            self._statements[statement] = [parameters[0] if executemany else parameters, 1]
+        else:
+            entry[1] += 1
+
+    def analyze(self, connection: Connection) -> list[ScanFinding]:
+        """Explain every recorded statement and collect full table scans.
+
+        Statements that no longer compile, for example because a test
+        dropped the table they read, are skipped.
+
+        Args:
+            connection: Connection to the database the statements ran
+                against, with its tables still in place.
+
+        Returns:
+            One finding per scanned table per statement, most frequently
+            run first.
+
+        Raises:
+            ValueError: If the connection is not to a SQLite database.
+        """
+        if connection.dialect.name != "sqlite":
+            raise ValueError("The index advisor reads SQLite query plans only")
+        tables = set(inspect(connection).get_table_names())
+        findings = []
+        for statement, (parameters, runs) in list(self._statements.items()):
+            try:
+                plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            except DBAPIError:
+                continue
+            scanned = set()
+            for row in plan:
+                match = _SCAN.match(row.detail)
+                if match and match["table"] in tables and not match["tail"]:
+                    scanned.add(match["table"])
+            findings.extend(ScanFinding(table, statement, runs) for table in sorted(scanned))
+        findings.sort(key=lambda finding: (-finding.runs, finding.table))
+        return findings
+
+    def format_report(self, findings: list[ScanFinding], width: int = 160) -> str:
+        """Render findings as plain text for a terminal or a file.
+
+        Args:
+            findings: Result of ``analyze``.
+            width: Statements longer than this are truncated.
+
+        Returns:
+            The report, one block per finding.
+        """
+        lines = [f"Index advisor: {self.statement_count} distinct statements, "
+                 f"{len({finding.statement for finding in findings})} with full table scans"]
+        for finding in findings:
+            statement = " ".join(finding.statement.split())
+            if len(statement) > width:
+                statement = statement[:width - 3] + "..."
+            lines.append(f"  SCAN {finding.table} ({finding.runs} runs)")
+            lines.append(f"    {statement}")
+        return "\n".join(lines)
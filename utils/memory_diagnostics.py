@@ -0,0 +1,215 @@
+"""On-demand memory diagnostics built on tracemalloc.
+
+Tracing every allocation slows the whole process down, so tracemalloc
+is only started when the ``memory_diagnostics`` setting is enabled.
+While it runs, this module keeps a handful of named snapshots that can
+be compared to find leaks, and ``RouteMemoryMiddleware`` attributes net
+memory growth to the route that caused it.
+
+Route figures are the change in traced memory between the start and
+end of each request. Requests that overlap on the event loop blur each
+other's numbers, so treat them as a pointer to where to look rather
+than an exact account.
+"""
+
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from schemas.diagnostics import AllocationGrouping, AllocationStat, RouteAllocationStat, SnapshotInfo
+
+MAX_SNAPSHOTS = 8
+
+# Allocations made by tracemalloc itself and the import machinery are
+# noise in every report.
+_TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+_snapshots: OrderedDict[str, tuple[SnapshotInfo, tracemalloc.Snapshot]] = OrderedDict()
+_routes: dict[str, RouteAllocationStat] = {}
+_lock = threading.Lock()
+
+
+def start(frames: int = 1) -> None:
+    """Start tracing allocations.
+
+    Args:
+        frames: Number of stack frames stored per allocation. More frames
+            give fuller tracebacks at a higher cost.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop() -> None:
+    """Stop tracing and drop all stored snapshots and route figures."""
+    tracemalloc.stop()
+    reset()
+
+
+def reset() -> None:
+    """Drop all stored snapshots and route figures."""
+    with _lock:
+        _snapshots.clear()
+        _routes.clear()
+
+
+def current_snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot without storing it.
+
+    Returns:
+        Traced allocations, excluding tracemalloc and import machinery noise.
+    """
+    return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+
+def _location(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff, grouping: AllocationGrouping) -> str:
+    if grouping is AllocationGrouping.TRACEBACK:
+        return "\n".join(stat.traceback.format())
+    frame = stat.traceback[0]
+    if grouping is AllocationGrouping.FILENAME:
+        return frame.filename
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def take_snapshot(name: Optional[str] = None) -> SnapshotInfo:
+    """Take and store a snapshot of traced allocations.
+
+    Only the most recent ``MAX_SNAPSHOTS`` are kept; storing a snapshot
+    under an existing name replaces it.
+
+    Args:
+        name: Name to store the snapshot under. Defaults to a timestamp.
+
+    Returns:
+        A summary of the stored snapshot.
+    """
+    snapshot = current_snapshot()
+    traced, peak = tracemalloc.get_traced_memory()
+    taken_at = datetime.now(timezone.utc)
+    info = SnapshotInfo(name=name or taken_at.isoformat(), taken_at=taken_at, traced_bytes=traced, peak_bytes=peak)
+    with _lock:
+        _snapshots.pop(info.name, None)
+        _snapshots[info.name] = (info, snapshot)
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return info
+
+
+def list_snapshots() -> list[SnapshotInfo]:
+    """List stored snapshots, oldest first.
+
+    Returns:
+        Summaries of the stored snapshots.
+    """
+    with _lock:
+        return [info for info, _ in _snapshots.values()]
+
+
+def get_snapshot(name: str) -> Optional[tracemalloc.Snapshot]:
+    """Look up a stored snapshot by name.
+
+    Args:
+        name: The snapshot's name.
+
+    Returns:
+        The snapshot, or None if no snapshot has that name.
+    """
+    with _lock:
+        entry = _snapshots.get(name)
+    return entry[1] if entry else None
+
+
+def top_allocations(limit: int, grouping: AllocationGrouping = AllocationGrouping.LINENO) -> list[AllocationStat]:
+    """Report the locations holding the most traced memory right now.
+
+    Args:
+        limit: Maximum number of locations to return.
+        grouping: How allocations are grouped.
+
+    Returns:
+        The largest allocation sites, biggest first.
+    """
+    stats = current_snapshot().statistics(grouping.value)[:limit]
+    return [AllocationStat(location=_location(stat, grouping), size=stat.size, count=stat.count) for stat in stats]
+
+
+def diff_snapshots(base: tracemalloc.Snapshot, target: tracemalloc.Snapshot, limit: int,
+                   grouping: AllocationGrouping = AllocationGrouping.LINENO) -> list[AllocationStat]:
+    """Report where memory grew or shrank between two snapshots.
+
+    Args:
+        base: The earlier snapshot.
+        target: The later snapshot.
+        limit: Maximum number of locations to return.
+        grouping: How allocations are grouped.
+
+    Returns:
+        The locations with the largest change, biggest first.
+    """
+    stats = target.compare_to(base, grouping.value)[:limit]
+    return [
+        AllocationStat(location=_location(stat, grouping), size=stat.size, count=stat.count,
+                       size_diff=stat.size_diff, count_diff=stat.count_diff)
+        for stat in stats
+    ]
+
+
+def top_routes(limit: int) -> list[RouteAllocationStat]:
+    """Report the routes with the largest net memory growth.
+
+    Args:
+        limit: Maximum number of routes to return.
+
+    Returns:
+        Per-route figures, largest net growth first.
+    """
+    with _lock:
+        routes = sorted(_routes.values(), key=lambda stat: stat.net_bytes, reverse=True)
+        return [stat.model_copy() for stat in routes[:limit]]
+
+
+def _record_route(route: str, net_bytes: int) -> None:
+    with _lock:
+        stat = _routes.get(route)
+        if stat is None:
+            stat = _routes[route] = RouteAllocationStat(route=route, requests=0, net_bytes=0, max_net_bytes=0)
+        stat.requests += 1
+        stat.net_bytes += net_bytes
+        stat.max_net_bytes = max(stat.max_net_bytes, net_bytes)
+
+
+class RouteMemoryMiddleware:
+    """ASGI middleware that attributes traced memory growth to routes.
+
+    When tracemalloc is not running the middleware only checks that
+    and passes the request straight through.
+
+    Args:
+        app: The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if tracemalloc.is_tracing():
+                after, _ = tracemalloc.get_traced_memory()
+                route = scope.get("route")
+                _record_route(getattr(route, "path", "<unmatched>"), after - before)
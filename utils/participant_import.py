@@ -0,0 +1,145 @@
+"""Bulk participant import from CSV or NDJSON uploads.
+
+The upload is read incrementally and processed in fixed-size chunks.
+Each chunk is validated against ParticipantSchemaInput, checked for
+unknown events with a single query, and written with one executemany
+INSERT in its own transaction.
+"""
+
+import csv
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, BinaryIO, Iterator
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Event, Participant
+from schemas.export import ImportFormat
+from utils.etag import bump_versions
+from utils.rollups import record_participants
+from schemas.participant import ParticipantImportError, ParticipantImportReport, ParticipantSchemaInput
+
+CHUNK_SIZE = 1000
+
+OPTIONAL_FIELDS = {name for name, field in ParticipantSchemaInput.model_fields.items() if not field.is_required()}
+
+
+def _decoded_lines(stream: BinaryIO, invalid: set[int]) -> Iterator[str]:
+    # Decoding line by line pins invalid UTF-8 to the rows holding it;
+    # those lines are decoded with replacement characters and recorded.
+    for line_num, line in enumerate(stream, start=1):
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError:
+            invalid.add(line_num)
+            text = line.decode("utf-8", errors="replace")
+        yield text.removeprefix("\ufeff") if line_num == 1 else text
+
+
+def _csv_rows(stream: BinaryIO) -> Iterator[tuple[int, Any]]:
+    invalid: set[int] = set()
+    reader = csv.DictReader(_decoded_lines(stream, invalid))
+    if reader.fieldnames is None:
+        return
+    last_line = reader.line_num
+    for row in reader:
+        # A quoted cell can span lines, so a row covers every line read for it.
+        first_line, last_line = last_line + 1, reader.line_num
+        if invalid.intersection(range(first_line, last_line + 1)):
+            yield last_line, ParticipantImportError(row=last_line, errors=["row is not valid UTF-8"])
+        elif None in row:
+            yield last_line, ParticipantImportError(
+                row=last_line, errors=[f"row has {len(row[None])} more cells than the header"])
+        else:
+            # Blank cells mean "not provided" for optional columns.
+            yield last_line, {k: (None if v == "" and k in OPTIONAL_FIELDS else v) for k, v in row.items()}
+
+
+def _ndjson_rows(stream: BinaryIO) -> Iterator[tuple[int, Any]]:
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield line_num, ParticipantImportError(row=line_num, errors=[f"invalid JSON: {exc}"])
+
+
+def _validate(line_num: int, raw: Any) -> dict | ParticipantImportError:
+    if isinstance(raw, ParticipantImportError):
+        return raw
+    if not isinstance(raw, dict):
+        return ParticipantImportError(row=line_num, errors=["row must be an object"])
+    try:
+        participant = ParticipantSchemaInput.model_validate(raw)
+    except ValidationError as exc:
+        return ParticipantImportError(
+            row=line_num,
+            errors=[f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors()],
+        )
+    if participant.event_id is None:
+        return ParticipantImportError(row=line_num, errors=["event_id: Field required"])
+    return participant.model_dump()
+
+
+def _next_chunk(rows: Iterator[tuple[int, Any]]) -> list[tuple[int, dict | ParticipantImportError]]:
+    return [(line_num, _validate(line_num, raw)) for line_num, raw in islice(rows, CHUNK_SIZE)]
+
+
+async def import_participants(db: AsyncSession, stream: BinaryIO, import_format: ImportFormat) -> ParticipantImportReport:
+    """Validate and insert participants from an uploaded file.
+
+    Parsing and validation run in the threadpool so a large upload does
+    not hold the event loop. A chunk that fails to insert is rolled back
+    on its own and every row in it is reported; earlier chunks stay
+    committed.
+
+    Args:
+        db: Database session.
+        stream: Binary file object positioned at the start of the upload.
+        import_format: Format of the uploaded file.
+
+    Returns:
+        Counts of rows received and inserted, plus per-row errors.
+    """
+    rows = _csv_rows(stream) if import_format is ImportFormat.CSV else _ndjson_rows(stream)
+    report = ParticipantImportReport(received=0, inserted=0, errors=[])
+
+    while chunk := await run_in_threadpool(_next_chunk, rows):
+        report.received += len(chunk)
+        valid = [(line_num, row) for line_num, row in chunk if isinstance(row, dict)]
+        report.errors.extend(row for _, row in chunk if isinstance(row, ParticipantImportError))
+
+        event_ids = {row["event_id"] for _, row in valid}
+        known = set((await db.exec(select(Event.id).where(Event.id.in_(event_ids)))).all()) if event_ids else set()
+        created_at = datetime.now(timezone.utc)
+        batch = []
+        for line_num, row in valid:
+            if row["event_id"] in known:
+                batch.append({**row, "created_at": created_at})
+            else:
+                report.errors.append(ParticipantImportError(
+                    row=line_num, errors=[f"event_id: event {row['event_id']} does not exist"]))
+        if not batch:
+            continue
+
+        try:
+            await db.exec(insert(Participant.__table__), params=batch)
+            await record_participants(db, [(row["event_id"], row["state"]) for row in batch])
+            await bump_versions(db, Participant)
+            await db.commit()
+            report.inserted += len(batch)
+        except SQLAlchemyError as exc:
+            await db.rollback()
+            reason = f"chunk rejected by database: {exc.__class__.__name__}"
+            report.errors.extend(ParticipantImportError(row=line_num, errors=[reason])
+                                 for line_num, row in valid if row["event_id"] in known)
+
+    report.errors.sort(key=lambda error: error.row)
+    return report
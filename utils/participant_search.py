@@ -0,0 +1,110 @@
+"""Fuzzy participant lookup by name or email.
+
+A search runs in two steps. Blocking: every word of the query is turned
+into the same keys stored on ``Participant`` (see ``utils.blocking``),
+and indexed queries fetch the rows that share them. Scoring: rapidfuzz
+ranks those candidates against the query and the best ones are
+returned. Only the blocked candidates are ever scored, so the cost
+depends on how common the query's keys are, not on the table size.
+
+Blocking runs in passes from narrow to wide. A query of two or more
+words first looks for rows whose first *and* last name keys both match,
+which keeps common first names from flooding the candidates. Only if
+that finds no strong match does the search fall back to rows sharing
+any single key, which catches misspellings that change a name's key.
+"""
+
+import heapq
+import re
+from operator import itemgetter
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from rapidfuzz import fuzz, process, utils
+from sqlalchemy import and_, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Participant
+from schemas.participant import ParticipantMatch, ParticipantSchema
+from utils.blocking import email_key, soundex
+
+# Derived columns holding the blocking keys; internal, never returned.
+MATCH_KEY_COLUMNS = ("first_name_key", "last_name_key", "email_key")
+
+# Upper bound on rows scored per search, so a query made only of very
+# common keys still answers quickly.
+MAX_CANDIDATES = 5000
+MIN_SCORE = 60.0
+# A best match at least this good ends the search without widening.
+STRONG_SCORE = 90.0
+
+_WORD = re.compile(r"[^\s,;]+")
+
+
+def blocking_keys(q: str) -> tuple[set[str], set[str]]:
+    """Derive the name and email keys to look up for a query.
+
+    Args:
+        q: The search text, e.g. ``"jon smyth"`` or ``"jsmith@"``.
+
+    Returns:
+        The Soundex codes of the query's words and their email keys.
+    """
+    words = _WORD.findall(q)
+    names = {code for word in words for part in word.split("@")[:1] if (code := soundex(part))}
+    emails = {key for word in words if (key := email_key(word))}
+    return names, emails
+
+
+def _score(q: str, candidates: list, limit: int) -> list[ParticipantMatch]:
+    # Names and emails are scored separately; mixing them into one string
+    # lets the email's length swamp differences between names.
+    names = {index: f"{row.first_name} {row.last_name}" for index, row in enumerate(candidates)}
+    emails = {index: row.email for index, row in enumerate(candidates)}
+    scores: dict[int, float] = {}
+    for choices, scorer in ((names, fuzz.WRatio), (emails, fuzz.ratio)):
+        for _, score, index in process.extract(q, choices, scorer=scorer, processor=utils.default_process,
+                                               limit=None, score_cutoff=MIN_SCORE):
+            scores[index] = max(score, scores.get(index, 0.0))
+    best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+    return [ParticipantMatch(**candidates[index]._asdict(), score=round(score, 1)) for index, score in best]
+
+
+async def search_participants(db: AsyncSession, q: str, event_id: Optional[int], limit: int) -> list[ParticipantMatch]:
+    """Find the participants that best match a possibly misspelled query.
+
+    Args:
+        db: Database session.
+        q: Name and/or email text to look for.
+        event_id: Restrict the search to one event's participants.
+        limit: Maximum number of matches to return.
+
+    Returns:
+        Up to ``limit`` matches scoring at least MIN_SCORE, best first.
+    """
+    names, emails = blocking_keys(q)
+    if not names and not emails:
+        return []
+
+    email_block = [Participant.email_key.in_(emails)] if emails else []
+    passes = []
+    if len(names) > 1:
+        passes.append(or_(and_(Participant.first_name_key.in_(names), Participant.last_name_key.in_(names)),
+                          *email_block))
+    if names:
+        passes.append(or_(Participant.first_name_key.in_(names), Participant.last_name_key.in_(names), *email_block))
+    else:
+        passes.append(or_(*email_block))
+
+    columns = select(*(Participant.__table__.c[name] for name in ParticipantSchema.model_fields))
+    if event_id is not None:
+        columns = columns.where(Participant.event_id == event_id)
+
+    matches = []
+    for block in passes:
+        candidates = (await db.exec(columns.where(block).limit(MAX_CANDIDATES))).all()
+        # Scoring thousands of candidates is CPU work; keep it off the event loop.
+        matches = await run_in_threadpool(_score, q, candidates, limit)
+        if matches and matches[0].score >= STRONG_SCORE:
+            break
+    return matches
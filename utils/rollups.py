@@ -0,0 +1,224 @@
+"""Rollup counters for participation analytics.
+
+``Event_Rollup`` counts events per event type and month, and
+``Participant_Rollup`` counts participants per event type, event month
+and state. The ``/stats`` endpoints read these tables, so they answer
+in time proportional to the number of groups instead of the number of
+rows.
+
+The counters change in the same transaction as the rows they count:
+
+- ORM writes (``session.add`` and ``session.delete``, and changes to an
+  event's date or type or a participant's event or state) are picked up
+  by the session flush listeners below.
+- Core bulk statements bypass the unit of work, so code paths that
+  issue them call ``record_participants`` and ``record_events`` next to
+  their ``bump_versions`` call.
+
+A change to an event moves all of its participants to another group,
+so event-level changes are applied with one grouped INSERT ... SELECT
+per flush rather than per participant. ``jobs.rollups`` recomputes the
+tables from scratch and reports any drift.
+"""
+
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import ColumnElement, Insert, Integer, String, bindparam, func, literal
+from sqlalchemy import event as sa_event
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Event, EventRollup, Participant, ParticipantRollup
+
+# Rollup rows use an empty string for participants without a state, so
+# they share one group and the primary key has no NULLs.
+UNKNOWN_STATE = ""
+
+# Attributes whose change moves a row to another group. The relationships
+# are listed too because assigning one only sets its key during the flush.
+EVENT_GROUP_ATTRIBUTES = ("event_date", "event_type", "event_type_id")
+PARTICIPANT_GROUP_ATTRIBUTES = ("event", "event_id", "state")
+
+
+def month_of(column: ColumnElement, dialect: str) -> ColumnElement:
+    """Build the SQL expression for the ``YYYY-MM`` month of a date.
+
+    Args:
+        column: A date column.
+        dialect: Name of the database dialect.
+
+    Returns:
+        A string expression.
+    """
+    if dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def _upsert(model, dialect: str, query, measure: str) -> Insert:
+    table = model.__table__
+    insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+    keys = [column.name for column in table.primary_key]
+    statement = insert(table).from_select([*keys, measure], query)
+    return statement.on_conflict_do_update(
+        index_elements=keys, set_={measure: table.c[measure] + statement.excluded[measure]})
+
+
+def participant_delta_statement(dialect: str) -> Insert:
+    """Build the statement that adds counts for participants of one event.
+
+    It is meant for executemany, with one parameter set per event and
+    state: ``event_id``, ``state`` and the signed ``delta``. The event's
+    type and month are read from the ``Event`` row, which must exist.
+
+    Args:
+        dialect: Name of the database dialect.
+
+    Returns:
+        An upsert into ``Participant_Rollup``.
+    """
+    query = select(
+        Event.event_type_id, month_of(Event.event_date, dialect),
+        bindparam("state", type_=String), bindparam("delta", type_=Integer),
+    ).where(Event.id == bindparam("event_id", type_=Integer))
+    return _upsert(ParticipantRollup, dialect, query, "participants")
+
+
+def event_delta_statements(dialect: str, event_ids: Iterable[int], sign: int) -> list[Insert]:
+    """Build statements that add or remove whole events from the rollups.
+
+    The counts are read from the events and participants as they are
+    in the database when the statements run, so removals must run
+    before the rows change and additions after.
+
+    Args:
+        dialect: Name of the database dialect.
+        event_ids: Events to count.
+        sign: 1 to add the events and their participants, -1 to remove them.
+
+    Returns:
+        One upsert into each rollup table.
+    """
+    event_ids = list(event_ids)
+    month = month_of(Event.event_date, dialect)
+    state = func.coalesce(Participant.state, UNKNOWN_STATE)
+    events = (select(Event.event_type_id, month, literal(sign) * func.count())
+              .where(Event.id.in_(event_ids))
+              .group_by(Event.event_type_id, month))
+    participants = (select(Event.event_type_id, month, state, literal(sign) * func.count())
+                    .join(Participant, Participant.event_id == Event.id)
+                    .where(Event.id.in_(event_ids))
+                    .group_by(Event.event_type_id, month, state))
+    return [_upsert(EventRollup, dialect, events, "events"),
+            _upsert(ParticipantRollup, dialect, participants, "participants")]
+
+
+def participant_deltas(rows: Iterable[tuple[int, Optional[str]]], sign: int) -> list[dict]:
+    """Aggregate participants into parameters for ``participant_delta_statement``.
+
+    Args:
+        rows: Event id and state of each participant.
+        sign: 1 for added participants, -1 for removed ones.
+
+    Returns:
+        One parameter set per event and state.
+    """
+    counts = Counter((event_id, state or UNKNOWN_STATE) for event_id, state in rows)
+    return [{"event_id": event_id, "state": state, "delta": sign * count}
+            for (event_id, state), count in counts.items()]
+
+
+async def record_participants(db: AsyncSession, rows: Iterable[tuple[int, Optional[str]]], sign: int = 1) -> None:
+    """Count participants written with a Core statement.
+
+    Call this in the same transaction as the insert, after it, or
+    before the delete.
+
+    Args:
+        db: Database session holding the write transaction.
+        rows: Event id and state of each participant.
+        sign: 1 for inserted participants, -1 for deleted ones.
+    """
+    params = participant_deltas(rows, sign)
+    if params:
+        await db.exec(participant_delta_statement(db.bind.dialect.name), params=params)
+
+
+async def record_events(db: AsyncSession, event_ids: Iterable[int], sign: int = 1) -> None:
+    """Count events, and their participants, written with a Core statement.
+
+    Call this after inserting events or after updating their date or
+    type with ``sign=1``, and before updating or deleting them with
+    ``sign=-1``.
+
+    Args:
+        db: Database session holding the write transaction.
+        event_ids: The events being written.
+        sign: 1 to add the events' current rows, -1 to remove them.
+    """
+    event_ids = list(event_ids)
+    if event_ids:
+        for statement in event_delta_statements(db.bind.dialect.name, event_ids, sign):
+            await db.exec(statement)
+
+
+def _changed(instance, names: tuple[str, ...]) -> bool:
+    attrs = inspect(instance).attrs
+    return any(attrs[name].history.has_changes() for name in names)
+
+
+def _previous(instance, name: str):
+    history = inspect(instance).attrs[name].history
+    values = history.deleted or history.unchanged
+    return values[0] if values else getattr(instance, name)
+
+
+def _changed_events(session: Session) -> list[Event]:
+    return [obj for obj in session.dirty if isinstance(obj, Event) and _changed(obj, EVENT_GROUP_ATTRIBUTES)]
+
+
+def _changed_participants(session: Session) -> list[Participant]:
+    return [obj for obj in session.dirty
+            if isinstance(obj, Participant) and _changed(obj, PARTICIPANT_GROUP_ATTRIBUTES)]
+
+
+@sa_event.listens_for(Session, "before_flush")
+def _remove_before_flush(session: Session, flush_context, instances) -> None:
+    events = {obj.id for obj in session.deleted if isinstance(obj, Event)}
+    events.update(obj.id for obj in _changed_events(session))
+    removed = [obj for obj in session.deleted if isinstance(obj, Participant)] + _changed_participants(session)
+    rows = [(_previous(obj, "event_id"), _previous(obj, "state")) for obj in removed]
+    # Participants of a changed event are removed with the event.
+    params = participant_deltas([row for row in rows if row[0] not in events], -1)
+    if not events and not params:
+        return
+    connection = session.connection()
+    dialect = connection.dialect.name
+    if events:
+        for statement in event_delta_statements(dialect, events, -1):
+            connection.execute(statement)
+    if params:
+        connection.execute(participant_delta_statement(dialect), params)
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _add_after_flush(session: Session, flush_context) -> None:
+    # The new, dirty and deleted collections still describe the flush
+    # that just ran, and new rows now have their ids.
+    events = {obj.id for obj in session.new if isinstance(obj, Event)}
+    events.update(obj.id for obj in _changed_events(session))
+    added = [obj for obj in session.new if isinstance(obj, Participant)] + _changed_participants(session)
+    params = participant_deltas([(obj.event_id, obj.state) for obj in added if obj.event_id not in events], 1)
+    if not events and not params:
+        return
+    connection = session.connection()
+    dialect = connection.dialect.name
+    if events:
+        for statement in event_delta_statements(dialect, events, 1):
+            connection.execute(statement)
+    if params:
+        connection.execute(participant_delta_statement(dialect), params)
@@ -0,0 +1,138 @@
+"""Full-text search over events.
+
+On SQLite the index is an FTS5 table, ``Event_Search``, that uses the
+``Event`` table as external content and is kept in sync by triggers. On
+PostgreSQL it is a generated ``tsvector`` column on ``Event`` with a GIN
+index. Either way the index is created together with the ``Event``
+table and follows every insert, update and delete without application
+code having to touch it.
+
+``create_search_index`` is idempotent, so ``init_db`` also runs it to
+add the index to databases created before it existed.
+"""
+
+import re
+
+from sqlalchemy import (Connection, Float, Select, Table, column, event, false, func, literal_column, select, table, text,
+                        type_coerce)
+from sqlalchemy.sql.elements import ColumnElement
+
+from models import Event
+
+SEARCH_TABLE = "Event_Search"
+
+# bm25 column weights for name, description and location.
+SQLITE_WEIGHTS = (10.0, 1.0, 5.0)
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS "{SEARCH_TABLE}" USING fts5(
+        name, description, location,
+        content='Event', content_rowid='id', tokenize='unicode61 remove_diacritics 2')""",
+    f"""CREATE TRIGGER IF NOT EXISTS event_search_insert AFTER INSERT ON "Event" BEGIN
+        INSERT INTO "{SEARCH_TABLE}"(rowid, name, description, location)
+        VALUES (new.id, new.name, new.description, new.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS event_search_delete AFTER DELETE ON "Event" BEGIN
+        INSERT INTO "{SEARCH_TABLE}"("{SEARCH_TABLE}", rowid, name, description, location)
+        VALUES ('delete', old.id, old.name, old.description, old.location);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS event_search_update AFTER UPDATE OF name, description, location ON "Event" BEGIN
+        INSERT INTO "{SEARCH_TABLE}"("{SEARCH_TABLE}", rowid, name, description, location)
+        VALUES ('delete', old.id, old.name, old.description, old.location);
+        INSERT INTO "{SEARCH_TABLE}"(rowid, name, description, location)
+        VALUES (new.id, new.name, new.description, new.location);
+    END""",
+]
+
+POSTGRESQL_DDL = [
+    """ALTER TABLE "Event" ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED""",
+    """CREATE INDEX IF NOT EXISTS ix_event_search_vector ON "Event" USING gin (search_vector)""",
+]
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the search index for the connection's dialect if missing.
+
+    On SQLite a newly created index is filled from the existing events.
+
+    Args:
+        connection: A connection inside the schema-creating transaction.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": SEARCH_TABLE}).first()
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text(f"""INSERT INTO "{SEARCH_TABLE}"("{SEARCH_TABLE}") VALUES ('rebuild')"""))
+    elif dialect == "postgresql":
+        for statement in POSTGRESQL_DDL:
+            connection.execute(text(statement))
+
+
+@event.listens_for(Event.__table__, "after_create")
+def _after_create(target: Table, connection: Connection, **kwargs) -> None:
+    create_search_index(connection)
+
+
+@event.listens_for(Event.__table__, "after_drop")
+def _after_drop(target: Table, connection: Connection, **kwargs) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f'DROP TABLE IF EXISTS "{SEARCH_TABLE}"'))
+
+
+def fts5_query(q: str) -> str:
+    """Turn free text into an FTS5 query that matches all of its words.
+
+    Every word is quoted, so FTS5 operators and punctuation in user
+    input are matched literally instead of raising syntax errors. The
+    last word matches as a prefix to support search-as-you-type.
+
+    Args:
+        q: The user's search text.
+
+    Returns:
+        An FTS5 MATCH expression, or an empty string if q has no words.
+    """
+    terms = [f'"{term}"' for term in _TERM.findall(q)]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_events(fields: Select, q: str, dialect: str) -> tuple[Select, list[ColumnElement]]:
+    """Build a ranked search over events.
+
+    Args:
+        fields: A select of the ``Event`` columns to return, see
+            ``utils.fields.sparse_fields``.
+        q: The user's search text.
+        dialect: Name of the database dialect, ``sqlite`` or ``postgresql``.
+
+    Returns:
+        The statement and its sort keys, best match first, ready for
+        ``utils.pagination.paginate_json``.
+    """
+    if dialect == "postgresql":
+        query = func.websearch_to_tsquery("english", q)
+        vector = literal_column('"Event".search_vector')
+        rank = -func.ts_rank_cd(vector, query)
+        matches = vector.op("@@")(query)
+        source = Event.__table__
+    else:
+        search = table(SEARCH_TABLE, column("rowid"))
+        match = fts5_query(q)
+        rank = func.bm25(literal_column(f'"{SEARCH_TABLE}"'), *SQLITE_WEIGHTS)
+        matches = literal_column(f'"{SEARCH_TABLE}"').op("MATCH")(match) if match else false()
+        source = search.join(Event.__table__, Event.id == search.c.rowid)
+
+    ranked = (select(*Event.__table__.c, type_coerce(rank, Float).label("rank"))
+              .select_from(source).where(matches).subquery("ranked"))
+    statement = select(*(ranked.c[selected.key] for selected in fields.selected_columns))
+    return statement, [ranked.c.rank, ranked.c.id]